@@ -1,5 +1,11 @@
+import argparse
+import atexit
+import math
 import os
+import random
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
 from enum import Enum
 
 
@@ -53,6 +59,10 @@ class Cell:
 class Board:
     """Класс игрового поля"""
 
+    # Размер поля и длина линии для победы (см. GridBoard)
+    size = 3
+    win_length = 3
+
     WINNING_COMBINATIONS = [
         [1, 2, 3], [4, 5, 6], [7, 8, 9],  # Горизонтали
         [1, 4, 7], [2, 5, 8], [3, 6, 9],  # Вертикали
@@ -64,6 +74,7 @@ class Board:
         self.cells = [Cell(i) for i in range(1, 10)]
         self.moves_count = 0
         self.last_move = None
+        self._undo = []  # Стек (клетка, предыдущий last_move) для pop()
 
     def get_cell(self, number):
         """
@@ -99,6 +110,40 @@ class Board:
                 return True
         return False
 
+    def push(self, cell_number, symbol):
+        """
+        Сделать ход, который можно отменить через pop()
+
+        Позволяет перебирать позиции на самом поле без создания копий.
+
+        Args:
+            cell_number (int): Номер клетки
+            symbol (Symbol): Символ для установки
+
+        Returns:
+            bool: Успешно ли сделан ход
+        """
+        last_move = self.last_move
+        if not self.change_cell_state(cell_number, symbol):
+            return False
+        self._undo.append((cell_number, last_move))
+        return True
+
+    def pop(self):
+        """
+        Отменить последний ход, сделанный через push()
+
+        Returns:
+            int: Номер освобожденной клетки
+
+        Raises:
+            IndexError: Если отменять нечего
+        """
+        cell_number, self.last_move = self._undo.pop()
+        self.cells[cell_number - 1].clear()
+        self.moves_count -= 1
+        return cell_number
+
     def check_win(self):
         """
         Проверить окончание игры (победу)
@@ -153,6 +198,36 @@ class Board:
             cell.clear()
         self.moves_count = 0
         self.last_move = None
+        self._undo = []
+
+    def masks(self):
+        """
+        Битовые маски занятых клеток (бит n-1 - клетка n)
+
+        Returns:
+            tuple: (маска ❌, маска ⭕)
+        """
+        x_bits = o_bits = 0
+        for cell in self.cells:
+            if cell.symbol == Symbol.X:
+                x_bits |= 1 << (cell.number - 1)
+            elif cell.symbol == Symbol.O:
+                o_bits |= 1 << (cell.number - 1)
+        return x_bits, o_bits
+
+    def copy(self):
+        """
+        Копия поля
+
+        Returns:
+            Board: Новое поле с теми же занятыми клетками
+        """
+        new_board = type(self)()
+        for cell in self.cells:
+            if cell.is_occupied:
+                new_board.change_cell_state(cell.number, cell.symbol)
+        new_board.last_move = self.last_move
+        return new_board
 
     def display(self, with_numbers=False):
         """
@@ -196,6 +271,379 @@ class Board:
             print(f"   Свободные клетки: {', '.join(map(str, available))}")
 
 
+def _bit_tables(win_masks, size):
+    """
+    Таблицы для поля на битовых масках из size клеток
+
+    Args:
+        win_masks (tuple): Маски выигрышных комбинаций
+        size (int): Количество клеток
+
+    Returns:
+        tuple: (bytes: 1 для масок с выигрышной комбинацией,
+            tuple: номера клеток для каждой маски)
+    """
+    winning = bytes(any(mask & win == win for win in win_masks)
+                    for mask in range(1 << size))
+    moves = tuple(tuple(number for number in range(1, size + 1)
+                        if mask >> (number - 1) & 1)
+                  for mask in range(1 << size))
+    return winning, moves
+
+
+def _symmetry_tables():
+    """
+    Перестановки масок поля 3x3 при 8 симметриях (повороты и отражения)
+
+    Returns:
+        tuple: Для каждой симметрии - кортеж из 512 преобразованных масок
+    """
+    def rotate(r, c):
+        return c, 2 - r
+
+    tables = []
+    for reflect in (False, True):
+        for turns in range(4):
+            target = []
+            for cell in range(9):
+                r, c = divmod(cell, 3)
+                if reflect:
+                    c = 2 - c
+                for _ in range(turns):
+                    r, c = rotate(r, c)
+                target.append(r * 3 + c)
+            tables.append(tuple(
+                sum(1 << target[cell] for cell in range(9) if mask >> cell & 1)
+                for mask in range(1 << 9)))
+    return tuple(tables)
+
+
+class BitBoard(Board):
+    """
+    Компактное игровое поле на битовых масках
+
+    Клетки ❌ и ⭕ хранятся в двух 9-битных целых (бит n-1 - клетка n).
+    Проверка победы - поиск в заранее вычисленной таблице по маске игрока,
+    свободные клетки - готовый список для маски свободных клеток.
+    Интерфейс тот же, что у Board; get_cell и cells возвращают снимки
+    клеток, изменение которых не влияет на поле.
+    """
+
+    FULL_MASK = (1 << 9) - 1
+
+    # Маски выигрышных комбинаций
+    WIN_MASKS = tuple(sum(1 << (number - 1) for number in combo)
+                      for combo in Board.WINNING_COMBINATIONS)
+
+    # WINNING[mask] == 1, если клетки mask содержат выигрышную комбинацию;
+    # MOVES[free] - номера клеток, установленных в маске free
+    WINNING, MOVES = _bit_tables(WIN_MASKS, 9)
+
+    def __init__(self):
+        """Инициализация пустого поля"""
+        self.x_bits = 0
+        self.o_bits = 0
+        self.moves_count = 0
+        self.last_move = None
+        self._undo = []
+
+    @property
+    def cells(self):
+        """Снимки всех 9 клеток (для отображения)"""
+        return [self.get_cell(number) for number in range(1, 10)]
+
+    def get_cell(self, number):
+        """
+        Получить снимок клетки по номеру
+
+        Args:
+            number (int): Номер клетки (1-9)
+
+        Returns:
+            Cell or None: Снимок клетки или None если не найден
+        """
+        if not 1 <= number <= 9:
+            return None
+        cell = Cell(number)
+        bit = 1 << (number - 1)
+        if self.x_bits & bit:
+            cell.set_symbol(Symbol.X)
+        elif self.o_bits & bit:
+            cell.set_symbol(Symbol.O)
+        return cell
+
+    def change_cell_state(self, cell_number, symbol):
+        """
+        Изменить состояние клетки
+
+        Args:
+            cell_number (int): Номер клетки (1-9)
+            symbol (Symbol): Символ для установки
+
+        Returns:
+            bool: Успешно ли изменено состояние
+        """
+        if not 1 <= cell_number <= 9 or symbol == Symbol.EMPTY:
+            return False
+        bit = 1 << (cell_number - 1)
+        if (self.x_bits | self.o_bits) & bit:
+            return False
+        if symbol == Symbol.X:
+            self.x_bits |= bit
+        else:
+            self.o_bits |= bit
+        self.moves_count += 1
+        self.last_move = cell_number
+        return True
+
+    def pop(self):
+        """
+        Отменить последний ход, сделанный через push()
+
+        Returns:
+            int: Номер освобожденной клетки
+
+        Raises:
+            IndexError: Если отменять нечего
+        """
+        cell_number, self.last_move = self._undo.pop()
+        bit = 1 << (cell_number - 1)
+        self.x_bits &= ~bit
+        self.o_bits &= ~bit
+        self.moves_count -= 1
+        return cell_number
+
+    def check_win(self):
+        """
+        Проверить окончание игры (победу)
+
+        Returns:
+            Symbol or None: Символ победителя или None если нет победителя
+        """
+        if self.WINNING[self.x_bits]:
+            return Symbol.X
+        if self.WINNING[self.o_bits]:
+            return Symbol.O
+        return None
+
+    def get_available_moves(self):
+        """
+        Получить список доступных ходов
+
+        Returns:
+            list: Список номеров свободных клеток
+        """
+        return list(self.MOVES[~(self.x_bits | self.o_bits) & self.FULL_MASK])
+
+    def clear(self):
+        """Очистить игровое поле"""
+        self.x_bits = 0
+        self.o_bits = 0
+        self.moves_count = 0
+        self.last_move = None
+        self._undo = []
+
+    def masks(self):
+        """
+        Битовые маски занятых клеток (бит n-1 - клетка n)
+
+        Returns:
+            tuple: (маска ❌, маска ⭕)
+        """
+        return self.x_bits, self.o_bits
+
+    def copy(self):
+        """
+        Копия поля (копируются только две маски)
+
+        Returns:
+            BitBoard: Новое поле с теми же занятыми клетками
+        """
+        new_board = type(self).__new__(type(self))
+        new_board.x_bits = self.x_bits
+        new_board.o_bits = self.o_bits
+        new_board.moves_count = self.moves_count
+        new_board.last_move = self.last_move
+        new_board._undo = []
+        return new_board
+
+
+class GridBoard(Board):
+    """
+    Поле N x N с победой при K символах в ряд (например, гомоку: 15 x 15, K = 5)
+
+    Клетки нумеруются с 1 по строкам. Победа определяется инкрементально:
+    после хода проверяются только 4 линии через последний ход, не дальше
+    K - 1 клеток в каждую сторону, то есть O(K) вместо просмотра всего поля.
+    """
+
+    # Направления линий: горизонталь, вертикаль и две диагонали
+    DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
+
+    def __init__(self, size=15, win_length=5):
+        """
+        Инициализация поля
+
+        Args:
+            size (int): Размер стороны поля N
+            win_length (int): Сколько символов в ряд нужно для победы K
+
+        Raises:
+            ValueError: Если K не от 1 до N
+        """
+        if size < 1 or not 1 <= win_length <= size:
+            raise ValueError(
+                "Длина линии для победы должна быть от 1 до размера поля")
+        self.size = size
+        self.win_length = win_length
+        self.cells = [Cell(i) for i in range(1, size * size + 1)]
+        self.moves_count = 0
+        self.last_move = None
+        self._undo = []
+        self.winner = None
+        self._win_ply = 0  # Номер хода, на котором появился победитель
+
+    def get_cell(self, number):
+        """
+        Получить клетку по номеру
+
+        Args:
+            number (int): Номер клетки (1-N²)
+
+        Returns:
+            Cell or None: Объект клетки или None если не найден
+        """
+        if 1 <= number <= self.size * self.size:
+            return self.cells[number - 1]
+        return None
+
+    def change_cell_state(self, cell_number, symbol):
+        """
+        Изменить состояние клетки и проверить линии через нее
+
+        Args:
+            cell_number (int): Номер клетки (1-N²)
+            symbol (Symbol): Символ для установки
+
+        Returns:
+            bool: Успешно ли изменено состояние
+        """
+        if not super().change_cell_state(cell_number, symbol):
+            return False
+        if self.winner is None and self._wins_through(cell_number, symbol):
+            self.winner = symbol
+            self._win_ply = self.moves_count
+        return True
+
+    def pop(self):
+        """
+        Отменить последний ход, сделанный через push()
+
+        Returns:
+            int: Номер освобожденной клетки
+
+        Raises:
+            IndexError: Если отменять нечего
+        """
+        cell_number = super().pop()
+        if self.moves_count < self._win_ply:
+            self.winner = None
+            self._win_ply = 0
+        return cell_number
+
+    def _wins_through(self, number, symbol):
+        """
+        Есть ли K символов symbol в ряд на линиях через клетку number
+
+        Returns:
+            bool: True если есть выигрышная линия
+        """
+        size, cells, need = self.size, self.cells, self.win_length
+        row, col = divmod(number - 1, size)
+        for dr, dc in self.DIRECTIONS:
+            count = 1
+            for sign in (1, -1):
+                r, c = row + sign * dr, col + sign * dc
+                while count < need and 0 <= r < size and 0 <= c < size and \
+                        cells[r * size + c].symbol == symbol:
+                    count += 1
+                    r += sign * dr
+                    c += sign * dc
+            if count >= need:
+                return True
+        return False
+
+    def check_win(self):
+        """
+        Проверить окончание игры (победу), O(1)
+
+        Returns:
+            Symbol or None: Символ победителя или None если нет победителя
+        """
+        return self.winner
+
+    def is_full(self):
+        """
+        Проверить, заполнено ли всё поле
+
+        Returns:
+            bool: True если поле полностью заполнено
+        """
+        return self.moves_count >= self.size * self.size
+
+    def clear(self):
+        """Очистить игровое поле"""
+        super().clear()
+        self.winner = None
+        self._win_ply = 0
+
+    def copy(self):
+        """
+        Копия поля
+
+        Returns:
+            GridBoard: Новое поле с теми же занятыми клетками
+        """
+        new_board = GridBoard(self.size, self.win_length)
+        for cell, new_cell in zip(self.cells, new_board.cells):
+            if cell.is_occupied:
+                new_cell.set_symbol(cell.symbol)
+        new_board.moves_count = self.moves_count
+        new_board.last_move = self.last_move
+        new_board.winner = self.winner
+        new_board._win_ply = self._win_ply
+        return new_board
+
+    def display(self, with_numbers=False):
+        """
+        Отобразить игровое поле
+
+        Args:
+            with_numbers (bool): Показывать ли номера клеток
+        """
+        os.system('cls' if os.name == 'nt' else 'clear')
+        print("\n" + "=" * 40)
+        print(f"🎮 {self.win_length} В РЯД НА ПОЛЕ {self.size}x{self.size}")
+        print("=" * 40)
+        print("\n   СХЕМА ПОЛЯ:" if with_numbers else "\n   ИГРОВОЕ ПОЛЕ:")
+
+        # Символы-эмодзи занимают две позиции, номера выравниваем так же
+        width = max(2, len(str(self.size * self.size)))
+        for start in range(0, self.size * self.size, self.size):
+            row_cells = self.cells[start:start + self.size]
+            if with_numbers:
+                items = [f"{cell.number:>{width}}" for cell in row_cells]
+            else:
+                items = [str(cell) if cell.is_occupied else " " * width
+                         for cell in row_cells]
+            print(f"   |{'|'.join(items)}|")
+
+        if self.last_move:
+            cell = self.get_cell(self.last_move)
+            print(
+                f"\n   Последний ход: клетка {self.last_move} ({cell.symbol.value})")
+
+
 class Player:
     """Класс игрока"""
 
@@ -295,7 +743,7 @@ class Game:
 
     def __init__(self):
         """Инициализация игры"""
-        self.board = Board()
+        self.board = BitBoard()
         self.players = []
         self.current_player_index = 0
         self.game_state = "menu"  # menu, playing, finished
@@ -312,10 +760,12 @@ class Game:
         print("1. Играть против другого игрока")
         print("2. Играть против компьютера (простой уровень)")
         print("3. Играть против компьютера (средний уровень)")
+        print("4. Играть против компьютера (сложный уровень)")
+        print("5. Играть против компьютера (Монте-Карло)")
 
         while True:
-            mode = input("\nВаш выбор (1-3): ").strip()
-            if mode in ['1', '2', '3']:
+            mode = input("\nВаш выбор (1-5): ").strip()
+            if mode in ['1', '2', '3', '4', '5']:
                 break
             print("❌ Неверный выбор!")
 
@@ -340,7 +790,8 @@ class Game:
             player2 = Player(name2, Symbol.O)
         else:
             name2 = "Компьютер"
-            difficulty = "простой" if mode == '2' else "средний"
+            difficulty = {'2': "простой", '3': "средний", '4': "сложный",
+                          '5': "монте-карло"}[mode]
             player2 = AIPlayer(name2, Symbol.O, difficulty)
 
         self.players.append(player2)
@@ -558,20 +1009,331 @@ class Game:
         input("\nНажмите Enter чтобы вернуться в меню...")
 
 
+# Таблицы для поиска Монте-Карло, по (размер поля, длина линии)
+_MCTS_TABLES = {}
+
+
+def _mcts_tables(size, win_length):
+    """
+    Таблицы компактного поля N x N для поиска Монте-Карло
+
+    Args:
+        size (int): Размер поля N
+        win_length (int): Сколько символов в ряд нужно для победы K
+
+    Returns:
+        tuple: (для каждой клетки - пары (клетки вперед, клетки назад) по 4
+            направлениям, не дальше K - 1; для каждой клетки - соседние
+            клетки на расстоянии не больше 2)
+    """
+    key = (size, win_length)
+    if key not in _MCTS_TABLES:
+        lines, near = [], []
+        for index in range(size * size):
+            row, col = divmod(index, size)
+            cell_lines = []
+            for dr, dc in GridBoard.DIRECTIONS:
+                rays = []
+                for sign in (1, -1):
+                    ray = []
+                    r, c = row + sign * dr, col + sign * dc
+                    while len(ray) < win_length - 1 and \
+                            0 <= r < size and 0 <= c < size:
+                        ray.append(r * size + c)
+                        r += sign * dr
+                        c += sign * dc
+                    rays.append(tuple(ray))
+                cell_lines.append(tuple(rays))
+            lines.append(tuple(cell_lines))
+            near.append(tuple(
+                r * size + c
+                for r in range(max(0, row - 2), min(size, row + 3))
+                for c in range(max(0, col - 2), min(size, col + 3))
+                if (r, c) != (row, col)))
+        _MCTS_TABLES[key] = (tuple(lines), tuple(near))
+    return _MCTS_TABLES[key]
+
+
+def _mcts_wins(cells, lines, need, index, player):
+    """Есть ли у player need в ряд через клетку index компактного поля"""
+    for forward, backward in lines[index]:
+        count = 1
+        for other in forward:
+            if cells[other] != player:
+                break
+            count += 1
+        for other in backward:
+            if cells[other] != player:
+                break
+            count += 1
+        if count >= need:
+            return True
+    return False
+
+
+def _mcts_candidates(cells, near):
+    """
+    Ходы для дерева поиска: свободные клетки рядом с занятыми
+
+    На большом поле дальние клетки почти никогда не бывают лучшими, а
+    без них дерево растет намного медленнее. На пустом поле - центр.
+    """
+    occupied = [index for index, value in enumerate(cells) if value]
+    if not occupied:
+        return [len(cells) // 2]
+    moves = {other for index in occupied for other in near[index]
+             if not cells[other]}
+    return list(moves) or [index for index, value in enumerate(cells)
+                           if not value]
+
+
+def _mcts_moves(cells, lines, win_length, near, player):
+    """
+    Ходы узла дерева с учетом немедленных побед
+
+    Если player может выиграть сразу - только этот ход; иначе, если
+    соперник выигрывает следующим ходом - только ходы, которые ему мешают.
+    Так дерево не тратит партии на заведомо проигранные ветки.
+
+    Returns:
+        list: Номера клеток (с 0)
+    """
+    moves = _mcts_candidates(cells, near)
+    blocks = []
+    for move in moves:
+        cells[move] = player
+        wins = _mcts_wins(cells, lines, win_length, move, player)
+        cells[move] = 3 - player
+        loses = _mcts_wins(cells, lines, win_length, move, 3 - player)
+        cells[move] = 0
+        if wins:
+            return [move]
+        if loses:
+            blocks.append(move)
+    return blocks or moves
+
+
+class _MCTSNode:
+    """Узел дерева поиска Монте-Карло"""
+
+    __slots__ = ("move", "parent", "player", "children", "untried",
+                 "visits", "wins", "result")
+
+    def __init__(self, move, parent, player, untried, result=None):
+        self.move = move  # Клетка (с 0), которой сделан ход в узел
+        self.parent = parent
+        self.player = player  # Кто сделал этот ход (1 или 2)
+        self.children = []
+        self.untried = untried
+        self.visits = 0
+        self.wins = 0.0  # Победы player, ничья - половина
+        # Итог партии, если она закончилась этим ходом: player или 0 (ничья)
+        self.result = result
+
+
+# Общий пул процессов уровня "монте-карло" (см. _mcts_pool)
+_MCTS_POOL = None
+_MCTS_POOL_SIZE = 0
+
+
+def _mcts_pool(workers):
+    """
+    Пул процессов для параллельного поиска Монте-Карло
+
+    Пул создается при первом ходе и переиспользуется всеми следующими
+    ходами (процессы не запускаются заново на каждый ход); если нужно
+    больше процессов, он пересоздается. При выходе пул закрывается.
+
+    Args:
+        workers (int): Нужное количество процессов
+
+    Returns:
+        ProcessPoolExecutor: Пул не меньше чем на workers процессов
+    """
+    global _MCTS_POOL, _MCTS_POOL_SIZE
+    if _MCTS_POOL is not None and _MCTS_POOL_SIZE < workers:
+        _MCTS_POOL.shutdown()
+        _MCTS_POOL = None
+    if _MCTS_POOL is None:
+        _MCTS_POOL = ProcessPoolExecutor(max_workers=workers)
+        _MCTS_POOL_SIZE = workers
+    return _MCTS_POOL
+
+
+@atexit.register
+def _shutdown_mcts_pool():
+    """Остановка пула процессов поиска Монте-Карло"""
+    global _MCTS_POOL, _MCTS_POOL_SIZE
+    if _MCTS_POOL is not None:
+        _MCTS_POOL.shutdown()
+    _MCTS_POOL = None
+    _MCTS_POOL_SIZE = 0
+
+
+def _mcts_search(cells, size, win_length, player, iterations=None,
+                 time_limit=None, seed=None):
+    """
+    Поиск Монте-Карло по дереву (UCT) со случайными партиями до конца
+
+    Поле компактное: bytes из N² клеток, 0 - пусто, 1 - ❌, 2 - ⭕.
+    Функция на уровне модуля, чтобы ее можно было запускать в других
+    процессах (параллелизм по корню: каждый процесс строит свое дерево).
+
+    Args:
+        cells (bytes): Клетки поля
+        size (int): Размер поля N
+        win_length (int): Сколько символов в ряд нужно для победы K
+        player (int): Кто ходит (1 или 2)
+        iterations (int, optional): Сколько партий сыграть
+        time_limit (float, optional): Сколько миллисекунд искать
+        seed (int, optional): Зерно генератора
+
+    Returns:
+        tuple: ({клетка (с 0): (посещения, победы)}, сыграно партий,
+            секунды)
+    """
+    rng = random.Random(seed)
+    lines, near = _mcts_tables(size, win_length)
+    root = _MCTSNode(None, None, 3 - player,
+                     _mcts_moves(bytearray(cells), lines, win_length, near,
+                                 player))
+    start = time.perf_counter()
+    deadline = None if time_limit is None else start + time_limit / 1000
+    playouts = 0
+
+    while (iterations is None or playouts < iterations) and \
+            (deadline is None or time.perf_counter() < deadline):
+        board = bytearray(cells)
+        node = root
+
+        # 1. Выбор: спускаемся по полностью раскрытым узлам по UCT
+        while not node.untried and node.children:
+            log_visits = math.log(node.visits)
+            node = max(node.children, key=lambda child: (
+                child.wins / child.visits +
+                1.4 * math.sqrt(log_visits / child.visits)))
+            board[node.move] = node.player
+
+        # 2. Раскрытие: добавляем один новый ход
+        winner = node.result or 0
+        if node.result is None and node.untried:
+            move = node.untried.pop(rng.randrange(len(node.untried)))
+            mover = 3 - node.player
+            board[move] = mover
+            if _mcts_wins(board, lines, win_length, move, mover):
+                node.children.append(_MCTSNode(move, node, mover, [], mover))
+                winner = mover
+            elif 0 not in board:
+                node.children.append(_MCTSNode(move, node, mover, [], 0))
+            else:
+                node.children.append(_MCTSNode(
+                    move, node, mover,
+                    _mcts_moves(board, lines, win_length, near, 3 - mover)))
+            node = node.children[-1]
+
+            # 3. Случайная партия до конца
+            if node.result is None:
+                free = [index for index, value in enumerate(board)
+                        if not value]
+                rng.shuffle(free)
+                turn = 3 - node.player
+                for index in free:
+                    board[index] = turn
+                    if _mcts_wins(board, lines, win_length, index, turn):
+                        winner = turn
+                        break
+                    turn = 3 - turn
+
+        # 4. Обратное распространение результата
+        while node is not None:
+            node.visits += 1
+            if winner == node.player:
+                node.wins += 1
+            elif not winner:
+                node.wins += 0.5
+            node = node.parent
+        playouts += 1
+
+    stats = {child.move: (child.visits, child.wins) for child in root.children}
+    return stats, playouts, time.perf_counter() - start
+
+
 class AIPlayer(Player):
     """Класс ИИ-игрока"""
 
-    def __init__(self, name, symbol, difficulty="простой"):
+    # Уровни сложности
+    DIFFICULTIES = ("простой", "средний", "сложный", "монте-карло")
+
+    # Бюджет уровня "монте-карло" по умолчанию: партий на ход
+    MCTS_ITERATIONS = 1000
+
+    # Таблица транспозиций уровня "сложный" (общая для всех ИИ-игроков,
+    # заполняется по мере игры): канонический ключ позиции ->
+    # (оценка, тип оценки)
+    _transpositions = {}
+
+    # Типы оценок в таблице транспозиций: точная, нижняя и верхняя граница
+    EXACT, LOWER, UPPER = 0, 1, 2
+
+    # Перестановки масок при 8 симметриях поля
+    SYMMETRIES = _symmetry_tables()
+
+    # TERNARY[mask] - сумма 3^(n-1) по клеткам n маски: номер позиции в
+    # троичной записи равен TERNARY[mine] + 2 * TERNARY[theirs]
+    TERNARY = tuple(sum(3 ** bit for bit in range(9) if mask >> bit & 1)
+                    for mask in range(1 << 9))
+
+    # Книга ходов (см. build_book), загружается при первом обращении
+    _book = None
+
+    def __init__(self, name, symbol, difficulty="простой", verbose=True,
+                 iterations=None, time_limit=None, workers=1):
         """
         Инициализация ИИ-игрока
 
         Args:
             name (str): Имя ИИ
             symbol (Symbol): Символ ИИ
-            difficulty (str): Уровень сложности (простой/средний)
+            difficulty (str): Уровень сложности (см. DIFFICULTIES)
+            verbose (bool): Печатать ли пояснения к ходам
+            iterations (int, optional): Уровень "монте-карло": партий на ход
+                в каждом процессе (по умолчанию MCTS_ITERATIONS, если не
+                задан time_limit)
+            time_limit (float, optional): Уровень "монте-карло": миллисекунд
+                на ход
+            workers (int): Уровень "монте-карло": сколько процессов ищут
+                параллельно (у каждого свое дерево, посещения складываются)
+
+        Raises:
+            ValueError: Если workers меньше 1
         """
+        if workers < 1:
+            raise ValueError("Количество процессов должно быть не меньше 1")
         super().__init__(name, symbol)
         self.difficulty = difficulty
+        self.verbose = verbose
+        if iterations is None and time_limit is None:
+            iterations = self.MCTS_ITERATIONS
+        self.iterations = iterations
+        self.time_limit = time_limit
+        self.workers = workers
+        # Счетчики поиска Монте-Карло: последний ход и все ходы
+        self.last_playouts = 0
+        self.last_playouts_per_sec = 0.0
+        self.playouts = 0
+        self.search_seconds = 0.0
+
+    @property
+    def playouts_per_sec(self):
+        """Скорость поиска Монте-Карло: случайных партий в секунду"""
+        if not self.search_seconds:
+            return 0.0
+        return self.playouts / self.search_seconds
+
+    def _say(self, message):
+        """Напечатать пояснение к ходу (если verbose)"""
+        if self.verbose:
+            print(message)
 
     def make_move(self, board):
         """
@@ -583,7 +1345,7 @@ class AIPlayer(Player):
         Returns:
             int: Номер выбранной клетки
         """
-        print(f"\n🤖 Ход компьютера ({self.name})...")
+        self._say(f"\n🤖 Ход компьютера ({self.name})...")
 
         available_moves = board.get_available_moves()
 
@@ -592,73 +1354,552 @@ class AIPlayer(Player):
 
         if self.difficulty == "простой":
             # Простой ИИ: случайный ход
-            import random
             return random.choice(available_moves)
 
-        elif self.difficulty == "средний":
+        elif self.difficulty == "сложный" and \
+                (board.size, board.win_length) == (3, 3):
+            # Сложный ИИ: ход из книги (или полный перебор), никогда не
+            # проигрывает
+            move = self._book_move(board)
+            self._say(f"   Компьютер выбирает лучший ход: клетка {move}")
+            return move
+
+        elif self.difficulty in ("средний", "сложный"):
             # Средний ИИ: пытается выиграть или блокировать противника
-            import random
+            # (на больших полях так же играет и сложный)
 
             # 1. Проверить, может ли ИИ выиграть следующим ходом
             for move in available_moves:
-                # Создаем копию доски для проверки
-                test_board = self._simulate_move(board, move, self.symbol)
-                if test_board.check_win() == self.symbol:
-                    print(f"   Компьютер нашел выигрышный ход: клетка {move}")
+                if self._wins_after(board, move, self.symbol):
+                    self._say(f"   Компьютер нашел выигрышный ход: клетка {move}")
                     return move
 
             # 2. Проверить, может ли противник выиграть следующим ходом
             opponent_symbol = Symbol.O if self.symbol == Symbol.X else Symbol.X
             for move in available_moves:
-                test_board = self._simulate_move(board, move, opponent_symbol)
-                if test_board.check_win() == opponent_symbol:
-                    print(f"   Компьютер блокирует противника: клетка {move}")
+                if self._wins_after(board, move, opponent_symbol):
+                    self._say(f"   Компьютер блокирует противника: клетка {move}")
                     return move
 
-            # 3. Если центр свободен, занять его
-            if 5 in available_moves:
-                print(f"   Компьютер занимает центр: клетка 5")
-                return 5
+            # 3. Если центр свободен, занять его (на поле четного размера
+            # центр - блок 2x2 в середине)
+            size = board.size
+            half = size // 2
+            center_rows = (half - 1, half) if size % 2 == 0 else (half,)
+            centers = [row * size + col + 1 for row in center_rows
+                       for col in center_rows]
+            free_centers = [c for c in centers if c in available_moves]
+            if free_centers:
+                move = free_centers[0] if len(free_centers) == 1 else \
+                    random.choice(free_centers)
+                self._say(f"   Компьютер занимает центр: клетка {move}")
+                return move
 
             # 4. Если углы свободны, занять случайный угол
-            corners = [1, 3, 7, 9]
+            corners = [1, size, size * size - size + 1, size * size]
             available_corners = [c for c in corners if c in available_moves]
             if available_corners:
                 move = random.choice(available_corners)
-                print(f"   Компьютер занимает угол: клетка {move}")
+                self._say(f"   Компьютер занимает угол: клетка {move}")
                 return move
 
             # 5. Случайный ход
             move = random.choice(available_moves)
-            print(f"   Компьютер делает случайный ход: клетка {move}")
+            self._say(f"   Компьютер делает случайный ход: клетка {move}")
+            return move
+
+        elif self.difficulty == "монте-карло":
+            # ИИ Монте-Карло: лучший ход по случайным партиям
+            move = self._mcts_move(board)
+            self._say(f"   Компьютер сыграл {self.last_playouts} партий "
+                      f"({self.last_playouts_per_sec:,.0f} в секунду): "
+                      f"клетка {move}")
             return move
 
         # На всякий случай: если не выбран уровень сложности
-        import random
         return random.choice(available_moves)
 
-    def _simulate_move(self, board, cell_number, symbol):
+    def _mcts_move(self, board):
+        """
+        Ход по поиску Монте-Карло (самый посещаемый ход корня)
+
+        Args:
+            board (Board): Игровое поле
+
+        Returns:
+            int: Номер клетки
+        """
+        cells = bytes(1 if cell.symbol == Symbol.X else
+                      2 if cell.symbol == Symbol.O else 0
+                      for cell in board.cells)
+        player = 1 if self.symbol == Symbol.X else 2
+        args = (cells, board.size, board.win_length, player, self.iterations,
+                self.time_limit)
+
+        if self.workers == 1:
+            results = [_mcts_search(*args, random.randrange(2 ** 32))]
+        else:
+            seeds = [random.randrange(2 ** 32) for _ in range(self.workers)]
+            results = list(_mcts_pool(self.workers).map(
+                _mcts_search, *([arg] * self.workers for arg in args),
+                seeds))
+        # Время поиска - по часам самих процессов (они ищут одновременно),
+        # без запуска процессов и передачи результатов
+        elapsed = max(seconds for _, _, seconds in results)
+
+        visits = {}
+        for stats, _, _ in results:
+            for move, (count, _) in stats.items():
+                visits[move] = visits.get(move, 0) + count
+        self.last_playouts = sum(playouts for _, playouts, _ in results)
+        self.last_playouts_per_sec = self.last_playouts / elapsed \
+            if elapsed else 0.0
+        self.playouts += self.last_playouts
+        self.search_seconds += elapsed
+
+        if not visits:
+            # Бюджет слишком мал, чтобы сыграть хотя бы одну партию
+            return random.choice(board.get_available_moves())
+        return max(visits, key=visits.get) + 1
+
+    def _best_move(self, board):
+        """
+        Лучший ход по минимаксу (из равноценных выбирается случайный)
+
+        Args:
+            board (Board): Игровое поле
+
+        Returns:
+            int: Номер клетки
+        """
+        x_bits, o_bits = board.masks()
+        mine, theirs = (x_bits, o_bits) if self.symbol == Symbol.X else \
+            (o_bits, x_bits)
+
+        best_moves, best_value = [], None
+        for move in board.get_available_moves():
+            # Полное окно: оценка каждого хода точная
+            value = -self._negamax(theirs, mine | 1 << (move - 1),
+                                   -100, 100)
+            if best_value is None or value > best_value:
+                best_moves, best_value = [move], value
+            elif value == best_value:
+                best_moves.append(move)
+        return random.choice(best_moves)
+
+    def _book_move(self, board):
+        """
+        Лучший ход из книги ходов (из равноценных выбирается случайный)
+
+        Позиции, которых нет в книге (недостижимые в обычной партии),
+        решаются перебором.
+
+        Args:
+            board (Board): Игровое поле 3x3
+
+        Returns:
+            int: Номер клетки
+        """
+        x_bits, o_bits = board.masks()
+        mine, theirs = (x_bits, o_bits) if self.symbol == Symbol.X else \
+            (o_bits, x_bits)
+        entry = self.book_entry(mine, theirs)
+        if entry is None:
+            return self._best_move(board)
+        return random.choice(entry[0])
+
+    @classmethod
+    def book_entry(cls, mine, theirs):
+        """
+        Запись книги ходов для позиции
+
+        Args:
+            mine (int): Маска клеток игрока, который ходит
+            theirs (int): Маска клеток соперника
+
+        Returns:
+            tuple or None: (лучшие ходы, исход: 1 - победа, 0 - ничья,
+                -1 - поражение при лучшей игре) или None, если позиции
+                нет в книге
+        """
+        if cls._book is None:
+            cls._book = load_book()
+        index = 2 * (cls.TERNARY[mine] + 2 * cls.TERNARY[theirs])
+        entry = cls._book[index] | cls._book[index + 1] << 8
+        if not entry:
+            return None
+        return BitBoard.MOVES[entry & BitBoard.FULL_MASK], (entry >> 9) - 1
+
+    @classmethod
+    def _canonical(cls, mine, theirs):
+        """Ключ позиции, одинаковый для всех 8 симметричных позиций"""
+        return min(table[mine] << 9 | table[theirs]
+                   for table in cls.SYMMETRIES)
+
+    @classmethod
+    def _negamax(cls, mine, theirs, alpha, beta):
+        """
+        Минимакс с альфа-бета отсечением и таблицей транспозиций
+
+        Оценка с точки зрения того, чей ход: победа тем больше, чем меньше
+        клеток занято к ее моменту (быстрая победа лучше медленной).
+
+        Args:
+            mine (int): Маска клеток игрока, который ходит
+            theirs (int): Маска клеток соперника
+            alpha (int): Нижняя граница окна
+            beta (int): Верхняя граница окна
+
+        Returns:
+            int: Оценка позиции
+        """
+        occupied = mine | theirs
+        if BitBoard.WINNING[theirs]:
+            # Соперник только что выиграл
+            return bin(occupied).count("1") - 10
+        free = ~occupied & BitBoard.FULL_MASK
+        if not free:
+            return 0
+
+        key = cls._canonical(mine, theirs)
+        entry = cls._transpositions.get(key)
+        if entry is not None:
+            value, kind = entry
+            if kind == cls.EXACT or (kind == cls.LOWER and value >= beta) or \
+                    (kind == cls.UPPER and value <= alpha):
+                return value
+
+        original_alpha = alpha
+        best = -100
+        for move in BitBoard.MOVES[free]:
+            value = -cls._negamax(theirs, mine | 1 << (move - 1), -beta,
+                                  -alpha)
+            if value > best:
+                best = value
+                if value > alpha:
+                    alpha = value
+                    if alpha >= beta:
+                        break
+
+        if best <= original_alpha:
+            kind = cls.UPPER
+        elif best >= beta:
+            kind = cls.LOWER
+        else:
+            kind = cls.EXACT
+        cls._transpositions[key] = (best, kind)
+        return best
+
+    def _wins_after(self, board, cell_number, symbol):
         """
-        Симулировать ход на копии доски
+        Выиграет ли symbol ходом в клетку cell_number
+
+        Ход делается на самом поле и сразу отменяется (push/pop),
+        поэтому копии поля не создаются.
 
         Args:
-            board (Board): Исходное поле
+            board (Board): Игровое поле
             cell_number (int): Номер клетки
             symbol (Symbol): Символ для установки
 
         Returns:
-            Board: Копия доски с выполненным ходом
+            bool: True если после хода symbol побеждает
         """
-        # Создаем новую доску и копируем состояние
-        new_board = Board()
-        for i in range(1, 10):
-            cell = board.get_cell(i)
-            if cell.is_occupied:
-                new_board.change_cell_state(i, cell.symbol)
+        if not board.push(cell_number, symbol):
+            return False
+        try:
+            return board.check_win() == symbol
+        finally:
+            board.pop()
+
+
+# Файл книги ходов по умолчанию (рядом с программой). Создается командой
+# --build-book и в репозиторий не входит: без него книга строится в памяти
+BOOK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                         "06_Tic-tac-toe_book.bin")
+BOOK_MAGIC = b"TTB1"
+
+
+def build_book():
+    """
+    Построить книгу ходов: все позиции, достижимые из пустого поля
+
+    Позиции записываются с точки зрения того, чей ход, поэтому книга
+    подходит обоим игрокам. Для каждой из 3^9 позиций (номер - троичная
+    запись поля, см. AIPlayer.TERNARY) хранится 2 байта: биты 0-8 - маска
+    лучших ходов, биты 9-10 - исход + 1; 0 - позиции нет в книге или игра в
+    ней окончена. Всего достижимых позиций 5478, из них с ходами - 4520.
+
+    Returns:
+        bytes: Книга ходов (без заголовка)
+    """
+    book = bytearray(2 * 3 ** 9)
+    seen = set()
+    stack = [(0, 0)]
+    while stack:
+        mine, theirs = stack.pop()
+        if (mine, theirs) in seen:
+            continue
+        seen.add((mine, theirs))
+        free = ~(mine | theirs) & BitBoard.FULL_MASK
+        if BitBoard.WINNING[theirs] or not free:
+            continue
+
+        best_mask, best_value = 0, None
+        for move in BitBoard.MOVES[free]:
+            bit = 1 << (move - 1)
+            stack.append((theirs, mine | bit))
+            value = -AIPlayer._negamax(theirs, mine | bit, -100, 100)
+            if best_value is None or value > best_value:
+                best_mask, best_value = bit, value
+            elif value == best_value:
+                best_mask |= bit
+
+        outcome = (best_value > 0) - (best_value < 0)
+        entry = best_mask | (outcome + 1) << 9
+        index = 2 * (AIPlayer.TERNARY[mine] + 2 * AIPlayer.TERNARY[theirs])
+        book[index:index + 2] = entry.to_bytes(2, "little")
+    return bytes(book)
+
+
+def save_book(path=BOOK_PATH):
+    """
+    Построить книгу ходов и сохранить ее в файл
+
+    Args:
+        path (str): Путь к файлу
+
+    Returns:
+        bytes: Книга ходов (без заголовка)
+    """
+    book = build_book()
+    with open(path, "wb") as file:
+        file.write(BOOK_MAGIC + book)
+    return book
+
+
+def load_book(path=BOOK_PATH):
+    """
+    Загрузить книгу ходов из файла
+
+    Если файла нет или он поврежден, книга строится в памяти (build_book,
+    доли секунды) и на диск не записывается: так будет при каждом запуске,
+    пока файл не создан командой --build-book. Ходы от этого не меняются.
+
+    Args:
+        path (str): Путь к файлу
+
+    Returns:
+        bytes: Книга ходов (без заголовка)
+    """
+    try:
+        with open(path, "rb") as file:
+            data = file.read()
+    except OSError:
+        return build_book()
+    if data[:len(BOOK_MAGIC)] != BOOK_MAGIC or \
+            len(data) != len(BOOK_MAGIC) + 2 * 3 ** 9:
+        return build_book()
+    return data[len(BOOK_MAGIC):]
+
+
+def play_headless_game(player_x, player_o, board_class=BitBoard):
+    """
+    Партия без отображения поля и ввода (для турниров компьютеров)
+
+    Args:
+        player_x (AIPlayer): Игрок за ❌ (ходит первым)
+        player_o (AIPlayer): Игрок за ⭕
+        board_class (callable): Класс игрового поля или функция,
+            создающая пустое поле
+
+    Returns:
+        Symbol or None: Символ победителя или None при ничьей
+    """
+    board = board_class()
+    players = (player_x, player_o)
+    turn = 0
+    while True:
+        player = players[turn]
+        board.change_cell_state(player.make_move(board), player.symbol)
+        game_over, winner = board.is_game_over()
+        if game_over:
+            return winner
+        turn ^= 1
+
+
+def _tournament_worker(difficulty_x, difficulty_o, games, seed, size=3,
+                       win_length=3, iterations=None, time_limit=None):
+    """
+    Серия партий в отдельном процессе
+
+    Returns:
+        tuple: (победы ❌, победы ⭕, ничьи, партий Монте-Карло,
+            секунд поиска Монте-Карло)
+    """
+    random.seed(seed)
+    player_x = AIPlayer("X", Symbol.X, difficulty_x, verbose=False,
+                        iterations=iterations, time_limit=time_limit)
+    player_o = AIPlayer("O", Symbol.O, difficulty_o, verbose=False,
+                        iterations=iterations, time_limit=time_limit)
+    if (size, win_length) == (3, 3):
+        board_class = BitBoard
+    else:
+        def board_class():
+            return GridBoard(size, win_length)
+    x_wins = o_wins = draws = 0
+    for _ in range(games):
+        winner = play_headless_game(player_x, player_o, board_class)
+        if winner == Symbol.X:
+            x_wins += 1
+        elif winner == Symbol.O:
+            o_wins += 1
+        else:
+            draws += 1
+    return (x_wins, o_wins, draws, player_x.playouts + player_o.playouts,
+            player_x.search_seconds + player_o.search_seconds)
+
+
+def run_tournament(difficulty_x, difficulty_o, games=10000, workers=None,
+                   seed=None, size=3, win_length=3, iterations=None,
+                   time_limit=None):
+    """
+    Турнир компьютеров без отображения: games партий, распределенных
+    по процессам
+
+    Args:
+        difficulty_x (str): Уровень ИИ, играющего ❌ (ходит первым)
+        difficulty_o (str): Уровень ИИ, играющего ⭕
+        games (int): Количество партий
+        workers (int, optional): Количество процессов (по умолчанию
+            os.cpu_count(); 1 - без дополнительных процессов)
+        seed (int, optional): Зерно для воспроизводимых результатов
+        size (int): Размер поля (3 - классическое поле на битовых масках,
+            иначе GridBoard)
+        win_length (int): Сколько символов в ряд нужно для победы
+        iterations (int, optional): Партий на ход для уровня "монте-карло"
+        time_limit (float, optional): Миллисекунд на ход для уровня
+            "монте-карло"
+
+    Returns:
+        dict: Победы, ничьи, их доли, время, партий в секунду и скорость
+            поиска Монте-Карло (случайных партий в секунду)
+
+    Raises:
+        ValueError: Если уровень сложности или размеры поля неверны
+    """
+    GridBoard(size, win_length)  # Проверка размеров до запуска процессов
+    for difficulty in (difficulty_x, difficulty_o):
+        if difficulty not in AIPlayer.DIFFICULTIES:
+            raise ValueError(f"Неизвестный уровень сложности '{difficulty}'")
+
+    workers = max(1, min(workers or os.cpu_count() or 1, games or 1))
+    if seed is None:
+        seed = random.randrange(2 ** 32)
+    # Партии делятся между процессами поровну, у каждого свое зерно
+    shares = [games // workers + (1 if i < games % workers else 0)
+              for i in range(workers)]
+
+    start = time.perf_counter()
+    if workers == 1:
+        results = [_tournament_worker(difficulty_x, difficulty_o, games, seed,
+                                      size, win_length, iterations,
+                                      time_limit)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(
+                _tournament_worker, [difficulty_x] * workers,
+                [difficulty_o] * workers, shares,
+                [seed + i for i in range(workers)], [size] * workers,
+                [win_length] * workers, [iterations] * workers,
+                [time_limit] * workers))
+    elapsed = time.perf_counter() - start
+
+    x_wins, o_wins, draws, playouts, search_seconds = (
+        sum(column) for column in zip(*results))
+    total = max(games, 1)
+    return {
+        'difficulty_x': difficulty_x,
+        'difficulty_o': difficulty_o,
+        'size': size,
+        'win_length': win_length,
+        'games': games,
+        'x_wins': x_wins,
+        'o_wins': o_wins,
+        'draws': draws,
+        'x_win_rate': x_wins / total * 100,
+        'o_win_rate': o_wins / total * 100,
+        'draw_rate': draws / total * 100,
+        'seconds': elapsed,
+        'games_per_sec': games / elapsed if elapsed else 0.0,
+        'playouts_per_sec': playouts / search_seconds if search_seconds
+        else 0.0,
+        'workers': workers,
+    }
+
+
+def show_tournament_results(result):
+    """
+    Показать результаты турнира
+
+    Args:
+        result (dict): Результат run_tournament
+    """
+    print("\n" + "=" * 60)
+    print("🏆 РЕЗУЛЬТАТЫ ТУРНИРА")
+    print("=" * 60)
+    print(f"   {Symbol.X.value} {result['difficulty_x']} против "
+          f"{Symbol.O.value} {result['difficulty_o']} "
+          f"(поле {result['size']}x{result['size']}, "
+          f"{result['win_length']} в ряд)")
+    print(f"   Сыграно партий: {result['games']} "
+          f"(процессов: {result['workers']})")
+    print(f"   Побед {Symbol.X.value}: {result['x_wins']} "
+          f"({result['x_win_rate']:.1f}%)")
+    print(f"   Побед {Symbol.O.value}: {result['o_wins']} "
+          f"({result['o_win_rate']:.1f}%)")
+    print(f"   Ничьих: {result['draws']} ({result['draw_rate']:.1f}%)")
+    print(f"   Время: {result['seconds']:.2f} с, "
+          f"{result['games_per_sec']:,.0f} партий/с")
+    if result['playouts_per_sec']:
+        print(f"   Монте-Карло: {result['playouts_per_sec']:,.0f} "
+              f"случайных партий/с")
+
+
+def setup_tournament():
+    """Настройка и запуск турнира компьютеров из меню"""
+    print("\n" + "=" * 60)
+    print("🤖 ТУРНИР КОМПЬЮТЕРОВ")
+    print("=" * 60)
+
+    difficulties = AIPlayer.DIFFICULTIES
+    print("\nУровни сложности:")
+    for i, difficulty in enumerate(difficulties, 1):
+        print(f"{i}. {difficulty}")
+
+    chosen = []
+    for symbol in (Symbol.X, Symbol.O):
+        while True:
+            choice = input(
+                f"\nУровень для {symbol.value} (1-{len(difficulties)}): ").strip()
+            if choice.isdigit() and 1 <= int(choice) <= len(difficulties):
+                chosen.append(difficulties[int(choice) - 1])
+                break
+            print("❌ Неверный выбор!")
 
-        # Выполняем ход
-        new_board.change_cell_state(cell_number, symbol)
-        return new_board
+    while True:
+        games = input("\nКоличество партий (по умолчанию 10000): ").strip()
+        if not games:
+            games = 10000
+            break
+        if games.isdigit() and int(games) > 0:
+            games = int(games)
+            break
+        print("❌ Введите положительное число!")
+
+    print("\n⏳ Идет турнир...")
+    show_tournament_results(run_tournament(chosen[0], chosen[1], games))
+    input("\nНажмите Enter чтобы продолжить...")
 
 
 def main():
@@ -675,9 +1916,10 @@ def main():
         print("1. 🎮 Начать новую игру")
         print("2. 📖 Показать правила")
         print("3. 📊 Показать статистику (если была игра)")
-        print("4. 🚪 Выход")
+        print("4. 🤖 Турнир компьютеров")
+        print("5. 🚪 Выход")
 
-        choice = input("\nВаш выбор (1-4): ").strip()
+        choice = input("\nВаш выбор (1-5): ").strip()
 
         if choice == "1":
             game = Game()  # Новая игра
@@ -693,12 +1935,49 @@ def main():
                     "\n❌ Статистика недоступна. Сначала сыграйте хотя бы одну игру!")
                 input("\nНажмите Enter чтобы продолжить...")
         elif choice == "4":
+            setup_tournament()
+        elif choice == "5":
             print("\n👋 До свидания! Спасибо за игру!")
             break
         else:
-            print("❌ Неверный выбор! Пожалуйста, выберите 1-4.")
+            print("❌ Неверный выбор! Пожалуйста, выберите 1-5.")
             input("\nНажмите Enter чтобы продолжить...")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Крестики-нолики")
+    parser.add_argument("--tournament", nargs=2, metavar=("X", "O"),
+                        choices=AIPlayer.DIFFICULTIES,
+                        help="турнир компьютеров без отображения: "
+                             "уровни для ❌ и ⭕")
+    parser.add_argument("--games", type=int, default=10000,
+                        help="количество партий турнира")
+    parser.add_argument("--workers", type=int, help="количество процессов")
+    parser.add_argument("--seed", type=int, help="зерно генератора")
+    parser.add_argument("--size", type=int, default=3, help="размер поля N")
+    parser.add_argument("--win-length", type=int, default=3,
+                        help="сколько символов в ряд нужно для победы")
+    parser.add_argument("--iterations", type=int,
+                        help="уровень монте-карло: партий на ход")
+    parser.add_argument("--time-limit", type=float,
+                        help="уровень монте-карло: миллисекунд на ход")
+    parser.add_argument("--build-book", action="store_true",
+                        help="построить книгу ходов и сохранить ее в "
+                             "файл рядом с программой")
+    args = parser.parse_args()
+
+    if args.build_book:
+        start = time.perf_counter()
+        book = save_book()
+        elapsed = time.perf_counter() - start
+        positions = sum(1 for i in range(0, len(book), 2)
+                        if book[i] or book[i + 1])
+        print(f"📖 Книга ходов: {positions} позиций с ходами, "
+              f"{len(book)} байт, {elapsed:.2f} с -> {BOOK_PATH}")
+    elif args.tournament:
+        show_tournament_results(run_tournament(
+            args.tournament[0], args.tournament[1], args.games, args.workers,
+            args.seed, args.size, args.win_length, args.iterations,
+            args.time_limit))
+    else:
+        main()
\ No newline at end of file
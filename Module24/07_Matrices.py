@@ -1,12 +1,72 @@
-import copy
+import argparse
+import atexit
+import bisect
+import functools
+import json
 import math
+import mmap as mmap_module
+import operator
+import os
 import random
+import struct
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from fractions import Fraction
+from itertools import chain, repeat
+from multiprocessing import shared_memory
+
+try:
+    import numpy as np
+except ImportError:  # NumPy не обязателен: без него работают "list" и "array"
+    np = None
 
 
 class Matrix:
     """Класс для работы с матрицами с поддержкой основных операций линейной алгебры"""
 
-    def __init__(self, rows, cols=None, data=None, fill_value=0):
+    # Способы хранения элементов:
+    #   "list"  - список списков (по умолчанию, сохраняет int/float как есть)
+    #   "array" - непрерывный буфер array('d') по строкам (row-major),
+    #             элемент (i, j) лежит по адресу offset + i * strides[0] + j * strides[1]
+    #   "numpy" - двумерный numpy.ndarray float64, операции выполняются
+    #             векторно; элементы хранятся как float, как и в "array"
+    #             (доступно, только если установлен NumPy)
+    STORAGES = ("list", "array", "numpy")
+
+    # Способ хранения для матриц, созданных без явного storage
+    # (см. set_default_storage)
+    default_storage = "list"
+
+    # Алгоритмы умножения матриц (см. multiply)
+    MULTIPLY_ALGORITHMS = ("naive", "blocked", "strassen")
+
+    # Алгоритм, который multiply (и оператор *) использует по умолчанию
+    default_multiply_algorithm = "naive"
+
+    # Размер, начиная с которого Strassen перестает делить матрицы
+    # и переходит на блочное умножение (см. tune_strassen_threshold)
+    STRASSEN_THRESHOLD = 64
+
+    # Двоичный формат файла (см. save/load): заголовок из сигнатуры,
+    # версии формата, числа строк и столбцов (24 байта, чтобы данные были
+    # выровнены по 8 байт), затем элементы float64 little-endian по строкам
+    FILE_MAGIC = b"MTRX"
+    FILE_VERSION = 1
+    _FILE_HEADER = struct.Struct("<4sHxxQQ")
+
+    # Матрица с числом элементов больше PRINT_THRESHOLD выводится сокращенно
+    # (см. write): по PRINT_EDGE_ITEMS первых и последних строк и столбцов
+    PRINT_THRESHOLD = 1000
+    PRINT_EDGE_ITEMS = 3
+
+    def __init__(self, rows, cols=None, data=None, fill_value=0,
+                 storage=None):
         """
         Инициализация матрицы
 
@@ -15,51 +75,420 @@ class Matrix:
             cols (int, optional): Количество столбцов (если None, то cols=rows)
             data (list of list, optional): Данные матрицы
             fill_value (int/float, optional): Значение для заполнения при создании матрицы
+            storage (str, optional): Способ хранения элементов (см. STORAGES),
+                по умолчанию Matrix.default_storage
         """
         if cols is None:
             cols = rows  # Создание квадратной матрицы
 
+        storage = self._check_storage(storage)
+
         self.rows = rows
         self.cols = cols
+        self.storage = storage
 
         if data is not None:
             # Проверяем, что данные корректны
             if len(data) != rows or any(len(row) != cols for row in data):
                 raise ValueError(
                     f"Данные не соответствуют размеру {rows}x{cols}")
-            self.data = [list(row) for row in data]
+
+        if storage == "array":
+            # Один непрерывный буфер вместо списка списков
+            if data is not None:
+                self._buf = array('d', [x for row in data for x in row])
+            else:
+                self._buf = array('d', [fill_value]) * (rows * cols)
+            self._offset = 0
+            self.strides = (cols, 1)
+        elif storage == "numpy":
+            if data is not None and rows > 0 and cols > 0:
+                self._array = np.array(data, dtype=float)
+            else:
+                self._array = np.full((rows, cols), fill_value, dtype=float)
+        elif data is not None:
+            self._data = [list(row) for row in data]
         else:
             # Создаем матрицу, заполненную fill_value
-            self.data = [[fill_value for _ in range(cols)] for _ in
-                         range(rows)]
+            self._data = [[fill_value for _ in range(cols)] for _ in
+                          range(rows)]
+
+    @classmethod
+    def _check_storage(cls, storage):
+        """
+        Проверка способа хранения
+
+        Args:
+            storage (str or None): Способ хранения (None - по умолчанию)
+
+        Returns:
+            str: Проверенный способ хранения
+
+        Raises:
+            ValueError: Если способ хранения неизвестен
+            ImportError: Если для хранения "numpy" не установлен NumPy
+        """
+        if storage is None:
+            storage = cls.default_storage
+        if storage not in cls.STORAGES:
+            raise ValueError(
+                f"Неизвестный способ хранения '{storage}', доступны: {cls.STORAGES}")
+        if storage == "numpy" and np is None:
+            raise ImportError("Для хранения 'numpy' требуется NumPy")
+        return storage
+
+    @classmethod
+    def set_default_storage(cls, storage):
+        """
+        Выбор способа хранения для новых матриц
+
+        Значение "auto" выбирает "numpy", если NumPy установлен,
+        и "list" в противном случае.
+
+        Args:
+            storage (str): Способ хранения (см. STORAGES) или "auto"
+
+        Returns:
+            str: Выбранный способ хранения
+        """
+        if storage == "auto":
+            storage = "numpy" if np is not None else "list"
+        cls.default_storage = cls._check_storage(storage)
+        return cls.default_storage
+
+    @property
+    def data(self):
+        """
+        Строки матрицы
+
+        Для хранения "list" возвращается сам список списков.
+        Для хранения "array" возвращается список представлений строк
+        (memoryview), запись в которые изменяет буфер матрицы.
+        Для хранения "numpy" возвращается сам ndarray (float64, поэтому
+        запись дробного значения в m.data[i][j] не усекается).
+        """
+        if self.storage == "array":
+            view = memoryview(self._buf)
+            return [view[self._row_slice(i)] for i in range(self.rows)]
+        if self.storage == "numpy":
+            return self._array
+        return self._data
+
+    @data.setter
+    def data(self, value):
+        """Замена всех строк матрицы"""
+        if self.storage == "array":
+            for i, row in enumerate(value):
+                self._set_row(i, row)
+        elif self.storage == "numpy":
+            self._array = np.array(value, dtype=float).reshape(self.rows,
+                                                               self.cols)
+        else:
+            self._data = value
+
+    @classmethod
+    def _from_flat(cls, rows, cols, values, storage, adopt=False):
+        """
+        Создание матрицы из плоской последовательности элементов (по строкам)
+        без промежуточного заполнения
+
+        Args:
+            rows (int): Количество строк
+            cols (int): Количество столбцов
+            values (list or array): Элементы матрицы по строкам
+            storage (str): Способ хранения
+            adopt (bool): Использовать memoryview или ndarray values как
+                буфер без копирования (для load над отображенным файлом);
+                иначе чужие буферы копируются
+
+        Returns:
+            Matrix: Новая матрица
+        """
+        result = cls.__new__(cls)
+        result.rows = rows
+        result.cols = cols
+        result.storage = storage
+        if storage == "array":
+            if isinstance(values, memoryview) and values.format == 'd' \
+                    and adopt:
+                result._buf = values
+            elif isinstance(values, memoryview):
+                result._buf = array('d')
+                result._buf.frombytes(values.cast('B'))
+            else:
+                # Новый array('d') от вызывающего кода берется как есть
+                result._buf = values if isinstance(values, array) \
+                    else array('d', values)
+            result._offset = 0
+            result.strides = (cols, 1)
+        elif storage == "numpy":
+            if adopt or not isinstance(values, (memoryview, array)):
+                result._array = np.asarray(values, dtype=float).reshape(
+                    rows, cols)
+            else:
+                result._array = np.array(values, dtype=float).reshape(
+                    rows, cols)
+        else:
+            if not isinstance(values, list):
+                values = list(values)
+            result._data = [values[i * cols:(i + 1) * cols] for i in
+                            range(rows)]
+        return result
+
+    def _new_like(self, rows, cols, values):
+        """Матрица с тем же способом хранения, что и у текущей"""
+        return self._from_flat(rows, cols, values, self.storage)
+
+    def _wrap_ndarray(self, values):
+        """
+        Матрица с хранением "numpy" поверх готового двумерного ndarray
+        (массив другого типа приводится к float64)
+        """
+        result = self.__class__.__new__(self.__class__)
+        result.rows, result.cols = values.shape
+        result.storage = "numpy"
+        result._array = values if values.dtype == np.float64 else \
+            values.astype(float)
+        return result
+
+    def _as_ndarray(self):
+        """
+        Элементы матрицы в виде двумерного ndarray
+
+        Returns:
+            numpy.ndarray: Для хранения "numpy" - сам массив, иначе копия
+        """
+        if self.storage == "numpy":
+            return self._array
+        if self.storage == "array" and self.is_contiguous():
+            return np.frombuffer(self._flat(), dtype=float).reshape(
+                self.rows, self.cols)
+        return np.array(self._row_lists(), dtype=float).reshape(self.rows,
+                                                                self.cols)
+
+    def _view(self, rows, cols, offset, strides):
+        """
+        Представление (view) над буфером текущей матрицы без копирования данных
+
+        Returns:
+            Matrix: Матрица, разделяющая буфер с текущей
+        """
+        result = self.__class__.__new__(self.__class__)
+        result.rows = rows
+        result.cols = cols
+        result.storage = "array"
+        result._buf = self._buf
+        result._offset = offset
+        result.strides = strides
+        return result
+
+    def _index(self, i, j):
+        """Позиция элемента (i, j) в буфере (хранение "array")"""
+        if i < 0:
+            i += self.rows
+        if j < 0:
+            j += self.cols
+        if not (0 <= i < self.rows and 0 <= j < self.cols):
+            raise IndexError("Индекс за пределами матрицы")
+        return self._offset + i * self.strides[0] + j * self.strides[1]
+
+    def _row_slice(self, i):
+        """Срез буфера, соответствующий строке i (хранение "array")"""
+        start = self._offset + i * self.strides[0]
+        if self.cols == 0:
+            return slice(start, start)
+        step = self.strides[1]
+        return slice(start, start + (self.cols - 1) * step + 1, step)
+
+    def _set_row(self, i, values):
+        """Запись строки i в буфер (хранение "array")"""
+        if len(values) != self.cols:
+            raise ValueError(
+                f"Строка должна содержать {self.cols} элементов")
+        memoryview(self._buf)[self._row_slice(i)] = array('d', values)
+
+    def is_contiguous(self):
+        """
+        Лежат ли элементы в буфере подряд по строкам
+
+        Returns:
+            bool: True для хранения "list" и для непрерывного буфера "array"
+        """
+        if self.storage != "array":
+            return True
+        return self.strides == (self.cols, 1)
+
+    def _row_lists(self):
+        """
+        Строки матрицы в виде списков (только для чтения)
+
+        Returns:
+            list of list: Для "list" - сами строки матрицы, для "array" - копии
+        """
+        if self.storage == "array":
+            view = memoryview(self._buf)
+            return [view[self._row_slice(i)].tolist() for i in
+                    range(self.rows)]
+        if self.storage == "numpy":
+            return self._array.tolist()
+        return self._data
+
+    def _flat(self):
+        """
+        Все элементы матрицы по строкам (только для чтения)
+
+        Returns:
+            list or array: Плоская последовательность элементов
+        """
+        if self.storage == "array":
+            if self.is_contiguous():
+                return self._buf[self._offset:
+                                 self._offset + self.rows * self.cols]
+            return [x for row in self._row_lists() for x in row]
+        if self.storage == "numpy":
+            return self._array.ravel().tolist()
+        return [x for row in self._data for x in row]
+
+    def lazy(self):
+        """
+        Отложенное выражение над матрицей (см. LazyMatrix)
+
+        Returns:
+            LazyMatrix: Узел-лист с этой матрицей
+        """
+        return LazyMatrix.leaf(self)
+
+    def to_storage(self, storage):
+        """
+        Копия матрицы с другим способом хранения
+
+        Args:
+            storage (str): Способ хранения (см. STORAGES)
+
+        Returns:
+            Matrix: Новая матрица с теми же элементами
+        """
+        storage = self._check_storage(storage)
+        values = self._flat()
+        if storage == "list" and not isinstance(values, list):
+            values = values.tolist()
+        return self._from_flat(self.rows, self.cols, values, storage)
 
     def __str__(self):
-        """Строковое представление матрицы"""
-        # Определяем максимальную длину элемента для форматирования
-        max_len = 0
-        for row in self.data:
-            for element in row:
-                element_str = f"{element:.6f}" if isinstance(element,
-                                                             float) else str(
-                    element)
-                max_len = max(max_len, len(element_str))
-
-        result = []
-        for row in self.data:
-            row_str = []
-            for element in row:
-                # Форматируем числа: целые показываем как целые, вещественные с 6 знаками
-                if isinstance(element, float):
-                    element_str = f"{element:>{max_len}.6f}"
-                else:
-                    element_str = f"{element:>{max_len}}"
-                row_str.append(element_str)
-            result.append("  ".join(row_str))
+        """Строковое представление матрицы (большие матрицы - сокращенно)"""
+        return "\n".join(self._format_lines())
+
+    def write(self, file=None, summarize=None, edge_items=None):
+        """
+        Потоковый вывод матрицы построчно в файлоподобный объект
+
+        Строки форматируются и записываются по одной, поэтому вывод большой
+        матрицы не собирает весь текст в памяти.
+
+        Args:
+            file (file-like, optional): Объект с методом write (по умолчанию sys.stdout)
+            summarize (bool, optional): Сокращенный вывод с "..." вместо
+                средних строк и столбцов; по умолчанию - если элементов
+                больше PRINT_THRESHOLD
+            edge_items (int, optional): Сколько первых и последних строк
+                и столбцов показывать в сокращенном виде
+                (по умолчанию PRINT_EDGE_ITEMS)
+        """
+        if file is None:
+            file = sys.stdout
+        for line in self._format_lines(summarize, edge_items):
+            file.write(line)
+            file.write("\n")
+
+    @staticmethod
+    def _format_element(element, width=0):
+        """Форматирование элемента: целые как целые, вещественные с 6 знаками"""
+        if isinstance(element, float):
+            return f"{element:>{width}.6f}"
+        # str() нужен для Fraction, который не поддерживает выравнивание
+        return f"{element!s:>{width}}"
+
+    @classmethod
+    def _format_width(cls, values):
+        """
+        Длина самого длинного отформатированного элемента
+
+        Если все элементы - конечные float или все int, длина растет вместе
+        с модулем числа, и достаточно отформатировать минимум и максимум.
+        Иначе форматируется каждый элемент.
+
+        Args:
+            values (list): Элементы
+
+        Returns:
+            int: Ширина столбца
+        """
+        if not values:
+            return 0
+        kinds = set(map(type, values))
+        if kinds == {int} or (kinds == {float} and math.isfinite(sum(values))):
+            return max(len(cls._format_element(min(values))),
+                       len(cls._format_element(max(values))))
+        return max(len(cls._format_element(x)) for x in values)
+
+    def _row_values(self, i):
+        """Значения строки i в виде списка (только для чтения)"""
+        if self.storage == "array":
+            return memoryview(self._buf)[self._row_slice(i)].tolist()
+        if self.storage == "numpy":
+            return self._array[i].tolist()
+        return self._data[i]
+
+    def _format_lines(self, summarize=None, edge_items=None):
+        """
+        Построчное форматирование матрицы (см. write)
+
+        В сокращенном виде форматируются только видимые углы матрицы.
 
-        return "\n".join(result)
+        Yields:
+            str: Очередная строка текста
+        """
+        if edge_items is None:
+            edge_items = self.PRINT_EDGE_ITEMS
+        if summarize is None:
+            summarize = self.rows * self.cols > self.PRINT_THRESHOLD
+
+        row_indices = list(range(self.rows))
+        if summarize and self.rows > 2 * edge_items:
+            # None - место пропущенных строк
+            row_indices = row_indices[:edge_items] + [None] + \
+                row_indices[self.rows - edge_items:]
+        skip_cols = summarize and self.cols > 2 * edge_items
+
+        def visible(i):
+            row = self._row_values(i)
+            if skip_cols:
+                return row[:edge_items], row[self.cols - edge_items:]
+            return row, ()
+
+        # Первый проход - ширина по видимым элементам, второй - вывод
+        width = 0
+        for i in row_indices:
+            if i is not None:
+                head, tail = visible(i)
+                width = max(width, self._format_width(head),
+                            self._format_width(list(tail)))
+
+        for i in row_indices:
+            if i is None:
+                yield "..."
+                continue
+            head, tail = visible(i)
+            parts = [self._format_element(x, width) for x in head]
+            if skip_cols:
+                parts.append("...")
+                parts.extend(self._format_element(x, width) for x in tail)
+            yield "  ".join(parts)
 
     def __repr__(self):
         """Представление для отладки"""
+        if self.storage != "list":
+            return f"Matrix({self.rows}, {self.cols}, storage='{self.storage}')"
         return f"Matrix({self.rows}, {self.cols})"
 
     def __eq__(self, other):
@@ -68,11 +497,9 @@ class Matrix:
             return False
         if self.rows != other.rows or self.cols != other.cols:
             return False
-        for i in range(self.rows):
-            for j in range(self.cols):
-                if self.data[i][j] != other.data[i][j]:
-                    return False
-        return True
+        if self.storage == "numpy" and other.storage == "numpy":
+            return bool(np.array_equal(self._array, other._array))
+        return all(map(operator.eq, self._flat(), other._flat()))
 
     def __add__(self, other):
         """Перегрузка оператора +"""
@@ -82,6 +509,20 @@ class Matrix:
         """Перегрузка оператора -"""
         return self.subtract(other)
 
+    def __radd__(self, other):
+        """Перегрузка оператора + со скаляром слева"""
+        return self.add(other)
+
+    def __rsub__(self, other):
+        """Перегрузка оператора - со скаляром или SparseMatrix слева"""
+        return self.scalar_multiply(-1).add(other)
+
+    def __rmul__(self, other):
+        """Перегрузка оператора * со скаляром слева"""
+        if isinstance(other, (int, float)):
+            return self.scalar_multiply(other)
+        return NotImplemented
+
     def __mul__(self, other):
         """
         Перегрузка оператора *
@@ -91,14 +532,47 @@ class Matrix:
             return self.scalar_multiply(other)
         elif isinstance(other, Matrix):
             return self.multiply(other)
+        elif isinstance(other, SparseMatrix):
+            # A * S = (S^T * A^T)^T: разреженная матрица остается слева
+            return other.transpose().multiply(self.transpose()).transpose()
         else:
             raise TypeError("Неподдерживаемый тип для умножения")
 
+    def __iadd__(self, other):
+        """Перегрузка оператора += (результат записывается в эту же матрицу)"""
+        return self.add(other, out=self)
+
+    def __isub__(self, other):
+        """Перегрузка оператора -= (результат записывается в эту же матрицу)"""
+        return self.subtract(other, out=self)
+
+    def __imul__(self, other):
+        """
+        Перегрузка оператора *=
+        Умножение на скаляр и на матрицу того же числа столбцов выполняется
+        в эту же матрицу, иначе возвращается новая матрица
+        """
+        if isinstance(other, (int, float)):
+            return self.scalar_multiply(other, out=self)
+        if isinstance(other, Matrix) and other.cols == self.cols:
+            return self.multiply(other, out=self)
+        return self * other
+
     def __getitem__(self, index):
         """Получение элемента или строки по индексу"""
         if isinstance(index, tuple):
             i, j = index
-            return self.data[i][j]
+            if self.storage == "array":
+                return self._buf[self._index(i, j)]
+            if self.storage == "numpy":
+                return self._array[i, j].item()
+            return self._data[i][j]
+        elif self.storage == "array" and isinstance(index, int):
+            if index < 0:
+                index += self.rows
+            if not 0 <= index < self.rows:
+                raise IndexError("Индекс за пределами матрицы")
+            return memoryview(self._buf)[self._row_slice(index)]
         else:
             return self.data[index]
 
@@ -106,126 +580,499 @@ class Matrix:
         """Установка элемента или строки по индексу"""
         if isinstance(index, tuple):
             i, j = index
-            self.data[i][j] = value
+            if self.storage == "array":
+                self._buf[self._index(i, j)] = value
+            elif self.storage == "numpy":
+                self._array[i, j] = value
+            else:
+                self._data[i][j] = value
         else:
             if isinstance(value, list) and len(value) == self.cols:
-                self.data[index] = value
+                if self.storage == "array":
+                    self._set_row(index, value)
+                elif self.storage == "numpy":
+                    self._array[index] = value
+                else:
+                    self._data[index] = value
             else:
                 raise ValueError(
                     f"Строка должна содержать {self.cols} элементов")
 
-    def add(self, other):
+    def _check_out(self, out, rows, cols):
         """
-        Сложение матриц
+        Проверка буфера для результата
+
+        Raises:
+            ValueError: Если out не матрица нужного размера
+        """
+        if not isinstance(out, Matrix) or out.rows != rows or out.cols != cols:
+            raise ValueError(
+                f"out должен быть матрицей размера {rows}x{cols}")
+
+    def _write_rows(self, row_values):
+        """
+        Запись строк в существующий буфер матрицы без создания новой матрицы
 
         Args:
-            other (Matrix): Матрица для сложения
+            row_values (iterable): Значения для каждой строки по порядку
 
         Returns:
-            Matrix: Результат сложения
+            Matrix: Эта же матрица
+        """
+        if self.storage == "array":
+            view = memoryview(self._buf)
+            for i, values in enumerate(row_values):
+                view[self._row_slice(i)] = array('d', values)
+        elif self.storage == "numpy":
+            for i, values in enumerate(row_values):
+                self._array[i] = list(values)
+        else:
+            for row, values in zip(self._data, row_values):
+                row[:] = values
+        return self
+
+    def _result_from_flat(self, rows, cols, values, out):
+        """
+        Результат операции из плоской последовательности: новая матрица
+        или запись в буфер out
+
+        Returns:
+            Matrix: Новая матрица или out
+        """
+        if out is None:
+            return self._new_like(rows, cols, values)
+        self._check_out(out, rows, cols)
+        return out._write_rows(
+            values[i * cols:(i + 1) * cols] for i in range(rows))
+
+    def _result_from_shared_memory(self, shm, rows, cols, out):
+        """
+        Результат параллельной операции из блока общей памяти: элементы
+        копируются один раз прямо в буфер результата (новый array('d'),
+        строки-списки или непрерывный буфер out)
+
+        Returns:
+            Matrix: Новая матрица или out
+        """
+        count = rows * cols
+        raw = shm.buf[:count * 8]
+        view = raw.cast('d')
+        try:
+            if out is None:
+                if self.storage == "array":
+                    values = array('d')
+                    values.frombytes(raw)
+                else:
+                    values = view.tolist()
+                return self._new_like(rows, cols, values)
+            self._check_out(out, rows, cols)
+            if out.storage == "array" and out.is_contiguous():
+                memoryview(out._buf)[out._offset:out._offset + count] = view
+                return out
+            if out.storage == "numpy":
+                out._array[...] = np.frombuffer(view, count=count).reshape(
+                    rows, cols)
+                return out
+            return out._write_rows(view[i * cols:(i + 1) * cols]
+                                   for i in range(rows))
+        finally:
+            view.release()
+            raw.release()
+
+    def _elementwise(self, op, ufunc, other, out, error):
+        """
+        Поэлементная операция с матрицей или скаляром с поддержкой broadcasting
+
+        Операнд-строка (1xN), операнд-столбец (Mx1) и скаляр не расширяются
+        до полного размера: их элементы повторяются на лету за один проход.
+
+        Args:
+            op (callable): Операция над парой элементов (например, operator.add)
+            ufunc (numpy.ufunc): Та же операция для хранения "numpy"
+            other (Matrix or int/float): Второй операнд
+            out (Matrix or None): Готовая матрица для записи результата
+            error (str): Сообщение об ошибке при несовместимых размерах
+
+        Returns:
+            Matrix: Новая матрица или out
+
+        Raises:
+            ValueError: Если размеры несовместимы для broadcasting
+        """
+        if isinstance(other, (int, float)):
+            rows, cols = self.rows, self.cols
+        else:
+            shape = _broadcast_shape((self.rows, self.cols),
+                                     (other.rows, other.cols))
+            if shape is None:
+                raise ValueError(error)
+            rows, cols = shape
+
+        if self.storage == "numpy":
+            operand = other if isinstance(other, (int, float)) else \
+                other._as_ndarray()
+            return self._numpy_into(ufunc, (self._array, operand), out,
+                                    (rows, cols))
+
+        if out is not None:
+            self._check_out(out, rows, cols)
+            if isinstance(other, (int, float)):
+                row_values = ([op(x, other) for x in row]
+                              for row in self._row_lists())
+            else:
+                row_values = _broadcast_rows(op, self, other, rows, cols)
+            return out._write_rows(row_values)
+
+        if isinstance(other, (int, float)):
+            values = [op(x, other) for x in self._flat()]
+        elif (self.rows, self.cols) == (other.rows, other.cols):
+            values = list(map(op, self._flat(), other._flat()))
+        else:
+            values = list(map(op, _broadcast_flat(self, rows, cols),
+                              _broadcast_flat(other, rows, cols)))
+        return self._new_like(rows, cols, values)
+
+    def _sparse_elementwise(self, op, other, out, action):
+        """
+        Сложение или вычитание разреженной матрицы: копия плотной матрицы
+        и поправки только в ненулевых элементах other (O(nnz))
+
+        Args:
+            op (callable): operator.add или operator.sub
+            other (SparseMatrix): Разреженная матрица той же формы
+            out (Matrix or None): Готовая матрица для записи результата
+            action (str): Глагол для сообщения об ошибке
+
+        Returns:
+            Matrix: Новая матрица или out
 
         Raises:
             ValueError: Если размеры матриц не совпадают
         """
-        if self.rows != other.rows or self.cols != other.cols:
+        if (self.rows, self.cols) != (other.rows, other.cols):
             raise ValueError(
-                f"Нельзя сложить матрицы размеров {self.rows}x{self.cols} и {other.rows}x{other.cols}")
+                f"Нельзя {action} матрицы размеров {self.rows}x{self.cols} "
+                f"и {other.rows}x{other.cols}")
+        if out is None:
+            result = self.copy()
+        else:
+            self._check_out(out, self.rows, self.cols)
+            result = out if out is self else out._write_rows(self._row_lists())
+        for i, j, value in other.items():
+            result[i, j] = op(result[i, j], value)
+        return result
 
-        result = Matrix(self.rows, self.cols)
-        for i in range(self.rows):
-            for j in range(self.cols):
-                result.data[i][j] = self.data[i][j] + other.data[i][j]
+    def _numpy_into(self, ufunc, operands, out, shape):
+        """
+        Векторная операция NumPy: новая матрица или запись в буфер out
 
-        return result
+        Если out хранит ndarray подходящего типа, ufunc пишет результат прямо
+        в него без временного массива.
 
-    def subtract(self, other):
+        Args:
+            ufunc (numpy.ufunc): Операция
+            operands (tuple): Операнды операции
+            out (Matrix or None): Готовая матрица для записи результата
+            shape (tuple): Размер результата (rows, cols)
+
+        Returns:
+            Matrix: Новая матрица или out
         """
-        Вычитание матриц
+        if out is None:
+            return self._wrap_ndarray(ufunc(*operands))
+        self._check_out(out, *shape)
+        if out.storage == "numpy" and np.can_cast(np.result_type(*operands),
+                                                  out._array.dtype):
+            ufunc(*operands, out=out._array)
+            return out
+        return out._write_rows(ufunc(*operands).tolist())
+
+    def add(self, other, out=None):
+        """
+        Сложение матриц
 
         Args:
-            other (Matrix): Матрица для вычитания
+            other (Matrix, SparseMatrix or int/float): Матрица той же формы,
+                строка 1xN, столбец Mx1 или скаляр (broadcasting как
+                в NumPy); разреженная матрица - той же формы
+            out (Matrix, optional): Готовая матрица для записи результата
 
         Returns:
-            Matrix: Результат вычитания
+            Matrix: Результат сложения
 
         Raises:
-            ValueError: Если размеры матриц не совпадают
+            ValueError: Если размеры матриц несовместимы
         """
-        if self.rows != other.rows or self.cols != other.cols:
-            raise ValueError(
-                f"Нельзя вычесть матрицы размеров {self.rows}x{self.cols} и {other.rows}x{other.cols}")
+        if isinstance(other, SparseMatrix):
+            return self._sparse_elementwise(operator.add, other, out, "сложить")
+        return self._elementwise(
+            operator.add, np and np.add, other, out,
+            f"Нельзя сложить матрицы размеров {self.rows}x{self.cols} и "
+            f"{getattr(other, 'rows', 1)}x{getattr(other, 'cols', 1)}")
+
+    def subtract(self, other, out=None):
+        """
+        Вычитание матриц
 
-        result = Matrix(self.rows, self.cols)
-        for i in range(self.rows):
-            for j in range(self.cols):
-                result.data[i][j] = self.data[i][j] - other.data[i][j]
+        Args:
+            other (Matrix, SparseMatrix or int/float): Матрица той же формы,
+                строка 1xN, столбец Mx1 или скаляр (broadcasting как
+                в NumPy); разреженная матрица - той же формы
+            out (Matrix, optional): Готовая матрица для записи результата
 
-        return result
+        Returns:
+            Matrix: Результат вычитания
 
-    def multiply(self, other):
+        Raises:
+            ValueError: Если размеры матриц несовместимы
+        """
+        if isinstance(other, SparseMatrix):
+            return self._sparse_elementwise(operator.sub, other, out, "вычесть")
+        return self._elementwise(
+            operator.sub, np and np.subtract, other, out,
+            f"Нельзя вычесть матрицы размеров {self.rows}x{self.cols} и "
+            f"{getattr(other, 'rows', 1)}x{getattr(other, 'cols', 1)}")
+
+    def multiply(self, other, algorithm=None, block_size=64, threshold=None,
+                 parallel=False, workers=None, out=None):
         """
         Умножение матриц
 
         Args:
             other (Matrix): Матрица для умножения
+            algorithm (str, optional): Алгоритм умножения (см. MULTIPLY_ALGORITHMS),
+                по умолчанию Matrix.default_multiply_algorithm
+            block_size (int, optional): Размер блока для алгоритма "blocked"
+                (и для базового случая "strassen")
+            threshold (int, optional): Порог перехода Strassen на блочное умножение,
+                по умолчанию Matrix.STRASSEN_THRESHOLD
+            parallel (bool, optional): Считать полосы строк в отдельных процессах
+                общего пула (всегда блочным алгоритмом, элементы передаются
+                как float; при хранении "numpy" аргументы проверяются,
+                но умножение выполняет BLAS)
+            workers (int, optional): Количество процессов (включает parallel),
+                по умолчанию os.cpu_count()
+            out (Matrix, optional): Готовая матрица для записи результата
+                (может совпадать с self)
 
         Returns:
             Matrix: Результат умножения
 
         Raises:
-            ValueError: Если число столбцов первой матрицы не равно числу строк второй
+            ValueError: Если число столбцов первой матрицы не равно числу строк второй,
+                указан неизвестный алгоритм, алгоритм кроме "blocked" вместе
+                с parallel или workers < 1
         """
         if self.cols != other.rows:
             raise ValueError(
                 f"Нельзя умножить матрицы: {self.cols} != {other.rows}")
 
-        result = Matrix(self.rows, other.cols)
+        if algorithm is None:
+            algorithm = "blocked" if parallel or workers is not None \
+                else self.default_multiply_algorithm
+        if algorithm not in self.MULTIPLY_ALGORITHMS:
+            raise ValueError(
+                f"Неизвестный алгоритм умножения '{algorithm}', доступны: {self.MULTIPLY_ALGORITHMS}")
+        if parallel or workers is not None:
+            _check_workers(workers)
+            if algorithm != "blocked":
+                raise ValueError(
+                    f"Параллельное умножение выполняется только алгоритмом "
+                    f"'blocked', а не '{algorithm}'")
+
+        if self.storage == "numpy":
+            # Для ndarray умножение выполняет BLAS: аргументы проверены,
+            # но алгоритм и процессы не используются
+            return self._numpy_into(np.matmul,
+                                    (self._array, other._as_ndarray()), out,
+                                    (self.rows, other.cols))
+
+        if parallel or workers is not None:
+            return self._multiply_parallel(other, block_size, workers, out)
+
+        if algorithm == "naive":
+            values = self._multiply_naive(other)
+        elif algorithm == "blocked":
+            values = self._multiply_blocked(other, block_size)
+        else:
+            if threshold is None:
+                threshold = self.STRASSEN_THRESHOLD
+            values = self._multiply_strassen(other, threshold, block_size)
+
+        return self._result_from_flat(self.rows, other.cols, values, out)
+
+    def _multiply_parallel(self, other, block_size, workers, out=None):
+        """
+        Параллельное блочное умножение: каждая полоса строк self
+        считается в отдельном процессе
+
+        Операнды и результат лежат в общей памяти (shared_memory), поэтому
+        процессам передаются только имена блоков и границы полос, а не данные.
+        Процессы пишут свои полосы прямо в общий блок результата, откуда он
+        одним копированием попадает в буфер результата. Процессы берутся
+        из общего пула модуля (см. _process_pool) и не запускаются заново
+        при каждом вызове.
+
+        Returns:
+            Matrix: Результат умножения
+        """
+        n, m, p = self.rows, self.cols, other.cols
+        bands = _row_bands(n, workers)
+        a_shm = _to_shared_memory(self._flat())
+        b_shm = _to_shared_memory(other._flat())
+        c_shm = _to_shared_memory(n * p)
+        try:
+            _run_in_pool(len(bands), [
+                (_multiply_band, a_shm.name, b_shm.name, c_shm.name, m, p,
+                 start, stop, block_size)
+                for start, stop in bands])
+            return self._result_from_shared_memory(c_shm, n, p, out)
+        finally:
+            for shm in (a_shm, b_shm, c_shm):
+                shm.close()
+                shm.unlink()
+
+    def _multiply_naive(self, other):
+        """
+        Классическое умножение i-j-k: скалярное произведение строки на столбец
+
+        Returns:
+            list: Элементы результата по строкам
+        """
+        a = self._row_lists()
+        b = other._row_lists()
+        values = []
         for i in range(self.rows):
             for j in range(other.cols):
                 sum_val = 0
                 for k in range(self.cols):
-                    sum_val += self.data[i][k] * other.data[k][j]
-                result.data[i][j] = sum_val
+                    sum_val += a[i][k] * b[k][j]
+                values.append(sum_val)
+        return values
+
+    def _multiply_blocked(self, other, block_size):
+        """
+        Блочное умножение с порядком циклов i-k-j
+
+        Вместо обхода столбца other (other.data[k][j] по k) строка результата
+        накапливается целиком: c[i][j0:j1] += a[i][k] * b[k][j0:j1].
+        Блок строк b[k0:k1][j0:j1] переиспользуется для всех строк a,
+        пока он горячий в кэше. Порядок суммирования по k тот же, что и
+        в классическом алгоритме, поэтому результат совпадает до бита.
+
+        Returns:
+            list: Элементы результата по строкам
+        """
+        if block_size < 1:
+            raise ValueError("block_size должен быть положительным")
+
+        result = self._blocked_rows(self._row_lists(), other._row_lists(),
+                                    other.cols, block_size)
+        return [x for row in result for x in row]
+
+    @staticmethod
+    def _blocked_rows(a, b, p, block_size):
+        """
+        Блочное умножение i-k-j над строками-списками
+
+        Args:
+            a (list of list): Строки левой матрицы (n x m)
+            b (list of list): Строки правой матрицы (m x p)
+            p (int): Количество столбцов правой матрицы
+            block_size (int): Размер блока
+
+        Returns:
+            list of list: Строки результата (n x p)
+        """
+        n, m = len(a), len(b)
+        result = [[0] * p for _ in range(n)]
+
+        for k0 in range(0, m, block_size):
+            k1 = min(k0 + block_size, m)
+            for j0 in range(0, p, block_size):
+                j1 = min(j0 + block_size, p)
+                # Блок строк b, который используется для всех строк a
+                b_block = [(k, b[k][j0:j1]) for k in range(k0, k1)]
+                for i in range(n):
+                    a_row = a[i]
+                    c_row = result[i][j0:j1]
+                    for k, b_row in b_block:
+                        a_ik = a_row[k]
+                        c_row = [c + a_ik * b_kj for c, b_kj in
+                                 zip(c_row, b_row)]
+                    result[i][j0:j1] = c_row
 
         return result
 
-    def scalar_multiply(self, scalar):
+    def _multiply_strassen(self, other, threshold, block_size):
+        """
+        Умножение методом Штрассена: 7 рекурсивных умножений блоков
+        половинного размера вместо 8
+
+        Returns:
+            list: Элементы результата по строкам
+        """
+        if threshold < 1:
+            raise ValueError("threshold должен быть положительным")
+
+        result = _strassen_rows(self._row_lists(), other._row_lists(),
+                                self.rows, self.cols, other.cols,
+                                threshold, block_size)
+        return [x for row in result for x in row]
+
+    def scalar_multiply(self, scalar, out=None):
         """
         Умножение матрицы на скаляр
 
         Args:
             scalar (int/float): Скаляр для умножения
+            out (Matrix, optional): Готовая матрица для записи результата
 
         Returns:
             Matrix: Результат умножения
         """
-        result = Matrix(self.rows, self.cols)
-        for i in range(self.rows):
-            for j in range(self.cols):
-                result.data[i][j] = self.data[i][j] * scalar
-
-        return result
+        return self._elementwise(operator.mul, np and np.multiply, scalar,
+                                 out, None)
 
     def transpose(self):
         """
         Транспонирование матрицы
 
+        Для хранения "array" возвращается представление над тем же буфером
+        (O(1), без копирования): меняются местами размеры и шаги.
+        Для хранения "numpy" возвращается ndarray.T (тоже представление).
+
         Returns:
             Matrix: Транспонированная матрица
         """
-        result = Matrix(self.cols, self.rows)
+        if self.storage == "array":
+            return self._view(self.cols, self.rows, self._offset,
+                              (self.strides[1], self.strides[0]))
+        if self.storage == "numpy":
+            return self._wrap_ndarray(self._array.T)
+
+        result = Matrix(self.cols, self.rows, storage="list")
         for i in range(self.rows):
             for j in range(self.cols):
                 result.data[j][i] = self.data[i][j]
 
         return result
 
-    def determinant(self):
+    def determinant(self, exact=None):
         """
         Вычисление определителя матрицы (только для квадратных матриц)
 
+        Для матриц больше 3x3 используется LU-разложение (O(n³)).
+        В точном режиме - исключение Барейса без дробей (тоже O(n³)):
+        для целых элементов результат - точное целое, для остальных -
+        Fraction.
+
+        Args:
+            exact (bool, optional): Точный режим; по умолчанию включается,
+                если все элементы целые
+
         Returns:
-            float: Определитель матрицы
+            float, int или Fraction: Определитель матрицы
 
         Raises:
             ValueError: Если матрица не квадратная
@@ -234,18 +1081,24 @@ class Matrix:
             raise ValueError(
                 "Определитель можно вычислить только для квадратной матрицы")
 
+        a = self._row_lists()
+
+        if exact is None:
+            exact = self.rows > 3 and all(
+                type(x) is int for row in a for x in row)
+        if exact:
+            return self._bareiss_determinant(a)
+
         # Для матрицы 1x1
         if self.rows == 1:
-            return self.data[0][0]
+            return a[0][0]
 
         # Для матрицы 2x2
         if self.rows == 2:
-            return self.data[0][0] * self.data[1][1] - self.data[0][1] * \
-                self.data[1][0]
+            return a[0][0] * a[1][1] - a[0][1] * a[1][0]
 
         # Для матрицы 3x3 (правило Сарруса)
         if self.rows == 3:
-            a = self.data
             return (a[0][0] * a[1][1] * a[2][2] +
                     a[0][1] * a[1][2] * a[2][0] +
                     a[0][2] * a[1][0] * a[2][1] -
@@ -253,305 +1106,2693 @@ class Matrix:
                     a[0][1] * a[1][0] * a[2][2] -
                     a[0][0] * a[1][2] * a[2][1])
 
-        # Общий случай (разложение по первой строке)
-        det = 0
-        for j in range(self.cols):
-            # Создаем минор, исключая первую строку и j-й столбец
-            minor = Matrix(self.rows - 1, self.cols - 1)
-            for i in range(1, self.rows):
-                col_idx = 0
-                for k in range(self.cols):
-                    if k != j:
-                        minor.data[i - 1][col_idx] = self.data[i][k]
-                        col_idx += 1
+        # Общий случай: произведение диагонали U с учетом перестановок строк
+        return self.lu_factor().determinant()
+
+    def inverse(self, exact=False):
+        """
+        Вычисление обратной матрицы (только для квадратных матриц с ненулевым определителем)
+
+        Для матриц больше 2x2 решаются системы A * X = I
+        по LU-разложению (O(n³)). В точном режиме выполняется метод
+        Гаусса-Жордана над Fraction (O(n³) операций с дробями) без порога
+        для нуля; результат - матрица из Fraction с хранением "list".
+
+        Args:
+            exact (bool): Точный режим
+
+        Returns:
+            Matrix: Обратная матрица
+
+        Raises:
+            ValueError: Если матрица не квадратная или определитель равен 0
+        """
+        if self.rows != self.cols:
+            raise ValueError(
+                "Обратную матрицу можно вычислить только для квадратной матрицы")
+
+        if exact:
+            rows = self._exact_inverse_rows()
+            return self._from_flat(self.rows, self.cols,
+                                   [x for row in rows for x in row], "list")
+
+        # Для больших матриц одно разложение дает и определитель, и решения
+        factor = self.lu_factor() if self.rows != 2 else None
+        det = factor.determinant() if factor else self.determinant()
+        if abs(det) < 1e-10:  # Маленький порог для нуля
+            raise ValueError(
+                "Матрица вырожденная, обратной матрицы не существует")
+
+        a = self._row_lists()
+
+        # Для матрицы 2x2
+        if self.rows == 2:
+            return self._new_like(2, 2, [a[1][1] / det, -a[0][1] / det,
+                                         -a[1][0] / det, a[0][0] / det])
+
+        # Общий случай: столбцы обратной матрицы - решения A * x = e_j
+        return factor.inverse()
+
+    @staticmethod
+    def _bareiss_determinant(rows):
+        """
+        Определитель исключением Барейса
+
+        Каждый шаг делит на предыдущий ведущий элемент, и деление всегда
+        точное, поэтому для целых матриц все промежуточные значения -
+        целые числа (миноры исходной матрицы) без роста дробей.
+
+        Args:
+            rows (list of list): Строки квадратной матрицы
+
+        Returns:
+            int or Fraction: Определитель
+        """
+        if all(type(x) is int for row in rows for x in row):
+            a = [list(row) for row in rows]
+            divide = operator.floordiv
+        else:
+            a = [[Fraction(x) for x in row] for row in rows]
+            divide = operator.truediv
+
+        n = len(a)
+        if n == 0:
+            return 1
+        sign = 1
+        previous = 1
+        for k in range(n - 1):
+            if a[k][k] == 0:
+                swap = next((i for i in range(k + 1, n) if a[i][k] != 0), None)
+                if swap is None:
+                    return 0 * a[0][0]
+                a[k], a[swap] = a[swap], a[k]
+                sign = -sign
+            pivot_row = a[k]
+            pivot = pivot_row[k]
+            pivot_tail = pivot_row[k + 1:]
+            for i in range(k + 1, n):
+                row = a[i]
+                factor = row[k]
+                row[k + 1:] = [divide(pivot * x - factor * y, previous)
+                               for x, y in zip(row[k + 1:], pivot_tail)]
+            previous = pivot
+        return sign * a[n - 1][n - 1]
+
+    def _exact_inverse_rows(self):
+        """
+        Обратная матрица методом Гаусса-Жордана над Fraction
+
+        Returns:
+            list of list: Строки обратной матрицы (Fraction)
+
+        Raises:
+            ValueError: Если матрица вырожденная
+        """
+        n = self.rows
+        a = [[Fraction(x) for x in row] + [Fraction(int(i == j)) for j in range(n)]
+             for i, row in enumerate(self._row_lists())]
+
+        for k in range(n):
+            # В точной арифметике подходит любой ненулевой ведущий элемент
+            pivot_idx = next((i for i in range(k, n) if a[i][k] != 0), None)
+            if pivot_idx is None:
+                raise ValueError(
+                    "Матрица вырожденная, обратной матрицы не существует")
+            a[k], a[pivot_idx] = a[pivot_idx], a[k]
+
+            pivot = a[k][k]
+            if pivot != 1:
+                a[k] = [x / pivot for x in a[k]]
+            pivot_row = a[k]
+            for i in range(n):
+                factor = a[i][k]
+                if i != k and factor:
+                    a[i] = [x - factor * y for x, y in zip(a[i], pivot_row)]
+
+        return [row[n:] for row in a]
+
+    def lu_factor(self):
+        """
+        LU-разложение с частичным выбором главного элемента
+
+        Разложение не хранится в матрице: чтобы решить несколько систем с
+        одной матрицей за O(n²) на столбец, сохраните результат и вызывайте
+        его solve. После изменения элементов матрицы разложение нужно
+        вычислить заново.
+
+        Returns:
+            LUFactorization: Разложение P * A = L * U
+
+        Raises:
+            ValueError: Если матрица не квадратная
+        """
+        if self.rows != self.cols:
+            raise ValueError(
+                "LU-разложение можно вычислить только для квадратной матрицы")
+
+        n = self.rows
+        lu_rows = [list(row) for row in self._row_lists()]
+        perm = list(range(n))
+        sign = 1
+        singular = False
+
+        for k in range(n):
+            # Частичный выбор главного элемента: наибольший по модулю в столбце k
+            pivot_idx = max(range(k, n), key=lambda i: abs(lu_rows[i][k]))
+            if lu_rows[pivot_idx][k] == 0:
+                singular = True
+                continue
+            if pivot_idx != k:
+                lu_rows[k], lu_rows[pivot_idx] = lu_rows[pivot_idx], lu_rows[k]
+                perm[k], perm[pivot_idx] = perm[pivot_idx], perm[k]
+                sign = -sign
+
+            pivot_row = lu_rows[k]
+            pivot = pivot_row[k]
+            pivot_tail = pivot_row[k + 1:]
+            for i in range(k + 1, n):
+                row = lu_rows[i]
+                factor = row[k] / pivot
+                row[k] = factor
+                if factor:
+                    row[k + 1:] = [x - factor * y for x, y in
+                                   zip(row[k + 1:], pivot_tail)]
+
+        return LUFactorization(lu_rows, perm, sign, singular, self.storage)
+
+    def lu(self):
+        """
+        LU-разложение с частичным выбором главного элемента: P * A = L * U
+
+        Для многократного решения систем удобнее lu_factor.
+
+        Returns:
+            tuple: (P, L, U) - матрица перестановки, нижняя треугольная
+                с единицами на диагонали и верхняя треугольная матрицы
+
+        Raises:
+            ValueError: Если матрица не квадратная
+        """
+        if self.rows != self.cols:
+            raise ValueError(
+                "LU-разложение можно вычислить только для квадратной матрицы")
+
+        factor = self.lu_factor()
+        lu_rows, perm = factor.lu_rows, factor.perm
+        n = self.rows
+        p_values, l_values, u_values = [], [], []
+        for i in range(n):
+            for j in range(n):
+                p_values.append(1 if perm[i] == j else 0)
+                if j < i:
+                    l_values.append(lu_rows[i][j])
+                    u_values.append(0)
+                else:
+                    l_values.append(1 if i == j else 0)
+                    u_values.append(lu_rows[i][j])
+        return (self._new_like(n, n, p_values),
+                self._new_like(n, n, l_values),
+                self._new_like(n, n, u_values))
+
+    def solve(self, b):
+        """
+        Решение системы линейных уравнений A * x = b по LU-разложению
+
+        Каждый вызов заново выполняет разложение (O(n³)); для нескольких
+        правых частей с одной матрицей используйте lu_factor().solve.
+
+        Args:
+            b (Matrix or list): Правая часть - матрица n x k или список из n чисел
+
+        Returns:
+            Matrix or list: Решение того же вида, что и b
+
+        Raises:
+            ValueError: Если матрица не квадратная, размеры не согласованы
+                или матрица вырожденная
+        """
+        if self.rows != self.cols:
+            raise ValueError(
+                "Систему можно решить только для квадратной матрицы")
+        return self.lu_factor().solve(b)
+
+    def qr(self):
+        """
+        QR-разложение отражениями Хаусхолдера: A = Q * R
+
+        Отражения применяются на месте к рабочей копии элементов, O(m * n²).
+        Для матрицы m x n и k = min(m, n) возвращается сокращенное
+        разложение: Q размера m x k с ортонормированными столбцами и
+        верхняя треугольная R размера k x n.
+
+        Returns:
+            tuple: (Q, R)
+        """
+        m, n = self.rows, self.cols
+        k = min(m, n)
+        work = [[float(x) for x in row] for row in self._row_lists()]
+
+        reflectors = []
+        for j in range(k):
+            column = [work[i][j] for i in range(j, m)]
+            norm = math.hypot(*column)
+            if norm == 0:
+                # Столбец уже нулевой ниже диагонали
+                reflectors.append(None)
+                continue
+            # Знак выбирается так, чтобы не вычитать близкие числа
+            alpha = -math.copysign(norm, column[0])
+            vector = column
+            vector[0] -= alpha
+            scale = 2 / sum(x * x for x in vector)
+            _apply_householder(work, vector, scale, j, j)
+            work[j][j] = alpha
+            for i in range(j + 1, m):
+                work[i][j] = 0.0
+            reflectors.append((vector, scale))
+
+        # Q = H0 * H1 * ... * H(k-1), применяем к первым k столбцам единичной
+        q_rows = [[1.0 if i == j else 0.0 for j in range(k)] for i in range(m)]
+        for j in reversed(range(k)):
+            if reflectors[j] is not None:
+                vector, scale = reflectors[j]
+                _apply_householder(q_rows, vector, scale, j, 0)
+
+        return (self._new_like(m, k, [x for row in q_rows for x in row]),
+                self._new_like(k, n, [x for row in work[:k] for x in row]))
+
+    def lstsq(self, b):
+        """
+        Решение задачи наименьших квадратов min ||A * x - b|| через QR
+
+        Args:
+            b (Matrix or list): Правая часть - матрица m x k или список из m чисел
+
+        Returns:
+            Matrix or list: Решение того же вида, что и b (n x k или n чисел)
+
+        Raises:
+            ValueError: Если строк меньше, чем столбцов, размеры не
+                согласованы или столбцы линейно зависимы
+        """
+        m, n = self.rows, self.cols
+        if m < n:
+            raise ValueError(
+                "Для наименьших квадратов строк должно быть не меньше, чем столбцов")
+
+        if isinstance(b, Matrix):
+            if b.rows != m:
+                raise ValueError(
+                    f"Правая часть должна содержать {m} строк, а не {b.rows}")
+            b_rows = b._row_lists()
+        else:
+            if len(b) != m:
+                raise ValueError(
+                    f"Правая часть должна содержать {m} элементов, а не {len(b)}")
+            b_rows = [[value] for value in b]
+
+        q, r = self.qr()
+        r_rows = r._row_lists()
+        largest = max((abs(r_rows[i][i]) for i in range(n)), default=0.0)
+        if any(abs(r_rows[i][i]) <= 1e-12 * largest for i in range(n)) or \
+                largest == 0:
+            raise ValueError("Столбцы матрицы линейно зависимы")
+
+        # Q^T * b, затем обратная подстановка по R
+        q_rows = q._row_lists()
+        width = len(b_rows[0]) if b_rows else 0
+        y = [[0.0] * width for _ in range(n)]
+        for q_row, b_row in zip(q_rows, b_rows):
+            for i, q_value in enumerate(q_row):
+                if q_value:
+                    y[i] = [acc + q_value * x for acc, x in zip(y[i], b_row)]
+        for i in reversed(range(n)):
+            row = r_rows[i]
+            for j in range(i + 1, n):
+                if row[j]:
+                    y[i] = [acc - row[j] * x for acc, x in zip(y[i], y[j])]
+            y[i] = [acc / row[i] for acc in y[i]]
+
+        if isinstance(b, Matrix):
+            return b._new_like(n, width, [x for row in y for x in row])
+        return [row[0] for row in y]
+
+    def eigh(self, tol=1e-12, max_sweeps=100):
+        """
+        Собственные значения и векторы симметричной матрицы (метод Якоби)
+
+        Циклический метод Якоби вращениями зануляет внедиагональные
+        элементы рабочей копии на месте; каждый проход стоит O(n³),
+        обычно хватает 5-10 проходов.
+
+        Args:
+            tol (float): Относительная точность: итерации прекращаются, когда
+                норма внедиагональной части меньше tol * норма матрицы
+            max_sweeps (int): Максимальное число проходов
+
+        Returns:
+            tuple: (eigenvalues, eigenvectors) - список собственных значений
+                по возрастанию и матрица, i-й столбец которой - собственный
+                вектор для eigenvalues[i]
+
+        Raises:
+            ValueError: Если матрица не квадратная или не симметричная
+        """
+        if self.rows != self.cols:
+            raise ValueError(
+                "Собственные значения можно вычислить только для квадратной матрицы")
+
+        n = self.rows
+        work = [[float(x) for x in row] for row in self._row_lists()]
+        norm = math.sqrt(sum(x * x for row in work for x in row))
+        for i in range(n):
+            for j in range(i + 1, n):
+                if abs(work[i][j] - work[j][i]) > 1e-9 * max(norm, 1.0):
+                    raise ValueError("Матрица должна быть симметричной")
+
+        # Строки vectors - собственные векторы (транспонированная матрица
+        # вращений), чтобы вращать их срезами строк
+        vectors = [[1.0 if i == j else 0.0 for j in range(n)]
+                   for i in range(n)]
+        for _ in range(max_sweeps):
+            off = math.sqrt(sum(work[i][j] ** 2 for i in range(n)
+                                for j in range(i + 1, n)))
+            if off <= tol * norm:
+                break
+            for p in range(n - 1):
+                for q in range(p + 1, n):
+                    apq = work[p][q]
+                    if apq == 0:
+                        continue
+                    theta = (work[q][q] - work[p][p]) / (2 * apq)
+                    if abs(theta) > 1e150:
+                        t = 1 / (2 * theta)
+                    else:
+                        t = math.copysign(1, theta) / (
+                            abs(theta) + math.sqrt(theta * theta + 1))
+                    c = 1 / math.sqrt(t * t + 1)
+                    s = t * c
+
+                    # A = J^T * A * J: сначала строки p и q, затем столбцы
+                    row_p, row_q = work[p], work[q]
+                    work[p] = [c * x - s * y for x, y in zip(row_p, row_q)]
+                    work[q] = [s * x + c * y for x, y in zip(row_p, row_q)]
+                    for row in work:
+                        x, y = row[p], row[q]
+                        row[p] = c * x - s * y
+                        row[q] = s * x + c * y
+                    work[p][q] = work[q][p] = 0.0
+
+                    vec_p, vec_q = vectors[p], vectors[q]
+                    vectors[p] = [c * x - s * y for x, y in zip(vec_p, vec_q)]
+                    vectors[q] = [s * x + c * y for x, y in zip(vec_p, vec_q)]
+
+        order = sorted(range(n), key=lambda i: work[i][i])
+        eigenvalues = [work[i][i] for i in order]
+        values = [vectors[i][row] for row in range(n) for i in order]
+        return eigenvalues, self._new_like(n, n, values)
+
+    def dot_product(self, other):
+        """Альтернативное имя для умножения (удобно для ИИ)"""
+        return self.multiply(other)
+
+    def hadamard_product(self, other, out=None):
+        """
+        Поэлементное произведение матриц (произведение Адамара)
+
+        Args:
+            other (Matrix or int/float): Матрица той же формы, строка 1xN,
+                столбец Mx1 или скаляр (broadcasting как в NumPy)
+            out (Matrix, optional): Готовая матрица для записи результата
+
+        Returns:
+            Matrix: Результат поэлементного умножения
+
+        Raises:
+            ValueError: Если размеры матриц несовместимы
+        """
+        return self._elementwise(
+            operator.mul, np and np.multiply, other, out,
+            "Размеры матриц должны совпадать для произведения Адамара")
+
+    def apply_function(self, func, parallel=False, workers=None, out=None):
+        """
+        Применение функции к каждому элементу матрицы
+
+        Args:
+            func (callable): Функция для применения (для хранения "numpy"
+                универсальные функции NumPy, например numpy.exp,
+                применяются векторно)
+            parallel (bool, optional): Обрабатывать полосы строк в отдельных
+                процессах общего пула (func должна быть функцией уровня
+                модуля, элементы передаются как float; универсальные
+                функции NumPy при хранении "numpy" все равно применяются
+                векторно)
+            workers (int, optional): Количество процессов (включает parallel),
+                по умолчанию os.cpu_count()
+            out (Matrix, optional): Готовая матрица для записи результата
+
+        Returns:
+            Matrix: Новая матрица с примененной функцией (или out)
+
+        Raises:
+            ValueError: Если workers < 1
+        """
+        _check_workers(workers)
+
+        if self.storage == "numpy" and isinstance(func, np.ufunc):
+            # Универсальные функции NumPy применяются ко всему массиву сразу
+            return self._numpy_into(func, (self._array,), out,
+                                    (self.rows, self.cols))
+
+        if parallel or workers is not None:
+            return self._apply_function_parallel(func, workers, out)
+
+        if self.storage == "numpy":
+            values = np.frompyfunc(func, 1, 1)(self._array).tolist()
+            if out is not None:
+                self._check_out(out, self.rows, self.cols)
+                return out._write_rows(values)
+            return self._wrap_ndarray(np.array(values, dtype=float).reshape(
+                self.rows, self.cols))
+
+        if out is not None:
+            self._check_out(out, self.rows, self.cols)
+            return out._write_rows(map(func, row) for row in self._row_lists())
+
+        values = list(map(func, self._flat()))
+        return self._new_like(self.rows, self.cols, values)
+
+    def _apply_function_parallel(self, func, workers, out=None):
+        """
+        Параллельное применение функции по полосам строк (см. _multiply_parallel)
+
+        Returns:
+            Matrix: Новая матрица с примененной функцией
+        """
+        bands = _row_bands(self.rows, workers)
+        src_shm = _to_shared_memory(self._flat())
+        dst_shm = _to_shared_memory(self.rows * self.cols)
+        try:
+            _run_in_pool(len(bands), [
+                (_apply_band, src_shm.name, dst_shm.name, start * self.cols,
+                 stop * self.cols, func)
+                for start, stop in bands])
+            return self._result_from_shared_memory(dst_shm, self.rows,
+                                                   self.cols, out)
+        finally:
+            for shm in (src_shm, dst_shm):
+                shm.close()
+                shm.unlink()
+
+    def softmax(self, out=None):
+        """
+        Softmax по каждой строке (устойчивый к переполнению)
+
+        Из каждой строки вычитается ее максимум, поэтому exp не переполняется
+        даже при больших значениях.
+
+        Args:
+            out (Matrix, optional): Готовая матрица для записи результата
+                (может быть этой же матрицей)
+
+        Returns:
+            Matrix: Матрица вероятностей (сумма каждой строки равна 1)
+        """
+        if self.storage == "numpy":
+            values = self._array - self._array.max(axis=1, keepdims=True)
+            np.exp(values, out=values)
+            values /= values.sum(axis=1, keepdims=True)
+            if out is None:
+                return self._wrap_ndarray(values)
+            self._check_out(out, self.rows, self.cols)
+            if out.storage == "numpy":
+                out._array[...] = values
+                return out
+            return out._write_rows(values.tolist())
+
+        def rows():
+            for row in self._row_lists():
+                if not len(row):
+                    yield []
+                    continue
+                largest = max(row)
+                exp_values = [math.exp(x - largest) for x in row]
+                total = sum(exp_values)
+                yield [x / total for x in exp_values]
+
+        if out is not None:
+            self._check_out(out, self.rows, self.cols)
+            return out._write_rows(rows())
+        values = [x for row in rows() for x in row]
+        return self._new_like(self.rows, self.cols, values)
+
+    def sum(self, axis=None):
+        """
+        Суммирование элементов матрицы
+
+        Args:
+            axis (int, optional): Ось для суммирования (0 - по столбцам, 1 - по строкам, None - все элементы)
+
+        Returns:
+            float или Matrix: Результат суммирования
+        """
+        if self.storage == "numpy":
+            if axis is None:
+                return self._array.sum().item()
+            if axis in (0, 1):
+                return self._wrap_ndarray(
+                    self._array.sum(axis=axis, keepdims=True))
+            raise ValueError("axis должен быть 0, 1 или None")
+
+        if axis is None:
+            # Сумма всех элементов
+            total = 0
+            for row in self._row_lists():
+                total += sum(row)
+            return total
+        elif axis == 0:
+            # Сумма по столбцам
+            values = [sum(column) for column in zip(*self._row_lists())]
+            if not values:
+                values = [0] * self.cols
+            return self._new_like(1, self.cols, values)
+        elif axis == 1:
+            # Сумма по строкам
+            values = [sum(row) for row in self._row_lists()]
+            return self._new_like(self.rows, 1, values)
+        else:
+            raise ValueError("axis должен быть 0, 1 или None")
+
+    def mean(self, axis=None):
+        """
+        Среднее значение элементов матрицы
+
+        Args:
+            axis (int, optional): Ось для вычисления среднего
+
+        Returns:
+            float или Matrix: Среднее значение
+        """
+        if axis is None:
+            # Среднее всех элементов
+            return self.sum() / (self.rows * self.cols)
+        elif axis == 0:
+            # Среднее по столбцам
+            sums = self.sum(axis=0)
+            return sums.scalar_multiply(1 / self.rows)
+        elif axis == 1:
+            # Среднее по строкам
+            sums = self.sum(axis=1)
+            return sums.scalar_multiply(1 / self.cols)
+        else:
+            raise ValueError("axis должен быть 0, 1 или None")
+
+    def copy(self):
+        """
+        Создание независимой копии матрицы
+
+        Элементы - неизменяемые числа, поэтому для хранения "list"
+        достаточно срезов строк вместо copy.deepcopy.
+        """
+        if self.storage == "array":
+            return self._new_like(self.rows, self.cols, self._flat())
+        if self.storage == "numpy":
+            return self._wrap_ndarray(self._array.copy())
+        result = self.__class__.__new__(self.__class__)
+        result.rows = self.rows
+        result.cols = self.cols
+        result.storage = "list"
+        result._data = [row[:] for row in self._data]
+        return result
+
+    def reshape(self, new_rows, new_cols):
+        """
+        Изменение формы матрицы
+
+        Для хранения "array" с непрерывным буфером (и для "numpy") возвращается
+        представление над тем же буфером (O(1), без копирования).
+
+        Args:
+            new_rows (int): Новое количество строк
+            new_cols (int): Новое количество столбцов
+
+        Returns:
+            Matrix: Матрица с новой формой
+
+        Raises:
+            ValueError: Если новый размер не соответствует количеству элементов
+        """
+        if new_rows * new_cols != self.rows * self.cols:
+            raise ValueError(
+                f"Новая форма должна содержать {self.rows * self.cols} элементов")
+
+        if self.storage == "array":
+            # Представление с разрывами (например, после transpose)
+            # сначала уплотняем в новый буфер
+            source = self if self.is_contiguous() else self.copy()
+            return source._view(new_rows, new_cols, source._offset,
+                                (new_cols, 1))
+        if self.storage == "numpy":
+            return self._wrap_ndarray(self._array.reshape(new_rows, new_cols))
+
+        # Собираем все элементы в один список
+        elements = self._flat()
+
+        # Создаем новую матрицу
+        return self._new_like(new_rows, new_cols, elements)
+
+    def save(self, path):
+        """
+        Сохранение матрицы в двоичный файл
+
+        Формат: заголовок (см. FILE_MAGIC) и элементы float64 по строкам.
+        Целые числа сохраняются как float64.
+
+        Args:
+            path (str): Путь к файлу
+        """
+        if self.storage == "numpy":
+            payload = np.ascontiguousarray(self._array, dtype="<f8").tobytes()
+        else:
+            values = self._flat()
+            if not isinstance(values, (array, memoryview)):
+                values = array('d', values)
+            if sys.byteorder != "little":
+                values = array('d', values)
+                values.byteswap()
+            payload = memoryview(values).cast('B')
+
+        with open(path, "wb") as file:
+            file.write(self._FILE_HEADER.pack(
+                self.FILE_MAGIC, self.FILE_VERSION, self.rows, self.cols))
+            file.write(payload)
+
+    @classmethod
+    def load(cls, path, mmap=True, storage=None):
+        """
+        Загрузка матрицы из двоичного файла (см. save)
+
+        При mmap=True файл отображается в память: матрица открывается сразу,
+        а с диска читаются только те страницы, к которым было обращение.
+        Отображение копируется при записи, поэтому изменение элементов
+        не меняет файл. Хранение "list" не может ссылаться на файл, поэтому
+        в этом режиме по умолчанию используется "array" (или "numpy",
+        если оно выбрано по умолчанию).
+
+        Args:
+            path (str): Путь к файлу
+            mmap (bool): Отображать файл в память вместо чтения целиком
+            storage (str, optional): Способ хранения
+
+        Returns:
+            Matrix: Загруженная матрица
+
+        Raises:
+            ValueError: Если файл не является сохраненной матрицей
+        """
+        if storage is None and mmap and cls.default_storage == "list":
+            storage = "array"
+        storage = cls._check_storage(storage)
+        header_size = cls._FILE_HEADER.size
+
+        with open(path, "rb") as file:
+            header = file.read(header_size)
+            if len(header) != header_size:
+                raise ValueError(f"Файл '{path}' не является сохраненной матрицей")
+            magic, version, rows, cols = cls._FILE_HEADER.unpack(header)
+            if magic != cls.FILE_MAGIC:
+                raise ValueError(f"Файл '{path}' не является сохраненной матрицей")
+            if version != cls.FILE_VERSION:
+                raise ValueError(
+                    f"Неподдерживаемая версия формата {version} в файле '{path}'")
+
+            size = rows * cols * 8
+            if os.fstat(file.fileno()).st_size != header_size + size:
+                raise ValueError(
+                    f"Размер файла '{path}' не соответствует матрице {rows}x{cols}")
+
+            if mmap and size and storage != "list" and (
+                    storage == "numpy" or sys.byteorder == "little"):
+                mapped = mmap_module.mmap(file.fileno(), 0,
+                                          access=mmap_module.ACCESS_COPY)
+                if storage == "numpy":
+                    return cls._from_flat(rows, cols, np.frombuffer(
+                        mapped, dtype="<f8", offset=header_size), storage,
+                        adopt=True)
+                # Память отображения освобождается вместе с последним
+                # представлением буфера
+                values = memoryview(mapped)[header_size:].cast('d')
+                return cls._from_flat(rows, cols, values, storage,
+                                      adopt=True)
+
+            values = array('d')
+            values.frombytes(file.read(size))
+
+        if sys.byteorder != "little":
+            values.byteswap()
+        if storage == "list":
+            values = values.tolist()
+        return cls._from_flat(rows, cols, values, storage)
+
+    @classmethod
+    def identity(cls, n, storage=None):
+        """
+        Создание единичной матрицы размера n x n
+
+        Args:
+            n (int): Размер матрицы
+            storage (str, optional): Способ хранения
+
+        Returns:
+            Matrix: Единичная матрица
+        """
+        result = cls(n, n, storage=storage)
+        for i in range(n):
+            result[i, i] = 1
+        return result
+
+    @classmethod
+    def zeros(cls, rows, cols=None, storage=None):
+        """
+        Создание матрицы из нулей
+
+        Args:
+            rows (int): Количество строк
+            cols (int, optional): Количество столбцов
+            storage (str, optional): Способ хранения
+
+        Returns:
+            Matrix: Матрица из нулей
+        """
+        if cols is None:
+            cols = rows
+        return cls(rows, cols, fill_value=0, storage=storage)
+
+    @classmethod
+    def ones(cls, rows, cols=None, storage=None):
+        """
+        Создание матрицы из единиц
+
+        Args:
+            rows (int): Количество строк
+            cols (int, optional): Количество столбцов
+            storage (str, optional): Способ хранения
+
+        Returns:
+            Matrix: Матрица из единиц
+        """
+        if cols is None:
+            cols = rows
+        return cls(rows, cols, fill_value=1, storage=storage)
+
+    @staticmethod
+    def _random_source(seed, rng):
+        """
+        Генератор случайных чисел для random/normal/xavier/he
+
+        Args:
+            seed (int or None): Зерно для нового random.Random
+            rng (random.Random or None): Готовый генератор
+
+        Returns:
+            random.Random or module: rng, новый генератор с зерном seed
+                или глобальный генератор модуля random
+        """
+        if rng is not None:
+            return rng
+        if seed is not None:
+            return random.Random(seed)
+        return random
+
+    # Замена старшего полубайта шестого байта числа double на 0xF: вместе
+    # с седьмым байтом 0x3F это показатель степени 1.0 (см. _random_units)
+    _UNIT_EXPONENT = bytes(0xF0 | (b & 0x0F) for b in range(256))
+
+    @classmethod
+    def _random_units(cls, source, count):
+        """
+        count равномерно распределенных чисел из [1, 2) одним запросом
+        к генератору
+
+        Генератор выдает 64 * count случайных бит. В каждом 8-байтовом слове
+        12 старших бит заменяются показателем степени 1.0, остальные 52 бита
+        становятся мантиссой, поэтому слово - это double из [1, 2). Все
+        замены - срезы байтов, без вызова генератора на каждый элемент.
+
+        Args:
+            source (random.Random or module): Генератор (см. _random_source)
+            count (int): Количество чисел
+
+        Returns:
+            array: array('d') с числами из [1, 2)
+        """
+        raw = bytearray(source.getrandbits(64 * count).to_bytes(8 * count,
+                                                                 "little"))
+        raw[7::8] = b"\x3f" * count
+        raw[6::8] = raw[6::8].translate(cls._UNIT_EXPONENT)
+        units = array('d')
+        units.frombytes(raw)
+        if sys.byteorder == "big":
+            units.byteswap()
+        return units
+
+    @classmethod
+    def random(cls, rows, cols=None, low=0.0, high=1.0, storage=None,
+               seed=None, rng=None):
+        """
+        Создание матрицы со случайными значениями (равномерное распределение)
+
+        Значения генерируются сразу для всей матрицы: для хранения "numpy" -
+        numpy.random.Generator, иначе одним запросом случайных бит
+        (см. _random_units), которые переводятся в [low, high) векторно
+        через NumPy, если он установлен. Генератор NumPy получает зерно
+        от random.Random, поэтому seed и rng воспроизводимы при любом
+        хранении (но значения для "numpy" другие).
+
+        Args:
+            rows (int): Количество строк
+            cols (int, optional): Количество столбцов
+            low (float): Нижняя граница случайных значений
+            high (float): Верхняя граница случайных значений
+            storage (str, optional): Способ хранения
+            seed (int, optional): Зерно для воспроизводимой генерации
+            rng (random.Random, optional): Генератор случайных чисел
+                (по умолчанию - глобальный генератор модуля random)
+
+        Returns:
+            Matrix: Матрица со случайными значениями
+        """
+        if cols is None:
+            cols = rows
+
+        storage = cls._check_storage(storage)
+        source = cls._random_source(seed, rng)
+        count = rows * cols
+        if storage == "numpy":
+            values = np.random.default_rng(source.getrandbits(64)).uniform(
+                low, high, count)
+            return cls._from_flat(rows, cols, values, storage)
+
+        units = cls._random_units(source, count)
+        span = high - low
+        if np is not None:
+            values = np.frombuffer(units) - 1.0
+            values *= span
+            values += low
+            values = values.tolist() if storage == "list" else \
+                array('d', values.tobytes())
+        else:
+            values = [low + span * (x - 1.0) for x in units]
+        return cls._from_flat(rows, cols, values, storage)
+
+    @classmethod
+    def normal(cls, rows, cols=None, mean=0.0, std=1.0, storage=None,
+               seed=None, rng=None):
+        """
+        Создание матрицы из нормального распределения
+
+        Генерация сразу для всей матрицы, как в random: для хранения
+        "numpy" - numpy.random.Generator, иначе преобразование Бокса -
+        Мюллера над равномерными числами из _random_units.
+
+        Args:
+            rows (int): Количество строк
+            cols (int, optional): Количество столбцов
+            mean (float): Математическое ожидание
+            std (float): Стандартное отклонение
+            storage (str, optional): Способ хранения
+            seed (int, optional): Зерно для воспроизводимой генерации
+            rng (random.Random, optional): Генератор случайных чисел
+
+        Returns:
+            Matrix: Матрица со случайными значениями
+        """
+        if cols is None:
+            cols = rows
+
+        storage = cls._check_storage(storage)
+        source = cls._random_source(seed, rng)
+        count = rows * cols
+        if storage == "numpy":
+            values = np.random.default_rng(source.getrandbits(64)).normal(
+                mean, std, count)
+            return cls._from_flat(rows, cols, values, storage)
+
+        # Бокс - Мюллер: пара равномерных чисел (u1 из (0, 1], u2 из [0, 1))
+        # дает два независимых нормальных: r * cos(2 pi u2), r * sin(2 pi u2)
+        half = (count + 1) // 2
+        units = cls._random_units(source, 2 * half)
+        if np is not None:
+            units = np.frombuffer(units)
+            radii = np.sqrt(-2.0 * np.log(2.0 - units[:half])) * std
+            angles = (units[half:] - 1.0) * math.tau
+            values = np.concatenate((radii * np.cos(angles),
+                                     radii * np.sin(angles)))[:count] + mean
+            values = values.tolist() if storage == "list" else \
+                array('d', values.tobytes())
+        else:
+            radii = [std * math.sqrt(-2.0 * math.log(2.0 - x))
+                     for x in units[:half]]
+            angles = [math.tau * (x - 1.0) for x in units[half:]]
+            values = [mean + r * math.cos(a) for r, a in zip(radii, angles)]
+            values += [mean + r * math.sin(a) for r, a in zip(radii, angles)]
+            del values[count:]
+        return cls._from_flat(rows, cols, values, storage)
+
+    @classmethod
+    def xavier(cls, fan_in, fan_out, uniform=True, storage=None, seed=None,
+               rng=None):
+        """
+        Инициализация весов Xavier (Glorot) размера fan_in x fan_out
+
+        Подходит для слоев с активациями sigmoid, tanh и softmax.
+
+        Args:
+            fan_in (int): Количество входов слоя
+            fan_out (int): Количество выходов слоя
+            uniform (bool): Равномерное распределение на
+                [-sqrt(6 / (fan_in + fan_out)), sqrt(6 / (fan_in + fan_out))]
+                или нормальное с std = sqrt(2 / (fan_in + fan_out))
+            storage (str, optional): Способ хранения
+            seed (int, optional): Зерно для воспроизводимой генерации
+            rng (random.Random, optional): Генератор случайных чисел
+
+        Returns:
+            Matrix: Матрица весов
+        """
+        if uniform:
+            limit = math.sqrt(6 / (fan_in + fan_out))
+            return cls.random(fan_in, fan_out, low=-limit, high=limit,
+                              storage=storage, seed=seed, rng=rng)
+        return cls.normal(fan_in, fan_out, std=math.sqrt(2 / (fan_in + fan_out)),
+                          storage=storage, seed=seed, rng=rng)
+
+    @classmethod
+    def he(cls, fan_in, fan_out, uniform=False, storage=None, seed=None,
+           rng=None):
+        """
+        Инициализация весов He (Kaiming) размера fan_in x fan_out
+
+        Подходит для слоев с активацией ReLU.
+
+        Args:
+            fan_in (int): Количество входов слоя
+            fan_out (int): Количество выходов слоя
+            uniform (bool): Равномерное распределение на
+                [-sqrt(6 / fan_in), sqrt(6 / fan_in)] или нормальное
+                с std = sqrt(2 / fan_in)
+            storage (str, optional): Способ хранения
+            seed (int, optional): Зерно для воспроизводимой генерации
+            rng (random.Random, optional): Генератор случайных чисел
+
+        Returns:
+            Matrix: Матрица весов
+        """
+        if uniform:
+            limit = math.sqrt(6 / fan_in)
+            return cls.random(fan_in, fan_out, low=-limit, high=limit,
+                              storage=storage, seed=seed, rng=rng)
+        return cls.normal(fan_in, fan_out, std=math.sqrt(2 / fan_in),
+                          storage=storage, seed=seed, rng=rng)
+
+    @classmethod
+    def from_list(cls, data, storage=None):
+        """
+        Создание матрицы из списка
+
+        Args:
+            data (list of list): Данные матрицы
+            storage (str, optional): Способ хранения
+
+        Returns:
+            Matrix: Созданная матрица
+        """
+        rows = len(data)
+        cols = len(data[0]) if rows > 0 else 0
+        return cls(rows, cols, data=data, storage=storage)
+
+
+class LUFactorization:
+    """
+    LU-разложение квадратной матрицы: P * A = L * U (см. Matrix.lu_factor)
+
+    Хранит копию элементов на момент разложения и не зависит от дальнейших
+    изменений исходной матрицы. L (единичная нижняя треугольная) и U
+    (верхняя треугольная) хранятся в одной таблице: под диагональю -
+    множители L, на диагонали и выше - U.
+    """
+
+    def __init__(self, lu_rows, perm, sign, singular, storage="list"):
+        """
+        Args:
+            lu_rows (list of list): Строки общей таблицы L и U
+            perm (list): Перестановка строк
+            sign (int): Знак перестановки (1 или -1)
+            singular (bool): Вырождена ли матрица
+            storage (str): Способ хранения для inverse
+        """
+        self.lu_rows = lu_rows
+        self.perm = perm
+        self.sign = sign
+        self.singular = singular
+        self.storage = storage
+        self.size = len(lu_rows)
+
+    def determinant(self):
+        """
+        Определитель: произведение диагонали U с учетом перестановок, O(n)
+
+        Returns:
+            float: Определитель
+        """
+        if self.singular:
+            return 0.0
+        det = self.sign
+        for i in range(self.size):
+            det *= self.lu_rows[i][i]
+        return det
+
+    def _solve_rows(self, b_rows):
+        """
+        Решение A * X = B прямым и обратным ходом, O(n² * k)
+
+        Args:
+            b_rows (list of list): Строки правой части B (n x k)
+
+        Returns:
+            list of list: Строки решения X (n x k)
+
+        Raises:
+            ValueError: Если матрица вырожденная
+        """
+        if self.singular:
+            raise ValueError(
+                "Матрица вырожденная, система не имеет единственного решения")
+
+        n = self.size
+        lu_rows, perm = self.lu_rows, self.perm
+        # Прямой ход: L * Y = P * B
+        y = []
+        for i in range(n):
+            row = list(b_rows[perm[i]])
+            lu_row = lu_rows[i]
+            for k in range(i):
+                factor = lu_row[k]
+                if factor:
+                    row = [x - factor * y_k for x, y_k in zip(row, y[k])]
+            y.append(row)
+
+        # Обратный ход: U * X = Y
+        x = [None] * n
+        for i in range(n - 1, -1, -1):
+            row = y[i]
+            lu_row = lu_rows[i]
+            for k in range(i + 1, n):
+                factor = lu_row[k]
+                if factor:
+                    row = [value - factor * x_k for value, x_k in
+                           zip(row, x[k])]
+            pivot = lu_row[i]
+            x[i] = [value / pivot for value in row]
+        return x
+
+    def solve(self, b):
+        """
+        Решение системы A * x = b
+
+        Args:
+            b (Matrix or list): Правая часть - матрица n x k или список из n чисел
+
+        Returns:
+            Matrix or list: Решение того же вида, что и b
+
+        Raises:
+            ValueError: Если размеры не согласованы или матрица вырожденная
+        """
+        if isinstance(b, Matrix):
+            if b.rows != self.size:
+                raise ValueError(
+                    f"Правая часть должна содержать {self.size} строк, а не {b.rows}")
+            solution = self._solve_rows(b._row_lists())
+            return b._new_like(b.rows, b.cols,
+                               [x for row in solution for x in row])
+
+        if len(b) != self.size:
+            raise ValueError(
+                f"Правая часть должна содержать {self.size} элементов, а не {len(b)}")
+        solution = self._solve_rows([[value] for value in b])
+        return [row[0] for row in solution]
+
+    def inverse(self):
+        """
+        Обратная матрица: решения A * x = e_j для всех столбцов
+
+        Returns:
+            Matrix: Обратная матрица
+
+        Raises:
+            ValueError: Если матрица вырожденная
+        """
+        n = self.size
+        identity = [[1 if i == j else 0 for j in range(n)] for i in range(n)]
+        solution = self._solve_rows(identity)
+        return Matrix._from_flat(n, n, [x for row in solution for x in row],
+                                 self.storage)
+
+
+class SparseMatrix:
+    """
+    Разреженная матрица в формате CSR (compressed sparse row)
+
+    Хранятся только ненулевые элементы: values - значения по строкам,
+    indices - номера их столбцов, indptr[i]:indptr[i + 1] - диапазон
+    элементов строки i. Память и время операций зависят от количества
+    ненулевых элементов (nnz), а не от rows x cols.
+    """
+
+    def __init__(self, rows, cols, indptr=None, indices=None, values=None):
+        """
+        Инициализация разреженной матрицы
+
+        Args:
+            rows (int): Количество строк
+            cols (int): Количество столбцов
+            indptr (sequence of int, optional): Границы строк (rows + 1 элементов)
+            indices (sequence of int, optional): Номера столбцов элементов
+            values (list, optional): Значения элементов
+
+        Raises:
+            ValueError: Если массивы CSR не согласованы с размерами
+        """
+        self.rows = rows
+        self.cols = cols
+
+        if indptr is None:
+            # Пустая матрица (все элементы нулевые)
+            self.indptr = array('q', [0]) * (rows + 1)
+            self.indices = array('q')
+            self.values = []
+            return
+
+        self.indptr = array('q', indptr)
+        self.indices = array('q', indices)
+        self.values = list(values)
+        if len(self.indptr) != rows + 1:
+            raise ValueError(
+                f"indptr должен содержать {rows + 1} элементов")
+        if len(self.indices) != len(self.values) or \
+                self.indptr[-1] != len(self.values):
+            raise ValueError("indices и values не согласованы с indptr")
+        if any(not 0 <= j < cols for j in self.indices):
+            raise ValueError(
+                f"Номер столбца за пределами матрицы {rows}x{cols}")
+
+    @classmethod
+    def from_coo(cls, rows, cols, row_indices, col_indices, values):
+        """
+        Создание матрицы из координатного формата (COO)
+
+        Повторяющиеся координаты суммируются, нулевые значения отбрасываются.
+
+        Args:
+            rows (int): Количество строк
+            cols (int): Количество столбцов
+            row_indices (sequence of int): Номера строк элементов
+            col_indices (sequence of int): Номера столбцов элементов
+            values (sequence): Значения элементов
+
+        Returns:
+            SparseMatrix: Созданная матрица
+
+        Raises:
+            ValueError: Если длины последовательностей различаются
+                или координаты за пределами матрицы
+        """
+        if not len(row_indices) == len(col_indices) == len(values):
+            raise ValueError(
+                "row_indices, col_indices и values должны быть одной длины")
+
+        row_dicts = [{} for _ in range(rows)]
+        for i, j, value in zip(row_indices, col_indices, values):
+            if not (0 <= i < rows and 0 <= j < cols):
+                raise ValueError(
+                    f"Элемент ({i}, {j}) за пределами матрицы {rows}x{cols}")
+            row = row_dicts[i]
+            row[j] = row.get(j, 0) + value
+
+        return cls._from_row_dicts(rows, cols, row_dicts)
+
+    @classmethod
+    def _from_row_dicts(cls, rows, cols, row_dicts):
+        """
+        Сборка CSR из словарей {столбец: значение} для каждой строки
+
+        Returns:
+            SparseMatrix: Матрица без нулевых элементов
+        """
+        indptr = array('q', [0])
+        indices = array('q')
+        values = []
+        for row in row_dicts:
+            for j in sorted(row):
+                value = row[j]
+                if value != 0:
+                    indices.append(j)
+                    values.append(value)
+            indptr.append(len(values))
+
+        result = cls.__new__(cls)
+        result.rows = rows
+        result.cols = cols
+        result.indptr = indptr
+        result.indices = indices
+        result.values = values
+        return result
+
+    @classmethod
+    def from_matrix(cls, matrix):
+        """
+        Создание разреженной матрицы из плотной
+
+        Args:
+            matrix (Matrix): Плотная матрица
+
+        Returns:
+            SparseMatrix: Матрица с ненулевыми элементами matrix
+        """
+        row_dicts = [{j: value for j, value in enumerate(row) if value != 0}
+                     for row in matrix._row_lists()]
+        return cls._from_row_dicts(matrix.rows, matrix.cols, row_dicts)
+
+    def to_matrix(self, storage=None):
+        """
+        Преобразование в плотную матрицу
+
+        Args:
+            storage (str, optional): Способ хранения плотной матрицы
+
+        Returns:
+            Matrix: Плотная матрица
+        """
+        result = Matrix(self.rows, self.cols, storage=storage)
+        for i, j, value in self.items():
+            result[i, j] = value
+        return result
+
+    @property
+    def nnz(self):
+        """Количество хранимых (ненулевых) элементов"""
+        return len(self.values)
+
+    def items(self):
+        """
+        Обход ненулевых элементов по строкам
+
+        Yields:
+            tuple: (строка, столбец, значение)
+        """
+        for i in range(self.rows):
+            for pos in range(self.indptr[i], self.indptr[i + 1]):
+                yield i, self.indices[pos], self.values[pos]
+
+    def _row(self, i):
+        """Пары (столбец, значение) строки i"""
+        start, stop = self.indptr[i], self.indptr[i + 1]
+        return zip(self.indices[start:stop], self.values[start:stop])
+
+    def __str__(self):
+        """Строковое представление матрицы (в плотном виде)"""
+        return str(self.to_matrix())
+
+    def __repr__(self):
+        """Представление для отладки"""
+        return f"SparseMatrix({self.rows}, {self.cols}, nnz={self.nnz})"
+
+    def __eq__(self, other):
+        """Проверка на равенство (в том числе с плотной матрицей)"""
+        if isinstance(other, Matrix):
+            return self.to_matrix() == other
+        if not isinstance(other, SparseMatrix):
+            return False
+        return (self.rows == other.rows and self.cols == other.cols and
+                self.indptr == other.indptr and
+                self.indices == other.indices and
+                self.values == other.values)
+
+    def __getitem__(self, index):
+        """Получение элемента по индексу (i, j)"""
+        i, j = index
+        if i < 0:
+            i += self.rows
+        if j < 0:
+            j += self.cols
+        if not (0 <= i < self.rows and 0 <= j < self.cols):
+            raise IndexError("Индекс за пределами матрицы")
+        start, stop = self.indptr[i], self.indptr[i + 1]
+        # Столбцы в строке отсортированы - двоичный поиск
+        pos = bisect.bisect_left(self.indices, j, start, stop)
+        if pos < stop and self.indices[pos] == j:
+            return self.values[pos]
+        return 0
+
+    def __add__(self, other):
+        """Перегрузка оператора +"""
+        return self.add(other)
+
+    def __mul__(self, other):
+        """
+        Перегрузка оператора *
+        Поддерживает умножение на плотную или разреженную матрицу и на скаляр
+        """
+        if isinstance(other, (int, float)):
+            return self.scalar_multiply(other)
+        elif isinstance(other, (Matrix, SparseMatrix)):
+            return self.multiply(other)
+        else:
+            raise TypeError("Неподдерживаемый тип для умножения")
+
+    def add(self, other):
+        """
+        Сложение матриц
+
+        Args:
+            other (SparseMatrix or Matrix): Матрица для сложения
+
+        Returns:
+            SparseMatrix or Matrix: Разреженная сумма для разреженного other,
+                плотная - для плотного
+
+        Raises:
+            ValueError: Если размеры матриц не совпадают
+        """
+        if self.rows != other.rows or self.cols != other.cols:
+            raise ValueError(
+                f"Нельзя сложить матрицы размеров {self.rows}x{self.cols} и {other.rows}x{other.cols}")
+
+        if isinstance(other, Matrix):
+            result = other.copy()
+            for i, j, value in self.items():
+                result[i, j] += value
+            return result
+
+        row_dicts = []
+        for i in range(self.rows):
+            row = dict(self._row(i))
+            for j, value in other._row(i):
+                row[j] = row.get(j, 0) + value
+            row_dicts.append(row)
+        return self._from_row_dicts(self.rows, self.cols, row_dicts)
+
+    def scalar_multiply(self, scalar):
+        """
+        Умножение матрицы на скаляр
+
+        Args:
+            scalar (int/float): Скаляр для умножения
+
+        Returns:
+            SparseMatrix: Результат умножения
+        """
+        if scalar == 0:
+            return SparseMatrix(self.rows, self.cols)
+        return SparseMatrix(self.rows, self.cols, self.indptr, self.indices,
+                            [value * scalar for value in self.values])
+
+    def multiply(self, other):
+        """
+        Умножение матриц
+
+        Args:
+            other (SparseMatrix or Matrix): Матрица для умножения
+
+        Returns:
+            SparseMatrix or Matrix: Разреженный результат для разреженного other
+                (алгоритм Густавсона, O(количество произведений ненулевых)),
+                плотный - для плотного (O(nnz * other.cols))
+
+        Raises:
+            ValueError: Если число столбцов первой матрицы не равно числу строк второй
+        """
+        if self.cols != other.rows:
+            raise ValueError(
+                f"Нельзя умножить матрицы: {self.cols} != {other.rows}")
+
+        if isinstance(other, Matrix):
+            b = other._row_lists()
+            values = []
+            for i in range(self.rows):
+                acc = [0] * other.cols
+                for k, value in self._row(i):
+                    acc = [c + value * b_kj for c, b_kj in zip(acc, b[k])]
+                values.extend(acc)
+            return other._new_like(self.rows, other.cols, values)
+
+        row_dicts = []
+        for i in range(self.rows):
+            acc = {}
+            for k, value in self._row(i):
+                for j, other_value in other._row(k):
+                    acc[j] = acc.get(j, 0) + value * other_value
+            row_dicts.append(acc)
+        return self._from_row_dicts(self.rows, other.cols, row_dicts)
+
+    def transpose(self):
+        """
+        Транспонирование матрицы (O(nnz + cols), подсчетом по столбцам)
+
+        Returns:
+            SparseMatrix: Транспонированная матрица
+        """
+        counts = [0] * (self.cols + 1)
+        for j in self.indices:
+            counts[j + 1] += 1
+        for j in range(self.cols):
+            counts[j + 1] += counts[j]
+
+        indptr = array('q', counts)
+        indices = array('q', [0]) * self.nnz
+        values = [0] * self.nnz
+        next_pos = counts[:-1]
+        for i, j, value in self.items():
+            pos = next_pos[j]
+            indices[pos] = i
+            values[pos] = value
+            next_pos[j] += 1
+
+        result = SparseMatrix.__new__(SparseMatrix)
+        result.rows = self.cols
+        result.cols = self.rows
+        result.indptr = indptr
+        result.indices = indices
+        result.values = values
+        return result
+
+    def sum(self, axis=None):
+        """
+        Суммирование элементов матрицы
+
+        Args:
+            axis (int, optional): Ось для суммирования (0 - по столбцам, 1 - по строкам, None - все элементы)
+
+        Returns:
+            float или Matrix: Результат суммирования (суммы по осям - плотные)
+        """
+        if axis is None:
+            return sum(self.values)
+        elif axis == 0:
+            sums = [0] * self.cols
+            for j, value in zip(self.indices, self.values):
+                sums[j] += value
+            return Matrix(1, self.cols, data=[sums])
+        elif axis == 1:
+            sums = [[sum(self.values[self.indptr[i]:self.indptr[i + 1]])]
+                    for i in range(self.rows)]
+            return Matrix(self.rows, 1, data=sums)
+        else:
+            raise ValueError("axis должен быть 0, 1 или None")
+
+
+class LazyMatrix:
+    """
+    Отложенное матричное выражение
+
+    Операции +, -, * (на скаляр), hadamard_product и apply_function не
+    вычисляются сразу, а строят дерево выражения. Дерево вычисляется при
+    первом обращении к результату (evaluate, [], str, ==), причем цепочка
+    поэлементных операций сливается в одну функцию и выполняется за один
+    проход по данным без промежуточных матриц. Умножение матриц (multiply)
+    не поэлементное: его результат вычисляется отдельно и становится
+    входом слитого прохода.
+    """
+
+    # Поэлементные бинарные операции, которые сливаются в один проход,
+    # и их функции
+    OPERATORS = {"+": operator.add, "-": operator.sub, "*": operator.mul}
+
+    def __init__(self, op, args, rows, cols):
+        """
+        Инициализация узла выражения
+
+        Args:
+            op (str): Операция ("leaf", "+", "-", "*", "apply" или "matmul")
+            args (tuple): Аргументы операции (узлы, матрица, скаляр или функция)
+            rows (int): Количество строк результата
+            cols (int): Количество столбцов результата
+        """
+        self.op = op
+        self.args = args
+        self.rows = rows
+        self.cols = cols
+        self._result = None
+
+    @classmethod
+    def leaf(cls, matrix):
+        """
+        Лист дерева выражения - уже вычисленная матрица
+
+        Args:
+            matrix (Matrix): Матрица
+
+        Returns:
+            LazyMatrix: Узел-лист
+        """
+        return cls("leaf", (matrix,), matrix.rows, matrix.cols)
+
+    @staticmethod
+    def _lift(other):
+        """Преобразование операнда в узел выражения (скаляры остаются как есть)"""
+        if isinstance(other, LazyMatrix) or isinstance(other, (int, float)):
+            return other
+        if isinstance(other, Matrix):
+            return LazyMatrix.leaf(other)
+        raise TypeError("Неподдерживаемый тип операнда")
+
+    def _elementwise(self, op, other, error):
+        """Узел поэлементной операции с проверкой размеров (с broadcasting)"""
+        other = self._lift(other)
+        if not isinstance(other, LazyMatrix):
+            return LazyMatrix(op, (self, other), self.rows, self.cols)
+        shape = _broadcast_shape((self.rows, self.cols),
+                                 (other.rows, other.cols))
+        if shape is None:
+            raise ValueError(error.format(other=other))
+        return LazyMatrix(op, (self, other), *shape)
+
+    def __repr__(self):
+        """Представление для отладки"""
+        state = "вычислено" if self._result is not None else "отложено"
+        return f"LazyMatrix({self.rows}, {self.cols}, op='{self.op}', {state})"
+
+    def __str__(self):
+        """Строковое представление (вычисляет выражение)"""
+        return str(self.evaluate())
+
+    def __eq__(self, other):
+        """Проверка на равенство (вычисляет выражение)"""
+        if isinstance(other, LazyMatrix):
+            other = other.evaluate()
+        return self.evaluate() == other
+
+    def __getitem__(self, index):
+        """Получение элемента или строки (вычисляет выражение)"""
+        return self.evaluate()[index]
+
+    def __add__(self, other):
+        """Перегрузка оператора +"""
+        return self.add(other)
+
+    def __sub__(self, other):
+        """Перегрузка оператора -"""
+        return self.subtract(other)
+
+    def __mul__(self, other):
+        """
+        Перегрузка оператора *
+        Поддерживает умножение на другую матрицу или на скаляр
+        """
+        if isinstance(other, (int, float)):
+            return self.scalar_multiply(other)
+        elif isinstance(other, (Matrix, LazyMatrix)):
+            return self.multiply(other)
+        else:
+            raise TypeError("Неподдерживаемый тип для умножения")
+
+    def add(self, other):
+        """Отложенное сложение матриц"""
+        return self._elementwise(
+            "+", other,
+            f"Нельзя сложить матрицы размеров {self.rows}x{self.cols} и "
+            "{other.rows}x{other.cols}")
+
+    def subtract(self, other):
+        """Отложенное вычитание матриц"""
+        return self._elementwise(
+            "-", other,
+            f"Нельзя вычесть матрицы размеров {self.rows}x{self.cols} и "
+            "{other.rows}x{other.cols}")
+
+    def hadamard_product(self, other):
+        """Отложенное поэлементное произведение матриц"""
+        return self._elementwise(
+            "*", other, "Размеры матриц должны совпадать для произведения Адамара")
 
-            # Рекурсивно вычисляем определитель минора
-            sign = 1 if j % 2 == 0 else -1
-            det += sign * self.data[0][j] * minor.determinant()
+    def scalar_multiply(self, scalar):
+        """Отложенное умножение на скаляр"""
+        return LazyMatrix("*", (self, scalar), self.rows, self.cols)
 
-        return det
+    def apply_function(self, func):
+        """Отложенное применение функции к каждому элементу"""
+        return LazyMatrix("apply", (self, func), self.rows, self.cols)
 
-    def inverse(self):
+    def multiply(self, other):
         """
-        Вычисление обратной матрицы (только для квадратных матриц с ненулевым определителем)
-
-        Returns:
-            Matrix: Обратная матрица
+        Отложенное умножение матриц
 
         Raises:
-            ValueError: Если матрица не квадратная или определитель равен 0
+            ValueError: Если число столбцов первой матрицы не равно числу строк второй
         """
-        if self.rows != self.cols:
+        other = self._lift(other)
+        if self.cols != other.rows:
             raise ValueError(
-                "Обратную матрицу можно вычислить только для квадратной матрицы")
+                f"Нельзя умножить матрицы: {self.cols} != {other.rows}")
+        return LazyMatrix("matmul", (self, other), self.rows, other.cols)
 
-        det = self.determinant()
-        if abs(det) < 1e-10:  # Маленький порог для нуля
-            raise ValueError(
-                "Матрица вырожденная, обратной матрицы не существует")
+    def evaluate(self):
+        """
+        Вычисление выражения (результат запоминается)
 
-        # Для матрицы 2x2
-        if self.rows == 2:
-            a, b = self.data[0][0], self.data[0][1]
-            c, d = self.data[1][0], self.data[1][1]
+        Returns:
+            Matrix: Результат выражения
+        """
+        if self._result is None:
+            self._result = self._compute()
+        return self._result
+
+    def _compute(self):
+        """Вычисление узла: слияние поэлементной цепочки в один проход"""
+        if self.op == "leaf":
+            return self.args[0]
+        if self.op == "matmul":
+            left, right = self.args
+            return left.evaluate().multiply(right.evaluate())
+
+        inputs = []
+        functions = []
+        kernel = self._fuse(inputs, functions)
+
+        first = inputs[0]
+        if np is not None and all(m.storage == "numpy" for m in inputs) and \
+                all(isinstance(func, np.ufunc) for func in functions):
+            # Для ndarray те же функции узлов выполняются векторно
+            sources = [m._as_ndarray for m in inputs]
+            return first._wrap_ndarray(kernel(sources, self._ARRAY_CALLS))
+
+        # Строки и столбцы меньшего размера повторяются на лету; каждый
+        # лист получает свой итератор, поэтому вход может встречаться
+        # в выражении несколько раз
+        sources = [functools.partial(_broadcast_flat, m, self.rows, self.cols)
+                   for m in inputs]
+        values = list(kernel(sources, self._SEQUENCE_CALLS))
+        return first._new_like(self.rows, self.cols, values)
+
+    # Как узлы слитой функции применяют операции: к последовательностям
+    # элементов - через map (значения считаются по одному при проходе),
+    # к ndarray - вызовом операции над целыми массивами
+    _SEQUENCE_CALLS = (map, repeat)
+    _ARRAY_CALLS = (lambda func, *args: func(*args), lambda value: value)
+
+    def _fuse(self, inputs, functions):
+        """
+        Сборка слитой поэлементной функции из замыканий по дереву выражения
 
-            result = Matrix(2, 2)
-            result.data = [[d / det, -b / det], [-c / det, a / det]]
-            return result
+        Каждый узел становится функцией kernel(sources, calls): лист
+        возвращает элементы своей входной матрицы, операция применяет
+        себя к результатам дочерних узлов через calls = (combine,
+        constant). Для последовательностей combine - map, поэтому вся
+        цепочка вычисляется за один проход без промежуточных матриц.
 
-        # Общий случай (метод алгебраических дополнений)
-        result = Matrix(self.rows, self.cols)
+        Args:
+            inputs (list): Входные матрицы (пополняется); sources[i]() -
+                элементы i-й матрицы
+            functions (list): Функции apply_function выражения (пополняется)
 
-        # Создаем матрицу алгебраических дополнений
-        for i in range(self.rows):
-            for j in range(self.cols):
-                # Создаем минор, исключая i-ю строку и j-й столбец
-                minor = Matrix(self.rows - 1, self.cols - 1)
-                row_idx = 0
-                for m in range(self.rows):
-                    if m == i:
-                        continue
-                    col_idx = 0
-                    for n in range(self.cols):
-                        if n == j:
-                            continue
-                        minor.data[row_idx][col_idx] = self.data[m][n]
-                        col_idx += 1
-                    row_idx += 1
-
-                # Алгебраическое дополнение
-                sign = 1 if (i + j) % 2 == 0 else -1
-                result.data[j][i] = sign * minor.determinant() / det
+        Returns:
+            callable: Функция узла kernel(sources, calls)
+        """
+        if self.op in ("leaf", "matmul") or self._result is not None:
+            matrix = self.evaluate()
+            for idx, known in enumerate(inputs):
+                if known is matrix:
+                    break
+            else:
+                inputs.append(matrix)
+                idx = len(inputs) - 1
+            return lambda sources, calls: sources[idx]()
+
+        if self.op == "apply":
+            child, func = self.args
+            functions.append(func)
+            child_kernel = child._fuse(inputs, functions)
+            return lambda sources, calls: calls[0](
+                func, child_kernel(sources, calls))
+
+        left, right = self.args
+        op = self.OPERATORS[self.op]
+        left_kernel = left._fuse(inputs, functions)
+        if isinstance(right, LazyMatrix):
+            right_kernel = right._fuse(inputs, functions)
+            return lambda sources, calls: calls[0](
+                op, left_kernel(sources, calls), right_kernel(sources, calls))
+        return lambda sources, calls: calls[0](
+            op, left_kernel(sources, calls), calls[1](right))
+
+
+class Dense:
+    """
+    Полносвязный слой нейронной сети: activation(inputs * weights + biases)
+
+    Слой обрабатывает сразу весь батч (каждая строка inputs - пример).
+    Смещения и активация применяются за один проход по выходу умножения.
+    Буферы выходов и градиентов создаются при первом проходе для данного
+    размера батча и затем переиспользуются, так что повторные проходы
+    не создают новых матриц.
+    """
+
+    # Поддерживаемые функции активации (None - без активации)
+    ACTIVATIONS = (None, "relu", "sigmoid", "tanh", "softmax")
+
+    def __init__(self, in_features, out_features, activation=None,
+                 weights=None, biases=None, storage=None, rng=None):
+        """
+        Инициализация слоя
 
-        return result
+        Args:
+            in_features (int): Количество входных признаков
+            out_features (int): Количество нейронов слоя
+            activation (str, optional): Функция активации (см. ACTIVATIONS)
+            weights (Matrix, optional): Веса in_features x out_features
+                (по умолчанию - инициализация He для relu и Xavier
+                для остальных активаций)
+            biases (Matrix, optional): Смещения 1 x out_features
+                (по умолчанию нули)
+            storage (str, optional): Способ хранения весов
+            rng (random.Random, optional): Генератор для инициализации весов
 
-    def dot_product(self, other):
-        """Альтернативное имя для умножения (удобно для ИИ)"""
-        return self.multiply(other)
+        Raises:
+            ValueError: Если активация неизвестна или размеры весов не совпадают
+        """
+        if activation not in self.ACTIVATIONS:
+            raise ValueError(
+                f"Неизвестная функция активации '{activation}', доступны: {self.ACTIVATIONS}")
+        if weights is None:
+            initializer = Matrix.he if activation == "relu" else Matrix.xavier
+            weights = initializer(in_features, out_features, storage=storage,
+                                  rng=rng)
+        if biases is None:
+            biases = Matrix(1, out_features, fill_value=0.0, storage=storage)
+        if (weights.rows, weights.cols) != (in_features, out_features):
+            raise ValueError(
+                f"Веса должны иметь размер {in_features}x{out_features}")
+        if (biases.rows, biases.cols) != (1, out_features):
+            raise ValueError(f"Смещения должны иметь размер 1x{out_features}")
+
+        self.activation = activation
+        self.weights = weights
+        self.biases = biases
+        self.grad_weights = None
+        self.grad_biases = None
+
+        # Буферы прохода (см. _buffer)
+        self._inputs = None
+        self._outputs = None
+        self._delta = None
+        self._grad_inputs = None
 
-    def hadamard_product(self, other):
+    def __repr__(self):
+        """Представление для отладки"""
+        return (f"Dense({self.weights.rows}, {self.weights.cols}, "
+                f"activation={self.activation!r})")
+
+    @staticmethod
+    def _buffer(current, rows, cols, storage):
+        """Буфер нужного размера: прежний, если подходит, иначе новый"""
+        if current is not None and current.storage == storage and \
+                (current.rows, current.cols) == (rows, cols):
+            return current
+        return Matrix(rows, cols, fill_value=0.0, storage=storage)
+
+    def forward(self, inputs):
         """
-        Поэлементное произведение матриц (произведение Адамара)
+        Прямой проход по батчу
+
+        Возвращается буфер слоя: следующий вызов forward его перезапишет
+        (используйте copy(), чтобы сохранить результат).
 
         Args:
-            other (Matrix): Матрица для умножения
+            inputs (Matrix): Батч batch x in_features
 
         Returns:
-            Matrix: Результат поэлементного умножения
+            Matrix: Выход слоя batch x out_features
 
         Raises:
-            ValueError: Если размеры матриц не совпадают
+            ValueError: Если число признаков не совпадает с весами
         """
-        if self.rows != other.rows or self.cols != other.cols:
+        if inputs.cols != self.weights.rows:
             raise ValueError(
-                f"Размеры матриц должны совпадать для произведения Адамара")
-
-        result = Matrix(self.rows, self.cols)
-        for i in range(self.rows):
-            for j in range(self.cols):
-                result.data[i][j] = self.data[i][j] * other.data[i][j]
-
-        return result
+                f"Ожидается {self.weights.rows} признаков на входе, получено {inputs.cols}")
+        self._inputs = inputs
+        self._outputs = self._buffer(self._outputs, inputs.rows,
+                                     self.weights.cols, inputs.storage)
+        inputs.multiply(self.weights, out=self._outputs)
+        return self._activate(self._outputs)
+
+    def _activate(self, outputs):
+        """Добавление смещений и активация на месте, за один проход"""
+        if outputs.storage == "numpy":
+            values = outputs._array
+            values += self.biases._as_ndarray()
+            if self.activation == "relu":
+                np.maximum(values, 0, out=values)
+            elif self.activation == "sigmoid":
+                # exp(-x) для больших отрицательных x дает inf, а 1/inf = 0
+                with np.errstate(over="ignore"):
+                    np.negative(values, out=values)
+                    np.exp(values, out=values)
+                    values += 1
+                    np.reciprocal(values, out=values)
+            elif self.activation == "tanh":
+                np.tanh(values, out=values)
+            elif self.activation == "softmax":
+                outputs.softmax(out=outputs)
+            return outputs
+
+        biases = self.biases._flat()
+        func = _ACTIVATION_FUNCTIONS.get(self.activation)
+        if func is None:
+            outputs._write_rows(map(operator.add, row, biases)
+                                for row in outputs._row_lists())
+        else:
+            outputs._write_rows(map(func, map(operator.add, row, biases))
+                                for row in outputs._row_lists())
+        if self.activation == "softmax":
+            outputs.softmax(out=outputs)
+        return outputs
 
-    def apply_function(self, func):
+    def backward(self, grad_outputs, skip_activation=False):
         """
-        Применение функции к каждому элементу матрицы
+        Обратный проход по батчу последнего вызова forward
+
+        Градиенты весов и смещений записываются в grad_weights и
+        grad_biases (см. update).
 
         Args:
-            func (callable): Функция для применения
+            grad_outputs (Matrix): Градиент функции потерь по выходу слоя
+            skip_activation (bool): grad_outputs уже является градиентом по
+                входу активации (например, softmax вместе с перекрестной
+                энтропией дает просто outputs - targets)
 
         Returns:
-            Matrix: Новая матрица с примененной функцией
-        """
-        result = Matrix(self.rows, self.cols)
-        for i in range(self.rows):
-            for j in range(self.cols):
-                result.data[i][j] = func(self.data[i][j])
-
-        return result
+            Matrix: Градиент по входу слоя (буфер слоя)
 
-    def sum(self, axis=None):
+        Raises:
+            ValueError: Если forward еще не вызывался или размеры не совпадают
         """
-        Суммирование элементов матрицы
+        outputs = self._outputs
+        if outputs is None:
+            raise ValueError("Сначала нужно выполнить forward")
+        if (grad_outputs.rows, grad_outputs.cols) != (outputs.rows,
+                                                     outputs.cols):
+            raise ValueError(
+                f"Градиент должен иметь размер {outputs.rows}x{outputs.cols}")
 
-        Args:
-            axis (int, optional): Ось для суммирования (0 - по столбцам, 1 - по строкам, None - все элементы)
+        if skip_activation or self.activation is None:
+            delta = grad_outputs
+        else:
+            self._delta = self._buffer(self._delta, outputs.rows,
+                                       outputs.cols, outputs.storage)
+            delta = self._activation_grad(grad_outputs, outputs, self._delta)
+
+        inputs = self._inputs
+        self.grad_weights = inputs.transpose().multiply(
+            delta, out=self._buffer(self.grad_weights, inputs.cols,
+                                    delta.cols, delta.storage))
+        self.grad_biases = delta.sum(axis=0)
+        self._grad_inputs = self._buffer(self._grad_inputs, inputs.rows,
+                                         inputs.cols, delta.storage)
+        return delta.multiply(self.weights.transpose(), out=self._grad_inputs)
+
+    def _activation_grad(self, grad, outputs, delta):
+        """
+        Градиент по входу активации (производные выражены через выход слоя)
 
         Returns:
-            float или Matrix: Результат суммирования
+            Matrix: delta
         """
-        if axis is None:
-            # Сумма всех элементов
-            total = 0
-            for i in range(self.rows):
-                total += sum(self.data[i])
-            return total
-        elif axis == 0:
-            # Сумма по столбцам
-            result = Matrix(1, self.cols)
-            for j in range(self.cols):
-                col_sum = 0
-                for i in range(self.rows):
-                    col_sum += self.data[i][j]
-                result.data[0][j] = col_sum
-            return result
-        elif axis == 1:
-            # Сумма по строкам
-            result = Matrix(self.rows, 1)
-            for i in range(self.rows):
-                row_sum = sum(self.data[i])
-                result.data[i][0] = row_sum
-            return result
-        else:
-            raise ValueError("axis должен быть 0, 1 или None")
-
-    def mean(self, axis=None):
+        if delta.storage == "numpy":
+            g = grad._as_ndarray()
+            y = outputs._array
+            d = delta._array
+            if self.activation == "relu":
+                np.multiply(g, y > 0, out=d)
+            elif self.activation == "sigmoid":
+                np.subtract(1, y, out=d)
+                d *= y
+                d *= g
+            elif self.activation == "tanh":
+                np.multiply(y, y, out=d)
+                np.subtract(1, d, out=d)
+                d *= g
+            else:
+                # Произведение на якобиан softmax: y * (g - sum(g * y))
+                np.subtract(g, (g * y).sum(axis=1, keepdims=True), out=d)
+                d *= y
+            return delta
+
+        if self.activation == "softmax":
+            def rows():
+                for g_row, y_row in zip(grad._row_lists(),
+                                        outputs._row_lists()):
+                    total = sum(map(operator.mul, g_row, y_row))
+                    yield [(g - total) * y for g, y in zip(g_row, y_row)]
+            return delta._write_rows(rows())
+
+        backward = _ACTIVATION_GRADIENTS[self.activation]
+        return delta._write_rows(
+            map(backward, g_row, y_row)
+            for g_row, y_row in zip(grad._row_lists(), outputs._row_lists()))
+
+    def update(self, learning_rate):
         """
-        Среднее значение элементов матрицы
+        Шаг градиентного спуска по градиентам последнего backward
 
         Args:
-            axis (int, optional): Ось для вычисления среднего
-
-        Returns:
-            float или Matrix: Среднее значение
+            learning_rate (float): Скорость обучения
         """
-        if axis is None:
-            # Среднее всех элементов
-            return self.sum() / (self.rows * self.cols)
-        elif axis == 0:
-            # Среднее по столбцам
-            sums = self.sum(axis=0)
-            return sums.scalar_multiply(1 / self.rows)
-        elif axis == 1:
-            # Среднее по строкам
-            sums = self.sum(axis=1)
-            return sums.scalar_multiply(1 / self.cols)
-        else:
-            raise ValueError("axis должен быть 0, 1 или None")
+        self.weights.subtract(
+            self.grad_weights.scalar_multiply(learning_rate,
+                                              out=self.grad_weights),
+            out=self.weights)
+        self.biases.subtract(
+            self.grad_biases.scalar_multiply(learning_rate,
+                                             out=self.grad_biases),
+            out=self.biases)
 
-    def copy(self):
-        """Создание глубокой копии матрицы"""
-        return Matrix(self.rows, self.cols, data=copy.deepcopy(self.data))
 
-    def reshape(self, new_rows, new_cols):
+class Sequential:
+    """
+    Последовательность слоев Dense
+
+    forward пропускает батч через все слои, backward - градиент в обратном
+    порядке, train_batch выполняет полный шаг обучения.
+    """
+
+    def __init__(self, layers):
         """
-        Изменение формы матрицы
+        Инициализация сети
 
         Args:
-            new_rows (int): Новое количество строк
-            new_cols (int): Новое количество столбцов
-
-        Returns:
-            Matrix: Матрица с новой формой
+            layers (list of Dense): Слои в порядке прохода
 
         Raises:
-            ValueError: Если новый размер не соответствует количеству элементов
+            ValueError: Если выход слоя не совпадает с входом следующего
         """
-        if new_rows * new_cols != self.rows * self.cols:
-            raise ValueError(
-                f"Новая форма должна содержать {self.rows * self.cols} элементов")
-
-        # Собираем все элементы в один список
-        elements = []
-        for i in range(self.rows):
-            elements.extend(self.data[i])
-
-        # Создаем новую матрицу
-        result = Matrix(new_rows, new_cols)
-        idx = 0
-        for i in range(new_rows):
-            for j in range(new_cols):
-                result.data[i][j] = elements[idx]
-                idx += 1
+        self.layers = list(layers)
+        for previous, layer in zip(self.layers, self.layers[1:]):
+            if previous.weights.cols != layer.weights.rows:
+                raise ValueError(
+                    f"Выход слоя {previous!r} не совпадает с входом {layer!r}")
+        self._grad = None
 
-        return result
+    def __repr__(self):
+        """Представление для отладки"""
+        return f"Sequential({self.layers!r})"
 
-    @classmethod
-    def identity(cls, n):
+    def forward(self, inputs):
         """
-        Создание единичной матрицы размера n x n
+        Прямой проход по всем слоям
 
         Args:
-            n (int): Размер матрицы
+            inputs (Matrix): Батч batch x in_features
 
         Returns:
-            Matrix: Единичная матрица
+            Matrix: Выход последнего слоя (его буфер, см. Dense.forward)
         """
-        result = cls(n, n)
-        for i in range(n):
-            result.data[i][i] = 1
-        return result
+        for layer in self.layers:
+            inputs = layer.forward(inputs)
+        return inputs
 
-    @classmethod
-    def zeros(cls, rows, cols=None):
+    def backward(self, grad_outputs, skip_activation=False):
         """
-        Создание матрицы из нулей
+        Обратный проход по всем слоям
 
         Args:
-            rows (int): Количество строк
-            cols (int, optional): Количество столбцов
+            grad_outputs (Matrix): Градиент функции потерь по выходу сети
+            skip_activation (bool): См. Dense.backward (для последнего слоя)
 
         Returns:
-            Matrix: Матрица из нулей
+            Matrix: Градиент по входу сети
         """
-        if cols is None:
-            cols = rows
-        return cls(rows, cols, fill_value=0)
+        grad = self.layers[-1].backward(grad_outputs, skip_activation)
+        for layer in reversed(self.layers[:-1]):
+            grad = layer.backward(grad)
+        return grad
 
-    @classmethod
-    def ones(cls, rows, cols=None):
+    def update(self, learning_rate):
+        """Шаг градиентного спуска для всех слоев"""
+        for layer in self.layers:
+            layer.update(learning_rate)
+
+    def train_batch(self, inputs, targets, learning_rate=0.1):
         """
-        Создание матрицы из единиц
+        Один шаг обучения на батче
+
+        Если последний слой - softmax, используется перекрестная энтропия
+        (ее градиент по входу softmax равен (outputs - targets) / batch),
+        иначе - среднеквадратичная ошибка.
 
         Args:
-            rows (int): Количество строк
-            cols (int, optional): Количество столбцов
+            inputs (Matrix): Батч batch x in_features
+            targets (Matrix): Целевые значения batch x out_features
+            learning_rate (float): Скорость обучения
 
         Returns:
-            Matrix: Матрица из единиц
+            float: Значение функции потерь до шага
         """
-        if cols is None:
-            cols = rows
-        return cls(rows, cols, fill_value=1)
-
-    @classmethod
-    def random(cls, rows, cols=None, low=0.0, high=1.0):
+        outputs = self.forward(inputs)
+        batch = outputs.rows
+        self._grad = Dense._buffer(self._grad, outputs.rows, outputs.cols,
+                                   outputs.storage)
+        grad = outputs.subtract(targets, out=self._grad)
+
+        if self.layers[-1].activation == "softmax":
+            loss = -sum(t * math.log(max(p, 1e-12)) for p, t in
+                        zip(outputs._flat(), targets._flat()) if t) / batch
+            grad.scalar_multiply(1 / batch, out=grad)
+            self.backward(grad, skip_activation=True)
+        else:
+            loss = sum(d * d for d in grad._flat()) / batch
+            grad.scalar_multiply(2 / batch, out=grad)
+            self.backward(grad)
+
+        self.update(learning_rate)
+        return loss
+
+
+class MatrixProfiler:
+    """
+    Профилировщик операций Matrix
+
+    Пока профилировщик запущен (start/stop или блок with), методы из
+    PROFILED_METHODS заменены на обертки, которые считают вызовы, время,
+    оценку числа операций с плавающей точкой и объем памяти результата.
+    После остановки исходные методы возвращаются на место, поэтому
+    выключенное профилирование ничего не стоит.
+
+    Для каждого метода считаются полное время (вместе с вложенными
+    профилируемыми вызовами, например inverse вызывает lu_factor через
+    determinant) и собственное время без них. Доля в отчете считается по
+    собственному времени, поэтому доли в сумме дают 100%.
+
+    Пример:
+        with MatrixProfiler() as profiler:
+            a.multiply(b).inverse()
+        print(profiler.report())
+        profiler.save_chrome_trace("trace.json")
+    """
+
+    # Профилируемые методы Matrix
+    PROFILED_METHODS = ("add", "subtract", "multiply", "scalar_multiply",
+                        "hadamard_product", "transpose", "determinant",
+                        "inverse", "lu", "lu_factor", "solve", "qr", "lstsq",
+                        "eigh", "apply_function", "softmax", "sum", "mean",
+                        "copy", "reshape")
+
+    # Профилировщик, который сейчас подменяет методы
+    _active = None
+
+    def __init__(self, trace_memory=False, record_events=True):
         """
-        Создание матрицы со случайными значениями
+        Инициализация профилировщика
 
         Args:
-            rows (int): Количество строк
-            cols (int, optional): Количество столбцов
-            low (float): Нижняя граница случайных значений
-            high (float): Верхняя граница случайных значений
-
-        Returns:
-            Matrix: Матрица со случайными значениями
+            trace_memory (bool): Измерять память через tracemalloc (точно,
+                но заметно медленнее); иначе память оценивается по размеру
+                результата
+            record_events (bool): Сохранять каждый вызов для Chrome trace
         """
-        if cols is None:
-            cols = rows
+        self.trace_memory = trace_memory
+        self.record_events = record_events
+        self.stats = {}
+        self.events = []
+        # Время вложенных вызовов для каждого уровня вложенности (по потокам)
+        self._calls = threading.local()
+        self._originals = {}
+        self._started_tracemalloc = False
+        self._origin = 0.0
+
+    def __enter__(self):
+        """Запуск профилирования в блоке with"""
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Остановка профилирования при выходе из блока with"""
+        self.stop()
+        return False
+
+    @property
+    def enabled(self):
+        """Запущен ли этот профилировщик"""
+        return MatrixProfiler._active is self
+
+    def start(self):
+        """
+        Запуск профилирования (глобально для всех матриц)
 
-        result = cls(rows, cols)
-        for i in range(rows):
-            for j in range(cols):
-                result.data[i][j] = random.uniform(low, high)
+        Raises:
+            RuntimeError: Если уже запущен другой профилировщик
+        """
+        if MatrixProfiler._active is not None:
+            raise RuntimeError("Профилировщик Matrix уже запущен")
+        MatrixProfiler._active = self
+        self._origin = time.perf_counter()
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        for name in self.PROFILED_METHODS:
+            method = Matrix.__dict__[name]
+            self._originals[name] = method
+            setattr(Matrix, name, self._wrap(name, method))
+
+    def stop(self):
+        """Остановка профилирования и возврат исходных методов"""
+        if MatrixProfiler._active is not self:
+            return
+        for name, method in self._originals.items():
+            setattr(Matrix, name, method)
+        self._originals.clear()
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+        MatrixProfiler._active = None
+
+    def reset(self):
+        """Очистка накопленной статистики"""
+        self.stats.clear()
+        self.events.clear()
+
+    def _wrap(self, name, method):
+        """Обертка метода, записывающая статистику вызова"""
+        trace_memory = self.trace_memory
+        origin = self._origin
+        calls = self._calls
+
+        @functools.wraps(method)
+        def wrapper(matrix, *args, **kwargs):
+            stack = calls.__dict__.setdefault("stack", [])
+            memory = tracemalloc.get_traced_memory()[0] if trace_memory else 0
+            stack.append(0.0)
+            start = time.perf_counter()
+            try:
+                result = method(matrix, *args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                nested = stack.pop()
+                if stack:
+                    stack[-1] += elapsed
+
+            if trace_memory:
+                allocated = max(0, tracemalloc.get_traced_memory()[0] - memory)
+            else:
+                allocated = _result_bytes(matrix, result)
+            flops = _estimate_flops(name, matrix, args, kwargs)
+            # Статистика берется при каждом вызове: reset заменяет словари
+            stats = self.stats.setdefault(
+                name, {'calls': 0, 'time': 0.0, 'self_time': 0.0,
+                       'flops': 0, 'bytes': 0})
+            stats['calls'] += 1
+            stats['time'] += elapsed
+            stats['self_time'] += elapsed - nested
+            stats['flops'] += flops
+            stats['bytes'] += allocated
+            if self.record_events:
+                self.events.append({
+                    'name': name, 'ph': 'X', 'cat': 'Matrix',
+                    'ts': (start - origin) * 1e6, 'dur': elapsed * 1e6,
+                    'pid': os.getpid(), 'tid': threading.get_ident(),
+                    'args': {'shape': f"{matrix.rows}x{matrix.cols}",
+                             'flops': flops, 'bytes': allocated}})
+            return result
 
-        return result
+        return wrapper
 
-    @classmethod
-    def from_list(cls, data):
+    def report(self, sort="time"):
         """
-        Создание матрицы из списка
+        Отчет по методам, отсортированный по убыванию
+
+        "Время" - полное время с вложенными вызовами, "Собств." -
+        собственное время метода и его доля от суммы собственных времен.
 
         Args:
-            data (list of list): Данные матрицы
+            sort (str): Поле сортировки: "time", "self_time", "calls",
+                "flops" или "bytes"
 
         Returns:
-            Matrix: Созданная матрица
+            str: Таблица отчета
+
+        Raises:
+            ValueError: Если поле сортировки неизвестно
         """
-        rows = len(data)
-        cols = len(data[0]) if rows > 0 else 0
-        return cls(rows, cols, data=data)
+        if sort not in ("time", "self_time", "calls", "flops", "bytes"):
+            raise ValueError(f"Нельзя сортировать по '{sort}'")
+
+        rows = sorted(((name, item) for name, item in self.stats.items()
+                       if item['calls']),
+                      key=lambda pair: pair[1][sort], reverse=True)
+        total_time = sum(item['self_time'] for _, item in rows) or 1.0
+        lines = [f"{'Метод':<18}{'Вызовы':>8}{'Время, с':>11}"
+                 f"{'Собств., с':>12}{'%':>7}"
+                 f"{'MFLOP':>11}{'MFLOP/s':>10}{'Память, КиБ':>13}"]
+        for name, item in rows:
+            rate = item['flops'] / item['time'] / 1e6 if item['time'] else 0.0
+            lines.append(
+                f"{name:<18}{item['calls']:>8}{item['time']:>11.4f}"
+                f"{item['self_time']:>12.4f}"
+                f"{100 * item['self_time'] / total_time:>6.1f}%"
+                f"{item['flops'] / 1e6:>11.3f}{rate:>10.1f}"
+                f"{item['bytes'] / 1024:>13.1f}")
+        return "\n".join(lines)
+
+    def chrome_trace(self):
+        """
+        События в формате Chrome Trace Event (chrome://tracing, Perfetto)
+
+        Returns:
+            dict: Объект trace с событиями
+        """
+        return {'traceEvents': list(self.events), 'displayTimeUnit': 'ms'}
+
+    def save_chrome_trace(self, path):
+        """
+        Запись событий в JSON-файл для chrome://tracing или Perfetto
+
+        Args:
+            path (str): Путь к файлу
+        """
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.chrome_trace(), file)
+
+
+def _estimate_flops(name, matrix, args, kwargs):
+    """
+    Оценка числа операций с плавающей точкой для вызова метода Matrix
+
+    Returns:
+        int: Оценка по размерам операндов
+    """
+    rows, cols = matrix.rows, matrix.cols
+    other = args[0] if args else kwargs.get("other", kwargs.get("b"))
+    if name == "multiply":
+        if isinstance(other, Matrix):
+            return 2 * rows * cols * other.cols
+        return rows * cols
+    if name in ("determinant", "lu", "lu_factor"):
+        return 2 * rows ** 3 // 3
+    if name == "inverse":
+        return 2 * rows ** 3
+    if name == "solve":
+        width = other.cols if isinstance(other, Matrix) else 1
+        return 2 * rows ** 3 // 3 + 2 * rows * rows * width
+    if name in ("qr", "lstsq"):
+        k = min(rows, cols)
+        return 2 * rows * cols * k - 2 * k ** 3 // 3
+    if name == "eigh":
+        # Около 6 проходов Якоби по n²/2 вращений на 6n операций
+        return 18 * rows ** 3
+    if name in ("transpose", "reshape", "copy"):
+        return 0
+    return rows * cols
+
+
+def _result_bytes(matrix, result):
+    """
+    Оценка памяти под результат метода: 8 байт на элемент новой матрицы
+    (представления над тем же буфером памяти не занимают)
+
+    Returns:
+        int: Оценка в байтах
+    """
+    if isinstance(result, tuple):
+        return sum(_result_bytes(matrix, item) for item in result)
+    if not isinstance(result, Matrix) or result is matrix:
+        return 0
+    if result.storage == "array" and matrix.storage == "array" and \
+            result._buf is matrix._buf:
+        return 0
+    if result.storage == "numpy":
+        if matrix.storage == "numpy" and result._array.base is not None and \
+                np.shares_memory(result._array, matrix._array):
+            return 0
+        return result._array.nbytes
+    return 8 * result.rows * result.cols
+
+
+def _relu(x):
+    """ReLU"""
+    return x if x > 0 else 0.0
+
+
+def _sigmoid(x):
+    """Сигмоида без переполнения exp при больших |x|"""
+    if x >= 0:
+        return 1 / (1 + math.exp(-x))
+    e = math.exp(x)
+    return e / (1 + e)
+
+
+# Функции активации Dense для хранения "list" и "array" (softmax считается
+# по строкам отдельно, см. Matrix.softmax)
+_ACTIVATION_FUNCTIONS = {
+    "relu": _relu,
+    "sigmoid": _sigmoid,
+    "tanh": math.tanh,
+}
+
+# Градиент по входу активации из градиента по выходу g и выхода y
+_ACTIVATION_GRADIENTS = {
+    "relu": lambda g, y: g if y > 0 else 0.0,
+    "sigmoid": lambda g, y: g * y * (1 - y),
+    "tanh": lambda g, y: g * (1 - y * y),
+}
+
+
+def _broadcast_shape(shape, other_shape):
+    """
+    Размер результата поэлементной операции по правилам broadcasting
+
+    По каждой оси размеры должны совпадать, либо один из них равен 1.
+
+    Args:
+        shape (tuple): Размер первого операнда (rows, cols)
+        other_shape (tuple): Размер второго операнда (rows, cols)
+
+    Returns:
+        tuple or None: Размер результата или None, если размеры несовместимы
+    """
+    result = []
+    for size, other_size in zip(shape, other_shape):
+        if size == other_size or other_size == 1:
+            result.append(size)
+        elif size == 1:
+            result.append(other_size)
+        else:
+            return None
+    return tuple(result)
+
+
+def _broadcast_rows(op, matrix, other, rows, cols):
+    """
+    Строки результата поэлементной операции с broadcasting
+
+    Операнды с одной строкой или одним столбцом не расширяются: нужная
+    строка берется повторно, единственный элемент строки - через repeat.
+
+    Yields:
+        iterator: Значения очередной строки результата
+    """
+    rows_a = matrix._row_lists()
+    rows_b = other._row_lists()
+    for i in range(rows):
+        row_a = rows_a[i if matrix.rows > 1 else 0]
+        row_b = rows_b[i if other.rows > 1 else 0]
+        if len(row_a) != cols:
+            row_a = repeat(row_a[0], cols)
+        if len(row_b) != cols:
+            row_b = repeat(row_b[0], cols)
+        yield map(op, row_a, row_b)
+
+
+def _broadcast_flat(matrix, rows, cols):
+    """
+    Элементы матрицы, растянутой до rows x cols, в виде итератора по строкам
+    (без создания расширенной копии)
+
+    Returns:
+        iterable: Плоская последовательность элементов
+    """
+    if (matrix.rows, matrix.cols) == (rows, cols):
+        return matrix._flat()
+    if matrix.rows == 1 and matrix.cols == cols:
+        # Строка 1xN повторяется rows раз
+        return chain.from_iterable(repeat(matrix._flat(), rows))
+    if matrix.cols == 1 and matrix.rows == rows:
+        # Каждый элемент столбца Mx1 повторяется cols раз
+        return chain.from_iterable(repeat(x, cols) for x in matrix._flat())
+    # Матрица 1x1
+    return repeat(matrix._flat()[0], rows * cols)
+
+
+_POOL = None
+_POOL_SIZE = 0
+_POOL_LOCK = threading.Lock()
+
+
+def _process_pool(workers):
+    """
+    Общий пул процессов для параллельных операций Matrix
+
+    Пул создается при первом обращении и переиспользуется следующими
+    вызовами; если нужно больше процессов, чем в нем есть, он пересоздается.
+    При завершении интерпретатора пул закрывается (atexit).
+
+    Args:
+        workers (int): Нужное количество процессов
+
+    Returns:
+        ProcessPoolExecutor: Пул не меньше чем на workers процессов
+    """
+    global _POOL, _POOL_SIZE
+    with _POOL_LOCK:
+        if _POOL is not None and _POOL_SIZE < workers:
+            _POOL.shutdown()
+            _POOL = None
+        if _POOL is None:
+            _POOL = ProcessPoolExecutor(max_workers=workers)
+            _POOL_SIZE = workers
+        return _POOL
+
+
+@atexit.register
+def _shutdown_pool():
+    """Остановка общего пула процессов (при выходе или после сбоя)"""
+    global _POOL, _POOL_SIZE
+    with _POOL_LOCK:
+        if _POOL is not None:
+            _POOL.shutdown()
+        _POOL = None
+        _POOL_SIZE = 0
+
+
+def _run_in_pool(workers, tasks):
+    """
+    Выполнение задач в общем пуле процессов с ожиданием всех результатов
+
+    Args:
+        workers (int): Нужное количество процессов
+        tasks (list of tuple): Функция уровня модуля и ее аргументы
+
+    Raises:
+        BrokenProcessPool: Если процесс-исполнитель аварийно завершился
+            (сломанный пул останавливается, следующий вызов создаст новый)
+    """
+    executor = _process_pool(workers)
+    try:
+        futures = [executor.submit(*task) for task in tasks]
+        for future in futures:
+            future.result()
+    except BrokenProcessPool:
+        _shutdown_pool()
+        raise
+
+
+def _check_workers(workers):
+    """
+    Проверка количества процессов (None - по числу процессоров)
+
+    Raises:
+        ValueError: Если workers < 1
+    """
+    if workers is not None and workers < 1:
+        raise ValueError("workers должен быть положительным")
+
+
+def _row_bands(rows, workers=None):
+    """
+    Разбиение строк на примерно равные полосы для параллельной обработки
+
+    Args:
+        rows (int): Количество строк
+        workers (int, optional): Количество процессов (по умолчанию os.cpu_count())
+
+    Returns:
+        list of tuple: Границы полос (start, stop)
+
+    Raises:
+        ValueError: Если workers < 1
+    """
+    _check_workers(workers)
+    workers = max(1, min(workers or os.cpu_count() or 1, rows))
+    step, extra = divmod(rows, workers)
+    bands = []
+    start = 0
+    for band in range(workers):
+        stop = start + step + (1 if band < extra else 0)
+        if stop > start:
+            bands.append((start, stop))
+        start = stop
+    return bands
+
+
+def _to_shared_memory(values):
+    """
+    Блок общей памяти с элементами типа double
+
+    Args:
+        values (int or sequence): Количество элементов (блок заполняется нулями)
+            или сами элементы
+
+    Returns:
+        SharedMemory: Созданный блок (закрыть и удалить должен вызывающий)
+    """
+    count = values if isinstance(values, int) else len(values)
+    shm = shared_memory.SharedMemory(create=True, size=max(1, count * 8))
+    if not isinstance(values, int) and count:
+        if not isinstance(values, array):
+            values = array('d', values)
+        shm.buf[:count * 8] = memoryview(values).cast('B')
+    return shm
+
+
+def _multiply_band(a_name, b_name, c_name, m, p, start, stop, block_size):
+    """
+    Умножение полосы строк [start, stop) в процессе-исполнителе
+
+    Операнды читаются из общей памяти, полоса результата записывается
+    прямо в общий блок c_name.
+    """
+    a_shm = shared_memory.SharedMemory(name=a_name)
+    b_shm = shared_memory.SharedMemory(name=b_name)
+    c_shm = shared_memory.SharedMemory(name=c_name)
+    a_view = a_shm.buf.cast('d')
+    b_view = b_shm.buf.cast('d')
+    c_view = c_shm.buf.cast('d')
+    try:
+        a_rows = [a_view[i * m:(i + 1) * m].tolist() for i in
+                  range(start, stop)]
+        b_rows = [b_view[k * p:(k + 1) * p].tolist() for k in range(m)]
+        band = Matrix._blocked_rows(a_rows, b_rows, p, block_size)
+        c_view[start * p:stop * p] = array('d', [x for row in band for x in
+                                                 row])
+    finally:
+        for view in (a_view, b_view, c_view):
+            view.release()
+        for shm in (a_shm, b_shm, c_shm):
+            shm.close()
+
+
+def _apply_band(src_name, dst_name, start, stop, func):
+    """Применение функции к элементам [start, stop) в процессе-исполнителе"""
+    src_shm = shared_memory.SharedMemory(name=src_name)
+    dst_shm = shared_memory.SharedMemory(name=dst_name)
+    src_view = src_shm.buf.cast('d')
+    dst_view = dst_shm.buf.cast('d')
+    try:
+        dst_view[start:stop] = array('d', map(func, src_view[start:stop]))
+    finally:
+        for view in (src_view, dst_view):
+            view.release()
+        for shm in (src_shm, dst_shm):
+            shm.close()
+
+
+def _apply_householder(rows, vector, scale, start, col):
+    """
+    Применение отражения H = I - scale * v * v^T к строкам start..
+    матрицы (начиная со столбца col), на месте
+
+    Args:
+        rows (list of list): Матрица строками-списками
+        vector (list): Вектор отражения v (длина - число затрагиваемых строк)
+        scale (float): 2 / (v^T * v)
+        start (int): Первая затрагиваемая строка
+        col (int): Первый затрагиваемый столбец
+    """
+    # w = v^T * A, накопление строками (без обхода по столбцам)
+    w = [0.0] * (len(rows[start]) - col)
+    for offset, v in enumerate(vector):
+        if v:
+            w = [acc + v * x for acc, x in zip(w, rows[start + offset][col:])]
+    for offset, v in enumerate(vector):
+        if v:
+            row = rows[start + offset]
+            factor = scale * v
+            row[col:] = [x - factor * y for x, y in zip(row[col:], w)]
+
+
+def _add_rows(a, b):
+    """Поэлементная сумма двух матриц, заданных строками-списками"""
+    return [list(map(operator.add, row_a, row_b)) for row_a, row_b in
+            zip(a, b)]
+
+
+def _sub_rows(a, b):
+    """Поэлементная разность двух матриц, заданных строками-списками"""
+    return [list(map(operator.sub, row_a, row_b)) for row_a, row_b in
+            zip(a, b)]
+
+
+def _strassen_rows(a, b, n, m, p, threshold, block_size):
+    """
+    Рекурсивное умножение Штрассена над строками-списками
+
+    Нечетные размеры дополняются нулевой строкой/столбцом на каждом уровне
+    рекурсии, лишние элементы отбрасываются при сборке результата.
+
+    Args:
+        a (list of list): Строки левой матрицы (n x m)
+        b (list of list): Строки правой матрицы (m x p)
+        n, m, p (int): Размеры матриц
+        threshold (int): Размер, ниже которого используется блочное умножение
+        block_size (int): Размер блока для базового случая
+
+    Returns:
+        list of list: Строки результата (n x p)
+    """
+    if min(n, m, p) <= threshold:
+        return Matrix._blocked_rows(a, b, p, block_size)
+
+    # Дополнение нулями до четных размеров
+    n_even, m_even, p_even = n + n % 2, m + m % 2, p + p % 2
+    if m_even != m:
+        a = [row + [0] for row in a]
+    if n_even != n:
+        a = a + [[0] * m_even]
+    if p_even != p:
+        b = [row + [0] for row in b]
+    if m_even != m:
+        b = b + [[0] * p_even]
+
+    hn, hm, hp = n_even // 2, m_even // 2, p_even // 2
+    a11 = [row[:hm] for row in a[:hn]]
+    a12 = [row[hm:] for row in a[:hn]]
+    a21 = [row[:hm] for row in a[hn:]]
+    a22 = [row[hm:] for row in a[hn:]]
+    b11 = [row[:hp] for row in b[:hm]]
+    b12 = [row[hp:] for row in b[:hm]]
+    b21 = [row[:hp] for row in b[hm:]]
+    b22 = [row[hp:] for row in b[hm:]]
+
+    def product(x, y):
+        return _strassen_rows(x, y, hn, hm, hp, threshold, block_size)
+
+    m1 = product(_add_rows(a11, a22), _add_rows(b11, b22))
+    m2 = product(_add_rows(a21, a22), b11)
+    m3 = product(a11, _sub_rows(b12, b22))
+    m4 = product(a22, _sub_rows(b21, b11))
+    m5 = product(_add_rows(a11, a12), b22)
+    m6 = product(_sub_rows(a21, a11), _add_rows(b11, b12))
+    m7 = product(_sub_rows(a12, a22), _add_rows(b21, b22))
+
+    c11 = _add_rows(_sub_rows(_add_rows(m1, m4), m5), m7)
+    c12 = _add_rows(m3, m5)
+    c21 = _add_rows(m2, m4)
+    c22 = _add_rows(_add_rows(_sub_rows(m1, m2), m3), m6)
+
+    # Сборка результата с отбрасыванием дополнения
+    top = [(row_1 + row_2)[:p] for row_1, row_2 in zip(c11, c12)]
+    bottom = [(row_1 + row_2)[:p] for row_1, row_2 in zip(c21, c22)]
+    return (top + bottom)[:n]
 
 
 def test_matrix_operations():
@@ -633,6 +3874,13 @@ def test_matrix_operations():
             print(
                 "\nПроверка (A * A⁻¹), должно быть близко к единичной матрице:")
             print(identity_check)
+
+            # Точный режим: дроби вместо float, A * A⁻¹ ровно единичная
+            exact_inverse = m4.inverse(exact=True)
+            print("\nТочная обратная матрица 4 (Fraction):")
+            print(exact_inverse)
+            print("A * A⁻¹ == I:",
+                  m4.multiply(exact_inverse) == Matrix.identity(3))
     except ValueError as e:
         print(f"Ошибка: {e}")
 
@@ -717,6 +3965,98 @@ def test_matrix_operations():
     print("\nПосле изменения формы на 3x2:")
     print(reshaped)
 
+    # Тест 11: Компактное хранение
+    print("\n" + "=" * 80)
+    print("11. 💾 КОМПАКТНОЕ ХРАНЕНИЕ (array('d')):")
+
+    packed = Matrix(2, 3, data=[[1, 2, 3], [4, 5, 6]], storage="array")
+    print(f"{packed!r}, шаги: {packed.strides}")
+    print(packed)
+
+    packed_t = packed.transpose()
+    print(f"\nТранспонирование без копирования: {packed_t!r}, "
+          f"шаги: {packed_t.strides}")
+    print(packed_t)
+    print("Совпадает с обычной матрицей:",
+          packed_t == flat_matrix.transpose())
+
+    # Тест 12: Разреженные матрицы
+    print("\n" + "=" * 80)
+    print("12. 🕸️  РАЗРЕЖЕННЫЕ МАТРИЦЫ (CSR):")
+
+    sparse = SparseMatrix.from_coo(3, 3, [0, 1, 2], [2, 0, 1], [5, 7, 9])
+    print(f"{sparse!r}:")
+    print(sparse)
+
+    print("\nУмножение разреженной на плотную (sparse * m3):")
+    print(sparse * m3)
+    print("Совпадает с плотным умножением:",
+          sparse * m3 == sparse.to_matrix() * m3)
+
+    # Тест 13: Отложенные вычисления
+    print("\n" + "=" * 80)
+    print("13. 💤 ОТЛОЖЕННЫЕ ВЫЧИСЛЕНИЯ (слияние поэлементных операций):")
+
+    expression = (m1.lazy() + m2) * 2.5
+    print(f"Выражение (m1 + m2) * 2.5: {expression!r}")
+    print(expression)
+    print(f"После вычисления: {expression!r}")
+    print("Совпадает с немедленным вычислением:",
+          expression == (m1 + m2) * 2.5)
+
+    # Тест 14: Сохранение и загрузка
+    print("\n" + "=" * 80)
+    print("14. 💽 СОХРАНЕНИЕ И ЗАГРУЗКА (двоичный формат, mmap):")
+
+    path = os.path.join(tempfile.gettempdir(), "matrix_demo.mtrx")
+    m1.save(path)
+    loaded = Matrix.load(path)
+    print(f"Размер файла: {os.path.getsize(path)} байт, загружено: {loaded!r}")
+    print(loaded)
+    print("Совпадает с исходной матрицей:", loaded == m1)
+    del loaded
+    os.remove(path)
+
+    # Тест 15: QR-разложение и собственные значения
+    print("\n" + "=" * 80)
+    print("15. 🧮 QR-РАЗЛОЖЕНИЕ И СОБСТВЕННЫЕ ЗНАЧЕНИЯ:")
+
+    q, r = m3.qr()
+    print("Q:")
+    print(q)
+    print("R:")
+    print(r)
+    restored = q * r
+    print("Q * R совпадает с m3:",
+          all(abs(restored[i, j] - m3[i, j]) < 1e-9
+              for i in range(m3.rows) for j in range(m3.cols)))
+
+    symmetric = Matrix.from_list([[4, 1, 2], [1, 3, 0], [2, 0, 5]])
+    eigenvalues, eigenvectors = symmetric.eigh()
+    print(f"\nСобственные значения {symmetric.data}:",
+          [round(value, 6) for value in eigenvalues])
+    print("Собственные векторы (по столбцам):")
+    print(eigenvectors)
+
+    # Прямая y = 1 + 2x по зашумленным точкам
+    points = [(0, 1.1), (1, 2.9), (2, 5.2), (3, 6.8), (4, 9.1)]
+    design = Matrix.from_list([[1, x] for x, _ in points])
+    intercept, slope = design.lstsq([y for _, y in points])
+    print(f"\nНаименьшие квадраты: y = {intercept:.3f} + {slope:.3f}x")
+
+    # Тест 16: Профилирование
+    print("\n" + "=" * 80)
+    print("16. 🔬 ПРОФИЛИРОВАНИЕ ОПЕРАЦИЙ:")
+
+    with MatrixProfiler() as profiler:
+        square = Matrix.random(40, 40, low=-1, high=1)
+        for _ in range(3):
+            square.multiply(square).transpose()
+        square.inverse()
+        square.apply_function(abs).sum(axis=0)
+    print(profiler.report())
+    print(f"Событий для Chrome trace: {len(profiler.events)}")
+
     print("\n" + "=" * 80)
     print("✅ ТЕСТИРОВАНИЕ ЗАВЕРШЕНО УСПЕШНО!")
     print("=" * 80)
@@ -752,10 +4092,7 @@ def neural_network_example():
     hidden_pre_activation = inputs.multiply(weights_input_hidden)
 
     # Добавляем смещения (broadcasting)
-    hidden_with_biases = hidden_pre_activation.copy()
-    for i in range(hidden_with_biases.rows):
-        for j in range(hidden_with_biases.cols):
-            hidden_with_biases[i, j] += biases_hidden[0, j]
+    hidden_with_biases = hidden_pre_activation + biases_hidden
 
     print("\n4. 🔄 ВЫХОД СКРЫТОГО СЛОЯ ДО АКТИВАЦИИ (2x4):")
     print(hidden_with_biases)
@@ -781,35 +4118,339 @@ def neural_network_example():
     # 8. Forward propagation: вычисление выхода сети
     output_pre_activation = hidden_activated.multiply(weights_hidden_output)
 
-    # Добавляем смещения
-    output_with_biases = output_pre_activation.copy()
-    for i in range(output_with_biases.rows):
-        for j in range(output_with_biases.cols):
-            output_with_biases[i, j] += biases_output[0, j]
+    # Добавляем смещения (broadcasting)
+    output_with_biases = output_pre_activation + biases_output
 
     print("\n8. 🔄 ВЫХОД СЕТИ ДО АКТИВАЦИИ (2x2):")
     print(output_with_biases)
 
-    # 9. Применение функции активации Softmax
-    def softmax_row(row_data):
-        exp_values = [math.exp(x) for x in row_data]
-        sum_exp = sum(exp_values)
-        return [x / sum_exp for x in exp_values]
-
-    # Применяем softmax к каждой строке отдельно
-    output_softmax = Matrix(output_with_biases.rows, output_with_biases.cols)
-    for i in range(output_with_biases.rows):
-        row_softmax = softmax_row(output_with_biases.data[i])
-        output_softmax.data[i] = row_softmax
+    # 9. Применение функции активации Softmax (по каждой строке)
+    output_softmax = output_with_biases.softmax()
 
     print("\n9. 🎯 ВЫХОД СЕТИ ПОСЛЕ SOFTMAX АКТИВАЦИИ (вероятности классов):")
     print(output_softmax)
 
+    # 10. Та же сеть через слои Dense/Sequential
+    network = Sequential([
+        Dense(3, 4, "relu", weights=weights_input_hidden, biases=biases_hidden),
+        Dense(4, 2, "softmax", weights=weights_hidden_output,
+              biases=biases_output),
+    ])
+    print("\n10. 🧱 ТА ЖЕ СЕТЬ ЧЕРЕЗ Sequential:")
+    print(network.forward(inputs))
+
+    # 11. Обучение на большом батче
+    # Класс 0, если первый признак больше второго, иначе класс 1
+    batch = 1000
+    train_inputs = Matrix.random(batch, 3, low=-1, high=1)
+    train_targets = Matrix(batch, 2, fill_value=0.0,
+                           storage=train_inputs.storage)
+    for i in range(batch):
+        train_targets[i, 0 if train_inputs[i, 0] > train_inputs[i, 1] else 1] = 1.0
+
+    classifier = Sequential([Dense(3, 16, "relu"), Dense(16, 2, "softmax")])
+    print(f"\n11. 📚 ОБУЧЕНИЕ {classifier!r} НА БАТЧЕ ИЗ {batch} ПРИМЕРОВ:")
+    for epoch in range(1, 11):
+        loss = classifier.train_batch(train_inputs, train_targets,
+                                      learning_rate=0.5)
+        if epoch == 1 or epoch % 5 == 0:
+            print(f"   Эпоха {epoch:>2}: потери {loss:.4f}")
+
+    start = time.perf_counter()
+    predictions = classifier.forward(train_inputs)
+    elapsed = time.perf_counter() - start
+    correct = sum(
+        (predictions[i, 0] > predictions[i, 1]) == (train_targets[i, 0] == 1)
+        for i in range(batch))
+    print(f"   Точность: {correct / batch:.1%}, "
+          f"инференс: {batch / elapsed:,.0f} примеров/с")
+
     print("\n" + "=" * 80)
     print("✅ СИМУЛЯЦИЯ FORWARD PROPAGATION ЗАВЕРШЕНА!")
     print("=" * 80)
 
 
+def benchmark_multiply(sizes=(64, 256, 512), block_size=64):
+    """
+    Сравнение скорости классического и блочного умножения матриц
+
+    Args:
+        sizes (tuple): Размеры квадратных матриц для замера
+        block_size (int): Размер блока для алгоритма "blocked"
+
+    Returns:
+        list of dict: Результаты замеров для каждого размера
+    """
+    print("\n" + "=" * 80)
+    print("⏱️  БЕНЧМАРК УМНОЖЕНИЯ МАТРИЦ (naive vs blocked)")
+    print("=" * 80)
+    print(f"{'Размер':>8}  {'naive, с':>10}  {'blocked, с':>11}  {'Ускорение':>10}")
+
+    results = []
+    for size in sizes:
+        a = Matrix.random(size, size, low=-1, high=1)
+        b = Matrix.random(size, size, low=-1, high=1)
+
+        start = time.perf_counter()
+        expected = a.multiply(b, algorithm="naive")
+        naive_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        actual = a.multiply(b, algorithm="blocked", block_size=block_size)
+        blocked_time = time.perf_counter() - start
+
+        if actual != expected:
+            raise AssertionError(
+                f"Результаты naive и blocked не совпадают для {size}x{size}")
+
+        speedup = naive_time / blocked_time
+        results.append({'size': size, 'naive': naive_time,
+                        'blocked': blocked_time, 'speedup': speedup})
+        print(f"{size:>8}  {naive_time:>10.3f}  {blocked_time:>11.3f}  {speedup:>9.2f}x")
+
+    return results
+
+
+def tune_strassen_threshold(size=256, candidates=(16, 32, 64, 128),
+                            apply=True):
+    """
+    Подбор порога перехода Strassen на блочное умножение для текущей машины
+
+    Для каждого кандидата замеряется умножение случайных матриц size x size.
+    Если ни один порог не быстрее обычного блочного умножения, выбирается
+    порог size (то есть Strassen фактически не используется).
+
+    Args:
+        size (int): Размер квадратных матриц для замера
+        candidates (tuple): Проверяемые значения порога
+        apply (bool): Записать ли найденный порог в Matrix.STRASSEN_THRESHOLD
+
+    Returns:
+        int: Лучший порог
+    """
+    print("\n" + "=" * 80)
+    print(f"⏱️  ПОДБОР ПОРОГА STRASSEN (матрицы {size}x{size})")
+    print("=" * 80)
+
+    a = Matrix.random(size, size, low=-1, high=1)
+    b = Matrix.random(size, size, low=-1, high=1)
+
+    start = time.perf_counter()
+    a.multiply(b, algorithm="blocked")
+    best_time = time.perf_counter() - start
+    best_threshold = size
+    print(f"{'blocked':>10}: {best_time:.3f} с")
+
+    for threshold in candidates:
+        start = time.perf_counter()
+        a.multiply(b, algorithm="strassen", threshold=threshold)
+        elapsed = time.perf_counter() - start
+        print(f"{threshold:>10}: {elapsed:.3f} с")
+        if elapsed < best_time:
+            best_time, best_threshold = elapsed, threshold
+
+    print(f"\nЛучший порог: {best_threshold}")
+    if apply:
+        Matrix.STRASSEN_THRESHOLD = best_threshold
+    return best_threshold
+
+
+# Операции набора бенчмарков (см. run_benchmarks)
+BENCHMARK_OPERATIONS = {
+    "multiply": lambda m: m.multiply(m),
+    "transpose": lambda m: m.transpose(),
+    "determinant": lambda m: m.determinant(),
+    "inverse": lambda m: m.inverse(),
+    "sum": lambda m: m.sum(),
+    "sum_axis0": lambda m: m.sum(axis=0),
+    "sum_axis1": lambda m: m.sum(axis=1),
+    "mean": lambda m: m.mean(),
+    "mean_axis0": lambda m: m.mean(axis=0),
+    "mean_axis1": lambda m: m.mean(axis=1),
+    "apply_function": lambda m: m.apply_function(abs),
+    "reshape": lambda m: m.reshape(m.cols, m.rows),
+    "str": str,
+}
+
+# Файл базовых результатов по умолчанию (рядом с программой)
+BENCHMARK_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                  "07_Matrices_benchmark.json")
+
+
+def _benchmark_matrix(size, dtype, rng):
+    """
+    Обратимая матрица для бенчмарка: случайные элементы и диагональное
+    преобладание (чтобы determinant и inverse не упирались в вырожденность)
+
+    Args:
+        size (int): Размер квадратной матрицы
+        dtype (str): Тип элементов ("int" или "float")
+        rng (random.Random): Генератор случайных чисел
+
+    Returns:
+        Matrix: Матрица size x size
+    """
+    if dtype == "int":
+        data = [[rng.randint(-9, 9) for _ in range(size)] for _ in range(size)]
+        for i in range(size):
+            data[i][i] += 10 * size
+    else:
+        data = [[rng.uniform(-1, 1) for _ in range(size)] for _ in range(size)]
+        for i in range(size):
+            data[i][i] += size
+    return Matrix(size, size, data=data)
+
+
+def _measure(operation, matrix, min_time):
+    """
+    Замер одной операции
+
+    Операция повторяется, пока не пройдет min_time секунд. Пиковая память
+    замеряется отдельным запуском под tracemalloc, чтобы трассировка
+    не искажала время.
+
+    Returns:
+        tuple: (операций в секунду, пик памяти в байтах)
+    """
+    count = 0
+    start = time.perf_counter()
+    while True:
+        operation(matrix)
+        count += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        operation(matrix)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return count / elapsed, peak
+
+
+def run_benchmarks(sizes=(16, 64), dtypes=("int", "float"), operations=None,
+                   min_time=0.2, output=None, baseline=None, tolerance=0.25,
+                   seed=0):
+    """
+    Набор бенчмарков операций Matrix с отслеживанием регрессий
+
+    Для каждой операции, размера и типа элементов замеряются операции
+    в секунду и пиковая память (tracemalloc). Результаты можно сохранить
+    в JSON и сравнить с сохраненными ранее базовыми результатами.
+
+    Args:
+        sizes (tuple): Размеры квадратных матриц
+        dtypes (tuple): Типы элементов ("int", "float")
+        operations (list, optional): Имена операций из BENCHMARK_OPERATIONS
+            (по умолчанию все)
+        min_time (float): Минимальное время замера одной операции, с
+        output (str, optional): Путь для записи результатов в JSON
+        baseline (str, optional): Путь к JSON с базовыми результатами
+        tolerance (float): Допустимое ухудшение относительно базы (доля)
+        seed (int): Зерно генератора матриц
+
+    Returns:
+        dict: Результаты ("results") и найденные регрессии ("regressions")
+
+    Raises:
+        ValueError: Если операция или тип элементов неизвестны
+        FileNotFoundError: Если файла базовых результатов нет (проверяется
+            до замеров, чтобы опечатка в пути не отключала сравнение)
+    """
+    if baseline is not None and not os.path.isfile(baseline):
+        raise FileNotFoundError(
+            f"Файл базовых результатов '{baseline}' не найден")
+    if operations is None:
+        operations = list(BENCHMARK_OPERATIONS)
+    for name in operations:
+        if name not in BENCHMARK_OPERATIONS:
+            raise ValueError(f"Неизвестная операция бенчмарка '{name}'")
+    for dtype in dtypes:
+        if dtype not in ("int", "float"):
+            raise ValueError(f"Неизвестный тип элементов '{dtype}'")
+
+    print("\n" + "=" * 80)
+    print(f"📈 НАБОР БЕНЧМАРКОВ MATRIX (хранение '{Matrix.default_storage}')")
+    print("=" * 80)
+    print(f"{'Операция':<16}{'Тип':>6}{'Размер':>8}{'оп/с':>14}{'Пик, КиБ':>12}")
+
+    rng = random.Random(seed)
+    results = []
+    for size in sizes:
+        for dtype in dtypes:
+            matrix = _benchmark_matrix(size, dtype, rng)
+            for name in operations:
+                ops_per_sec, peak = _measure(BENCHMARK_OPERATIONS[name],
+                                             matrix, min_time)
+                results.append({'operation': name, 'dtype': dtype,
+                                'size': size, 'ops_per_sec': ops_per_sec,
+                                'peak_bytes': peak})
+                print(f"{name:<16}{dtype:>6}{size:>8}{ops_per_sec:>14.1f}"
+                      f"{peak / 1024:>12.1f}")
+
+    report = {'storage': Matrix.default_storage,
+              'python': sys.version.split()[0],
+              'results': results,
+              'regressions': []}
+
+    if baseline is not None:
+        with open(baseline, encoding="utf-8") as file:
+            report['regressions'] = compare_benchmarks(
+                results, json.load(file)['results'], tolerance)
+        print(f"\nСравнение с базой {baseline} (допуск {tolerance:.0%}):")
+        if report['regressions']:
+            for regression in report['regressions']:
+                print(f"  ❌ {regression['operation']} {regression['dtype']} "
+                      f"{regression['size']}: {regression['metric']} "
+                      f"{regression['baseline']:.1f} -> {regression['current']:.1f}")
+        else:
+            print("  ✅ Регрессий не найдено")
+
+    if output is not None:
+        with open(output, "w", encoding="utf-8") as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+        print(f"\nРезультаты записаны в {output}")
+
+    return report
+
+
+def compare_benchmarks(results, baseline, tolerance=0.25):
+    """
+    Сравнение результатов бенчмарков с базовыми
+
+    Регрессия - падение операций в секунду или рост пиковой памяти больше
+    чем на tolerance. Замеры, которых нет в базе, пропускаются.
+
+    Args:
+        results (list of dict): Текущие результаты (см. run_benchmarks)
+        baseline (list of dict): Базовые результаты в том же формате
+        tolerance (float): Допустимое ухудшение (доля)
+
+    Returns:
+        list of dict: Найденные регрессии
+    """
+    known = {(item['operation'], item['dtype'], item['size']): item
+             for item in baseline}
+    regressions = []
+    for item in results:
+        base = known.get((item['operation'], item['dtype'], item['size']))
+        if base is None:
+            continue
+        if item['ops_per_sec'] < base['ops_per_sec'] * (1 - tolerance):
+            regressions.append(dict(item, metric='ops_per_sec',
+                                    baseline=base['ops_per_sec'],
+                                    current=item['ops_per_sec']))
+        # Небольшой абсолютный запас: пик в пару сотен байт шумит
+        if item['peak_bytes'] > base['peak_bytes'] * (1 + tolerance) + 1024:
+            regressions.append(dict(item, metric='peak_bytes',
+                                    baseline=base['peak_bytes'],
+                                    current=item['peak_bytes']))
+    return regressions
+
+
 def main():
     """Основная функция для демонстрации работы класса Matrix"""
 
@@ -822,9 +4463,12 @@ def main():
         print("1. 🧪 Запустить полное тестирование операций с матрицами")
         print("2. 🧠 Показать пример использования в нейронной сети")
         print("3. 🎮 Интерактивная работа с матрицами")
-        print("4. 🚪 Выход")
+        print("4. ⏱️  Бенчмарк умножения матриц")
+        print("5. 🎛️  Подбор порога Strassen")
+        print("6. 📈 Набор бенчмарков (сравнение с базой)")
+        print("7. 🚪 Выход")
 
-        choice = input("\nВаш выбор (1-4): ").strip()
+        choice = input("\nВаш выбор (1-7): ").strip()
 
         if choice == "1":
             test_matrix_operations()
@@ -838,12 +4482,28 @@ def main():
             interactive_matrix_playground()
 
         elif choice == "4":
+            benchmark_multiply()
+            input("\nНажмите Enter для продолжения...")
+
+        elif choice == "5":
+            tune_strassen_threshold()
+            input("\nНажмите Enter для продолжения...")
+
+        elif choice == "6":
+            # Первый запуск сохраняет базу, следующие сравниваются с ней
+            if os.path.exists(BENCHMARK_BASELINE):
+                run_benchmarks(baseline=BENCHMARK_BASELINE)
+            else:
+                run_benchmarks(output=BENCHMARK_BASELINE)
+            input("\nНажмите Enter для продолжения...")
+
+        elif choice == "7":
             print(
                 "\n👋 До свидания! Удачи в исследованиях искусственного интеллекта!")
             break
 
         else:
-            print("❌ Неверный выбор. Пожалуйста, выберите 1-4.")
+            print("❌ Неверный выбор. Пожалуйста, выберите 1-7.")
 
 
 def interactive_matrix_playground():
@@ -1018,6 +4678,25 @@ def interactive_matrix_playground():
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Класс Matrix: демонстрация и бенчмарки")
+    parser.add_argument("--benchmark", action="store_true",
+                        help="запустить набор бенчмарков вместо меню")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[16, 64],
+                        help="размеры квадратных матриц")
+    parser.add_argument("--output", help="файл для записи результатов в JSON")
+    parser.add_argument("--baseline", help="JSON с базовыми результатами")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="допустимое ухудшение относительно базы")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        try:
+            report = run_benchmarks(sizes=args.sizes, output=args.output,
+                                    baseline=args.baseline,
+                                    tolerance=args.tolerance)
+        except FileNotFoundError as error:
+            parser.error(str(error))
+        sys.exit(1 if report['regressions'] else 0)
     main()
 
 '''2. Расширенные операции для ИИ:
@@ -0,0 +1,132 @@
+"""Тесты для 06_Tic-tac-toe.py (запуск: python -m pytest Module24)"""
+
+import importlib.util
+import os
+import random
+import sys
+
+import pytest
+
+
+def _load_module():
+    """Загрузка модуля по пути: в имени файла есть дефис"""
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                        "06_Tic-tac-toe.py")
+    spec = importlib.util.spec_from_file_location("tic_tac_toe", path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+game = _load_module()
+Symbol = game.Symbol
+X, O = Symbol.X, Symbol.O
+
+
+@pytest.mark.parametrize("size, expected", [
+    (3, {5}), (4, {6, 7, 10, 11}), (5, {13}), (6, {15, 16, 21, 22})])
+def test_medium_takes_center(size, expected):
+    random.seed(0)
+    ai = game.AIPlayer("ИИ", X, "средний", verbose=False)
+    board = game.GridBoard(size, 3)
+    moves = {ai.make_move(board) for _ in range(20)}
+    assert moves <= expected
+    if len(expected) > 1:
+        assert len(moves) > 1
+
+
+@pytest.mark.parametrize("size, win_length, x_cells, o_cells, expected", [
+    (3, 3, [1, 2], [5], 3),
+    (15, 5, [113, 114, 115, 116], [112, 98, 99], 117)])
+@pytest.mark.parametrize("workers", [1, 2])
+def test_mcts_blocks_immediate_loss(size, win_length, x_cells, o_cells,
+                                    expected, workers):
+    random.seed(1)
+    board = game.BitBoard() if size == 3 else game.GridBoard(size, win_length)
+    for number in x_cells:
+        board.push(number, X)
+    for number in o_cells:
+        board.push(number, O)
+    ai = game.AIPlayer("ИИ", O, "монте-карло", verbose=False,
+                       iterations=300, workers=workers)
+    assert ai.make_move(board) == expected
+    assert ai.last_playouts == 300 * workers
+    assert ai.playouts_per_sec == pytest.approx(ai.last_playouts_per_sec)
+
+
+def test_mcts_workers_must_be_positive():
+    for workers in (0, -2):
+        with pytest.raises(ValueError):
+            game.AIPlayer("ИИ", O, "монте-карло", workers=workers)
+
+
+def test_book_agrees_with_search(tmp_path):
+    AIPlayer, BitBoard = game.AIPlayer, game.BitBoard
+    book = game.load_book(str(tmp_path / "missing.bin"))
+    assert book == game.build_book()
+    saved = str(tmp_path / "book.bin")
+    game.save_book(saved)
+    assert game.load_book(saved) == book
+
+    checked = 0
+    seen = set()
+    stack = [(0, 0)]
+    while stack:
+        mine, theirs = stack.pop()
+        if (mine, theirs) in seen:
+            continue
+        seen.add((mine, theirs))
+        free = ~(mine | theirs) & BitBoard.FULL_MASK
+        if BitBoard.WINNING[theirs] or not free:
+            assert AIPlayer.book_entry(mine, theirs) is None
+            continue
+        values = {}
+        for move in BitBoard.MOVES[free]:
+            bit = 1 << (move - 1)
+            stack.append((theirs, mine | bit))
+            values[move] = -AIPlayer._negamax(theirs, mine | bit, -100, 100)
+        best = max(values.values())
+        moves, outcome = AIPlayer.book_entry(mine, theirs)
+        assert set(moves) == {m for m, v in values.items() if v == best}
+        assert outcome == (best > 0) - (best < 0)
+        checked += 1
+    assert checked == 4520
+
+
+def _scan_winner(board):
+    """Победитель полным просмотром поля (для сверки с GridBoard)"""
+    size, need = board.size, board.win_length
+    for row in range(size):
+        for col in range(size):
+            symbol = board.cells[row * size + col].symbol
+            if symbol not in (X, O):
+                continue
+            for dr, dc in game.GridBoard.DIRECTIONS:
+                end_row, end_col = row + dr * (need - 1), col + dc * (need - 1)
+                if 0 <= end_row < size and 0 <= end_col < size and all(
+                        board.cells[(row + dr * k) * size + col + dc * k]
+                        .symbol == symbol for k in range(need)):
+                    return symbol
+    return None
+
+
+@pytest.mark.parametrize("size, win_length", [(3, 3), (5, 4), (7, 4)])
+def test_grid_board_win_follows_push_pop(size, win_length):
+    rng = random.Random(size * 10 + win_length)
+    board = game.GridBoard(size, win_length)
+    for _ in range(30):
+        moves = []
+        while board.check_win() is None and not board.is_full():
+            number = rng.choice(board.get_available_moves())
+            assert board.push(number, X if len(moves) % 2 == 0 else O)
+            moves.append(number)
+            assert board.check_win() == _scan_winner(board)
+        # Откат части ходов: победитель исчезает вместе с выигрышным ходом
+        for _ in range(rng.randint(1, len(moves))):
+            assert board.pop() == moves.pop()
+            assert board.check_win() == _scan_winner(board)
+        while moves:
+            board.pop()
+            moves.pop()
+        assert board.check_win() is None and board.moves_count == 0
@@ -0,0 +1,344 @@
+"""Тесты для 07_Matrices.py (запуск: python -m pytest Module24)"""
+
+import importlib.util
+import os
+import random
+import sys
+
+import pytest
+
+
+def _load_module():
+    """Загрузка модуля по пути: имя файла начинается с цифры"""
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                        "07_Matrices.py")
+    spec = importlib.util.spec_from_file_location("matrices", path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+matrices = _load_module()
+Matrix = matrices.Matrix
+
+ROWS_4X4 = [[2.0, 1.0, 0.0, 3.0],
+            [1.0, 5.0, 2.0, 0.0],
+            [0.0, 2.0, 7.0, 1.0],
+            [3.0, 0.0, 1.0, 9.0]]
+
+
+def assert_close(actual, expected, tol=1e-9):
+    """Поэлементное сравнение матриц или списков"""
+    if isinstance(actual, Matrix):
+        actual = actual._row_lists()
+    if isinstance(expected, Matrix):
+        expected = expected._row_lists()
+    assert len(actual) == len(expected)
+    for a, e in zip(actual, expected):
+        if isinstance(a, (list, tuple)):
+            assert len(a) == len(e)
+            assert all(abs(x - y) <= tol for x, y in zip(a, e)), (a, e)
+        else:
+            assert abs(a - e) <= tol, (a, e)
+
+
+@pytest.mark.parametrize("storage", ["list", "array"])
+def test_lu_results_follow_in_place_edits(storage):
+    a = Matrix(4, 4, [list(row) for row in ROWS_4X4], storage=storage)
+    det_before = a.determinant()
+    a.solve([1, 2, 3, 4])
+    a.inverse()
+
+    a.data[0][0] = 40.0
+    edited = [list(row) for row in ROWS_4X4]
+    edited[0][0] = 40.0
+    expected = Matrix(4, 4, edited)
+
+    assert a.determinant() != det_before
+    assert abs(a.determinant() - expected.determinant()) < 1e-9
+    assert_close(a.solve([1, 2, 3, 4]), expected.solve([1, 2, 3, 4]))
+    assert_close(a.inverse(), expected.inverse())
+
+
+def test_lu_results_follow_writes_through_view():
+    a = Matrix(4, 4, [list(row) for row in ROWS_4X4], storage="array")
+    a.determinant()
+    view = a.transpose()
+    view[1, 0] = 10.0  # элемент (0, 1) исходной матрицы
+    edited = [list(row) for row in ROWS_4X4]
+    edited[0][1] = 10.0
+    assert abs(a.determinant() - Matrix(4, 4, edited).determinant()) < 1e-9
+
+
+def test_lu_factor_is_a_snapshot():
+    a = Matrix(4, 4, [list(row) for row in ROWS_4X4])
+    factor = a.lu_factor()
+    det = a.determinant()
+    a.data[1][1] = 0.0
+    assert abs(factor.determinant() - det) < 1e-9
+    x = factor.solve([1, 2, 3, 4])
+    assert_close(Matrix(4, 4, ROWS_4X4).multiply(Matrix(4, 1, [[v] for v in x]))
+                 ._row_lists(), [[1], [2], [3], [4]])
+
+
+@pytest.mark.parametrize("storage", ["array", "numpy"])
+def test_mmap_loaded_copies_are_independent(tmp_path, storage):
+    path = str(tmp_path / "m.mtrx")
+    Matrix(3, 4, [[float(i * 4 + j) for j in range(4)] for i in range(3)]) \
+        .save(path)
+    loaded = Matrix.load(path, mmap=True, storage=storage)
+    expected = loaded._row_lists()
+
+    for duplicate in (loaded.copy(), loaded.to_storage("array"),
+                      loaded.to_storage("numpy"), loaded.to_storage("list")):
+        duplicate[0, 0] = -1.0
+        duplicate[2, 3] = -1.0
+        assert loaded._row_lists() == expected
+
+    # Исходный файл не меняется при записи в загруженную матрицу
+    loaded[1, 1] = 100.0
+    assert Matrix.load(path, mmap=False)._row_lists() == expected
+
+
+def test_profiler_reset_while_active():
+    a = Matrix(4, 4, [list(row) for row in ROWS_4X4])
+    with matrices.MatrixProfiler() as profiler:
+        a.transpose()
+        profiler.reset()
+        a.inverse()
+        a.inverse()
+    assert "transpose" not in profiler.stats
+    assert profiler.stats["inverse"]["calls"] == 2
+    assert "inverse" in profiler.report()
+    assert len(profiler.events) == sum(item["calls"] for item in
+                                       profiler.stats.values())
+
+
+def test_profiler_shares_use_self_time():
+    a = Matrix(6, 6, [[float((i * 7 + j * 3) % 11) + (i == j) * 20
+                       for j in range(6)] for i in range(6)])
+    with matrices.MatrixProfiler() as profiler:
+        for _ in range(5):
+            a.inverse()
+    stats = profiler.stats
+    # inverse -> lu_factor: полное время включает вложенный вызов
+    assert stats["lu_factor"]["calls"] == 5
+    assert stats["inverse"]["self_time"] < stats["inverse"]["time"]
+    total_self = sum(item["self_time"] for item in stats.values())
+    total = sum(item["time"] for item in stats.values())
+    assert total_self < total
+    shares = [float(line.split("%")[0].split()[-1])
+              for line in profiler.report().splitlines()[1:]]
+    assert abs(sum(shares) - 100) < 0.5
+
+
+def test_benchmark_missing_baseline_is_an_error(tmp_path, capsys):
+    with pytest.raises(FileNotFoundError):
+        matrices.run_benchmarks(sizes=(4,), operations=["transpose"],
+                                min_time=0.0,
+                                baseline=str(tmp_path / "missing.json"))
+
+    saved = str(tmp_path / "base.json")
+    matrices.run_benchmarks(sizes=(4,), operations=["transpose"],
+                            min_time=0.0, output=saved)
+    report = matrices.run_benchmarks(sizes=(4,), operations=["transpose"],
+                                     min_time=0.0, baseline=saved,
+                                     tolerance=1e9)
+    assert report['regressions'] == []
+    assert "Сравнение с базой" in capsys.readouterr().out
+
+
+LAZY_EXPRESSIONS = [
+    lambda a, b, row, col: a + b,
+    lambda a, b, row, col: (a - b) * 2.5,
+    lambda a, b, row, col: a.hadamard_product(b) + a,
+    lambda a, b, row, col: ((a + b) * 0.5).apply_function(abs) - b,
+    lambda a, b, row, col: (a + row).hadamard_product(b - col),
+    lambda a, b, row, col: (a + row).hadamard_product(row) - col * 2,
+    lambda a, b, row, col: a.multiply(b) + 1,
+    lambda a, b, row, col: (a.multiply(b) * 2).apply_function(
+        lambda x: x * x),
+]
+
+
+@pytest.mark.parametrize("storage", ["list", "array", "numpy"])
+@pytest.mark.parametrize("build", LAZY_EXPRESSIONS)
+def test_lazy_matches_eager(storage, build):
+    a = Matrix(3, 3, [[1.0, -2.0, 3.0], [4.5, 0.0, -6.0], [7.0, 8.0, -9.5]],
+               storage=storage)
+    b = Matrix(3, 3, [[0.5, 1.0, -1.5], [2.0, -3.0, 4.0], [1.0, 1.0, 1.0]],
+               storage=storage)
+    row = Matrix(1, 3, [[10.0, 20.0, 30.0]], storage=storage)
+    col = Matrix(3, 1, [[1.0], [2.0], [3.0]], storage=storage)
+
+    eager = build(a, b, row, col)
+    lazy = build(a.lazy(), b.lazy(), row, col)
+    assert isinstance(lazy, matrices.LazyMatrix)
+    assert_close(lazy.evaluate(), eager)
+    assert lazy.evaluate().storage == storage
+
+
+def test_lazy_reuses_shared_inputs():
+    a = Matrix(2, 2, [[1, 2], [3, 4]])
+    expr = (a.lazy() + a) * 3 - a.lazy().hadamard_product(a)
+    assert expr.evaluate()._row_lists() == [[5, 8], [9, 8]]
+
+
+@pytest.mark.parametrize("storage", ["list", "array", "numpy"])
+def test_sparse_dense_arithmetic(storage):
+    dense_rows = [[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]]
+    sparse_rows = [[0.0, 0.5, 0.0], [-2.0, 0.0, 0.0]]
+    dense = Matrix(2, 3, [list(row) for row in dense_rows], storage=storage)
+    sparse = matrices.SparseMatrix.from_matrix(Matrix(2, 3, sparse_rows))
+    plain = Matrix(2, 3, sparse_rows, storage=storage)
+
+    assert_close(dense + sparse, dense + plain)
+    assert_close(sparse + dense, dense + plain)
+    assert_close(dense - sparse, dense - plain)
+    assert_close(sparse - dense, plain - dense)
+    assert_close(dense.add(sparse), dense.add(plain))
+    assert_close(dense.subtract(sparse), dense.subtract(plain))
+    assert dense._row_lists() == dense_rows
+
+    target = dense.copy()
+    target += sparse
+    assert_close(target, dense + plain)
+    with pytest.raises(ValueError):
+        dense.add(matrices.SparseMatrix(3, 2))
+
+
+@pytest.mark.parametrize("storage", ["list", "array"])
+def test_parallel_uses_shared_pool(storage):
+    a = Matrix(5, 3, [[float(i - j) for j in range(3)] for i in range(5)],
+               storage=storage)
+    b = Matrix(3, 4, [[float(i * j + 1) for j in range(4)] for i in range(3)],
+                storage=storage)
+    expected = a.multiply(b, algorithm="naive")
+    assert_close(a.multiply(b, workers=2), expected)
+    pool = matrices._process_pool(1)
+    assert_close(a.apply_function(abs, workers=2),
+                 a.apply_function(abs))
+    assert matrices._process_pool(2) is pool
+
+    target = Matrix(5, 4, storage=storage)
+    assert a.multiply(b, parallel=True, workers=2, out=target) is target
+    assert_close(target, expected)
+    assert target.storage == storage
+
+    with pytest.raises(ValueError):
+        a.multiply(b, algorithm="strassen", parallel=True)
+    with pytest.raises(ValueError):
+        a.apply_function(abs, workers=0)
+
+
+@pytest.mark.parametrize("shape", [(1, 1, 1), (3, 3, 3), (5, 7, 3),
+                                   (7, 2, 9), (9, 9, 9), (2, 11, 1)])
+@pytest.mark.parametrize("threshold", [1, 2, 3])
+@pytest.mark.parametrize("storage", ["list", "array"])
+def test_strassen_matches_naive(shape, threshold, storage):
+    n, m, p = shape
+    rng = random.Random(n * 100 + m * 10 + p)
+    a = Matrix(n, m, [[rng.randint(-9, 9) for _ in range(m)]
+                      for _ in range(n)], storage=storage)
+    b = Matrix(m, p, [[rng.randint(-9, 9) for _ in range(p)]
+                      for _ in range(m)], storage=storage)
+    expected = a.multiply(b, algorithm="naive")
+    result = a.multiply(b, algorithm="strassen", threshold=threshold,
+                        block_size=2)
+    assert (result.rows, result.cols) == (n, p)
+    # Целые значения: результат Штрассена должен совпадать точно
+    assert result._row_lists() == expected._row_lists()
+
+
+NUMPY_PARITY_OPERATIONS = [
+    lambda a, b: a + b,
+    lambda a, b: a - b * 3,
+    lambda a, b: a.hadamard_product(b),
+    lambda a, b: a * b,
+    lambda a, b: a.multiply(b.transpose()) + 1,
+    lambda a, b: a.apply_function(abs),
+    lambda a, b: a.inverse(),
+    lambda a, b: a.solve([1, 2, 3, 4]),
+    lambda a, b: a.softmax(),
+    lambda a, b: [a.determinant(), b.determinant()],
+]
+
+
+@pytest.mark.parametrize("operation", NUMPY_PARITY_OPERATIONS)
+def test_numpy_matches_list(operation):
+    pytest.importorskip("numpy")
+    b_rows = [[3, -1, 4, 1], [5, -9, 2, 6], [-5, 3, 5, 8], [9, 7, -9, 3]]
+    results = [operation(Matrix(4, 4, [list(row) for row in ROWS_4X4],
+                                storage=storage),
+                         Matrix(4, 4, [list(row) for row in b_rows],
+                                storage=storage))
+               for storage in ("list", "numpy")]
+    assert_close(results[1], results[0])
+
+
+def test_numpy_stores_floats_like_array():
+    pytest.importorskip("numpy")
+    rows = [[2 ** 40, 1], [1, 1]]
+    big = {storage: Matrix(2, 2, [list(row) for row in rows],
+                           storage=storage) for storage in ("array", "numpy")}
+    # Произведение и сумма не переполняют int64, а совпадают с "array"
+    assert (big["numpy"] * big["numpy"])._row_lists() == \
+        (big["array"] * big["array"])._row_lists()
+    assert (big["numpy"] * big["numpy"])[0, 0] == pytest.approx(2.0 ** 80)
+    huge = Matrix(1, 2, [[2 ** 62, 1]], storage="numpy")
+    assert (huge + huge)[0, 0] == 2.0 ** 63
+
+    m = Matrix(2, 2, [[1, 2], [3, 4]], storage="numpy")
+    m.data[0][0] = 0.5
+    m[1, 1] = 4.25
+    assert m._row_lists() == [[0.5, 2], [3, 4.25]]
+    assert Matrix(2, 2, fill_value=1, storage="numpy")._row_lists() == \
+        Matrix(2, 2, fill_value=1, storage="array")._row_lists()
+
+
+@pytest.mark.parametrize("storage", ["list", "array", "numpy"])
+def test_multiply_and_apply_validate_arguments(storage):
+    if storage == "numpy":
+        pytest.importorskip("numpy")
+    a = Matrix(3, 3, [list(row[:3]) for row in ROWS_4X4[:3]],
+               storage=storage)
+    with pytest.raises(ValueError):
+        a.multiply(a, algorithm="bogus")
+    with pytest.raises(ValueError):
+        a.multiply(a, algorithm="strassen", parallel=True)
+    with pytest.raises(ValueError):
+        a.multiply(a, workers=0)
+    with pytest.raises(ValueError):
+        a.apply_function(abs, workers=0)
+    expected = a.apply_function(abs)
+    assert_close(a.apply_function(abs, parallel=True, workers=2), expected)
+    assert a.apply_function(abs, workers=2).storage == storage
+
+
+@pytest.mark.parametrize("storage", ["list", "array", "numpy"])
+def test_random_matrices_are_seeded_and_in_range(storage):
+    if storage == "numpy":
+        pytest.importorskip("numpy")
+    uniform = Matrix.random(200, 150, low=-2.0, high=3.0, storage=storage,
+                            seed=7)
+    assert uniform.storage == storage
+    assert uniform._row_lists() == Matrix.random(
+        200, 150, low=-2.0, high=3.0, storage=storage,
+        seed=7)._row_lists()
+    values = [x for row in uniform._row_lists() for x in row]
+    assert all(-2.0 <= x < 3.0 for x in values)
+    assert abs(sum(values) / len(values) - 0.5) < 0.05
+
+    normal = Matrix.normal(301, 101, mean=1.0, std=2.0, storage=storage,
+                           rng=random.Random(3))
+    values = [x for row in normal._row_lists() for x in row]
+    mean = sum(values) / len(values)
+    std = (sum((x - mean) ** 2 for x in values) / len(values)) ** 0.5
+    assert abs(mean - 1.0) < 0.05 and abs(std - 2.0) < 0.05
+
+
+def test_random_list_and_array_draw_the_same_values():
+    for build in (Matrix.random, Matrix.normal):
+        assert build(5, 7, storage="list", seed=11)._row_lists() == \
+            build(5, 7, storage="array", seed=11)._row_lists()